@@ -12,5 +12,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'project.settings')
+# Async views run their queries on short-lived threads, so persistent connections would
+# pile up; under ASGI use PostgreSQL pooling (DB_POOL_MAX_SIZE) instead
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
@@ -10,9 +10,12 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
+from django.core.exceptions import ImproperlyConfigured
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -44,6 +47,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Per-endpoint request profiling, only active with PROFILING_ENABLED
+    'vendormanagement.profiling.ProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -76,13 +81,83 @@ WSGI_APPLICATION = 'project.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
 
-DATABASES = {
+# Configured from the environment:
+#   DB_ENGINE              sqlite (default) or postgresql
+#   DB_NAME                SQLite file (default: db.sqlite3) or PostgreSQL database name
+#   DB_USER, DB_PASSWORD, DB_HOST, DB_PORT (PostgreSQL)
+#   DB_CONN_MAX_AGE        Seconds a connection is reused across requests (default: 60; 0 closes it after each request)
+#   DB_CONN_HEALTH_CHECKS  Check a reused connection before the request uses it (default: 1)
+#   DB_POOL_MAX_SIZE       PostgreSQL only: serve connections from a psycopg pool of this size
+#                          instead of persistent connections (needs pip install "psycopg[pool]")
+#   DB_SQLITE_WAL          SQLite only: WAL journal, so readers never wait on a writer (default: 1)
+#   DB_BUSY_TIMEOUT        SQLite only: seconds a writer waits for the write lock (default: 20)
+
+def env_bool(name, default):
+    return os.environ.get(name, str(int(default))).lower() in ('1', 'true', 'yes', 'on')
+
+
+DB_ENGINE = os.environ.get('DB_ENGINE', 'sqlite')
+
+if DB_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DB_NAME', 'vendormanagement'),
+            'USER': os.environ.get('DB_USER', ''),
+            'PASSWORD': os.environ.get('DB_PASSWORD', ''),
+            'HOST': os.environ.get('DB_HOST', ''),
+            'PORT': os.environ.get('DB_PORT', ''),
+            'OPTIONS': {},
+        }
+    }
+    if os.environ.get('DB_POOL_MAX_SIZE'):
+        # Pooled connections are returned to the pool after each request (CONN_MAX_AGE must be 0)
+        DATABASES['default']['OPTIONS']['pool'] = {
+            'min_size': 2,
+            'max_size': int(os.environ['DB_POOL_MAX_SIZE']),
+            'timeout': 10,
+        }
+elif DB_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DB_NAME', BASE_DIR / 'db.sqlite3'),
+            'OPTIONS': {
+                # Waits of writers for the write lock
+                'timeout': float(os.environ.get('DB_BUSY_TIMEOUT', 20)),
+                # Take the write lock when a transaction starts, so concurrent writers queue on
+                # the busy timeout instead of failing with "database is locked" on lock upgrade
+                'transaction_mode': 'IMMEDIATE',
+            },
+        }
+    }
+    if env_bool('DB_SQLITE_WAL', True):
+        # Run on every new connection; in WAL mode a commit only needs an fsync at checkpoints
+        DATABASES['default']['OPTIONS']['init_command'] = 'PRAGMA journal_mode=WAL;PRAGMA synchronous=NORMAL'
+else:
+    raise ImproperlyConfigured(f"DB_ENGINE must be sqlite or postgresql, not {DB_ENGINE!r}")
+
+DATABASES['default']['CONN_HEALTH_CHECKS'] = env_bool('DB_CONN_HEALTH_CHECKS', True)
+DATABASES['default']['CONN_MAX_AGE'] = (
+    0 if 'pool' in DATABASES['default']['OPTIONS'] else int(os.environ.get('DB_CONN_MAX_AGE', 60))
+)
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+# Any Django cache backend works (e.g. Redis or Memcached to share the cache between processes)
+
+CACHES = {
     'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'vendormanagement',
     }
 }
 
+# Cache alias and timeout (seconds) for the dashboard aggregates
+AGGREGATE_CACHE_ALIAS = 'default'
+AGGREGATE_CACHE_TIMEOUT = 3600
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -128,7 +203,8 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # JWTAuthentication with users resolved from a short-lived cache
+        'vendormanagement.authentication.CachedJWTAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
         'rest_framework.permissions.IsAuthenticated',
@@ -165,3 +241,26 @@ EMAIL_BACKEND = 'django.core.mail.backends.console.EmailBackend'
 # EMAIL_HOST_USER = 'your-email@gmail.com'
 # EMAIL_HOST_PASSWORD = 'your-password'
 # DEFAULT_FROM_EMAIL = 'your-email@gmail.com'
+
+# Reminder email dispatch: concurrent sending threads and messages per connection batch
+REMINDER_EMAIL_WORKERS = 4
+REMINDER_EMAIL_BATCH_SIZE = 50
+# Messages sent between reminder ledger writes (a crashed run re-sends at most one chunk)
+REMINDER_CHECKPOINT_SIZE = 500
+
+# Render read-only service/vendor lists from .values() rows instead of the model serializers
+FAST_LIST_SERIALIZATION = True
+# Rows fetched from the database per chunk by the streaming exports
+EXPORT_CHUNK_SIZE = 2000
+# Maximum number of items accepted by /api/services/bulk/
+BULK_MAX_ITEMS = 5000
+# Largest ?limit accepted by /api/vendors/choices/
+VENDOR_CHOICES_MAX_LIMIT = 1000
+# Request profiling middleware: per-endpoint percentiles over the last PROFILING_WINDOW
+# requests at /api/_metrics/, and a slow log (with SQL) of requests above PROFILING_SLOW_MS
+PROFILING_ENABLED = False
+PROFILING_WINDOW = 1000
+PROFILING_SLOW_MS = 500
+# Cache alias and timeout (seconds) for users resolved by CachedJWTAuthentication
+AUTH_USER_CACHE_ALIAS = 'default'
+AUTH_USER_CACHE_TIMEOUT = 60
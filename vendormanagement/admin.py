@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Vendor, Service
+from .models import Vendor, Service, ReminderLog, Job, VendorMonthlySpend
 
 
 class ServiceInline(admin.TabularInline):
@@ -49,7 +49,7 @@ class ServiceAdmin(admin.ModelAdmin):
     
     def get_status_color_display(self, obj):
         """Display status color in admin"""
-        color = obj.get_status_color()
+        color = obj.current_status_color()
         color_map = {
             'red': '🔴 Red (Expired)',
             'orange': '🟠 Orange (Payment Overdue)',
@@ -59,3 +59,29 @@ class ServiceAdmin(admin.ModelAdmin):
         }
         return color_map.get(color, f'⚪ {color.capitalize()}')
     get_status_color_display.short_description = 'Status Color'
+
+
+@admin.register(ReminderLog)
+class ReminderLogAdmin(admin.ModelAdmin):
+    list_display = ('service', 'reminder_type', 'target_date', 'sent_at')
+    list_filter = ('reminder_type', 'target_date')
+    search_fields = ('service__service_name', 'service__vendor__name')
+    list_select_related = ('service__vendor',)
+    raw_id_fields = ('service',)
+    readonly_fields = ('sent_at',)
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = ('id', 'kind', 'status', 'progress_done', 'progress_total', 'created_by', 'created_at', 'finished_at')
+    list_filter = ('kind', 'status')
+    readonly_fields = ('created_at', 'started_at', 'finished_at', 'updated_at')
+
+
+@admin.register(VendorMonthlySpend)
+class VendorMonthlySpendAdmin(admin.ModelAdmin):
+    list_display = ('vendor', 'month', 'total_amount', 'service_count', 'updated_at')
+    list_filter = ('month',)
+    search_fields = ('vendor__name',)
+    list_select_related = ('vendor',)
+    readonly_fields = ('vendor', 'month', 'total_amount', 'service_count', 'updated_at')
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class VendormanagementConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'vendormanagement'
+
+    def ready(self):
+        from . import signals  # noqa: F401
@@ -0,0 +1,170 @@
+"""
+Async (ASGI) versions of the read-only service window endpoints and the dashboard summary
+Served under /api/async/ with the same JSON, filters and page-number pagination as their
+DRF counterparts. Under an ASGI server a request holds no worker thread while it waits on
+the database, and the independent queries of a request (a page and its COUNT, the
+dashboard aggregates and top-N lists) are awaited together.
+"""
+import asyncio
+import functools
+import math
+
+from django.http import HttpResponse
+from django.utils import timezone
+from rest_framework.exceptions import APIException, MethodNotAllowed, NotAuthenticated, NotFound
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+from .authentication import CachedJWTAuthentication
+from .filters import MAX_WINDOW_DAYS, parse_days
+from .models import Service
+from .pagination import CustomPageNumberPagination
+from .serializers import ServiceRowSerializer
+from .utils.cache_utils import acached_aggregate
+from .utils.dashboard_utils import aget_dashboard_summary, alist
+from .views import ServiceViewSet
+
+
+def json_response(data, status=200):
+    return HttpResponse(JSONRenderer().render(data), content_type='application/json', status=status)
+
+
+def async_api_view(view):
+    """
+    GET-only async view authenticated like the DRF API (CachedJWTAuthentication,
+    IsAuthenticated). The view gets a DRF Request; APIExceptions become the JSON
+    errors DRF would return.
+    """
+    @functools.wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        authentication = CachedJWTAuthentication()
+        try:
+            if request.method != 'GET':
+                raise MethodNotAllowed(request.method)
+            result = await authentication.aauthenticate(request)
+            if result is None:
+                raise NotAuthenticated()
+            request.user, request.auth = result
+            return await view(Request(request), *args, **kwargs)
+        except APIException as exc:
+            data = exc.detail if isinstance(exc.detail, (dict, list)) else {'detail': exc.detail}
+            response = json_response(data, status=exc.status_code)
+            if exc.status_code == 401:
+                response['WWW-Authenticate'] = authentication.authenticate_header(request)
+            return response
+    return wrapper
+
+
+def filter_services(request, services):
+    """Apply the ServiceViewSet filter backends (they only build the queryset)"""
+    view = ServiceViewSet(request=request, format_kwarg=None)
+    for backend in view.filter_backends:
+        services = backend().filter_queryset(request, services, view)
+    return services
+
+
+async def paginated_rows(request, services):
+    """
+    CustomPageNumberPagination of services.as_rows(), rendered by ServiceRowSerializer;
+    the page and the COUNT are fetched together
+    """
+    paginator = CustomPageNumberPagination()
+    page_size = paginator.get_page_size(request)
+    rows = services.as_rows(today=timezone.now().date())
+    page_number = request.query_params.get(paginator.page_query_param) or 1
+    if page_number in paginator.last_page_strings:
+        count = await rows.acount()
+        page_number = max(1, math.ceil(count / page_size))
+        page = await alist(rows[(page_number - 1) * page_size:page_number * page_size])
+    else:
+        try:
+            page_number = int(page_number)
+            if page_number < 1:
+                raise ValueError
+        except ValueError:
+            raise NotFound(paginator.invalid_page_message)
+        offset = (page_number - 1) * page_size
+        count, page = await asyncio.gather(rows.acount(), alist(rows[offset:offset + page_size]))
+    page_count = max(1, math.ceil(count / page_size))
+    if page_number > page_count:
+        raise NotFound(paginator.invalid_page_message)
+
+    url = request.build_absolute_uri()
+    previous_link = None
+    if page_number == 2:
+        previous_link = remove_query_param(url, paginator.page_query_param)
+    elif page_number > 2:
+        previous_link = replace_query_param(url, paginator.page_query_param, page_number - 1)
+    return {
+        'count': count,
+        'next': replace_query_param(url, paginator.page_query_param, page_number + 1)
+        if page_number < page_count else None,
+        'previous': previous_link,
+        'results': ServiceRowSerializer(page).data,
+    }
+
+
+async def list_services(request, services):
+    return json_response(await paginated_rows(request, filter_services(request, services)))
+
+
+@async_api_view
+async def expiring_soon(request):
+    """
+    Services expiring in the next 15 days (paginated)
+    GET /api/async/services/expiring_soon/
+    """
+    return await list_services(request, Service.objects.expiring_soon(days=15).order_by('expiry_date', 'id'))
+
+
+@async_api_view
+async def payment_due_soon(request):
+    """
+    Services with payment due in the next 15 days (paginated)
+    GET /api/async/services/payment_due_soon/
+    """
+    return await list_services(
+        request, Service.objects.payment_due_soon(days=15).order_by('payment_due_date', 'id')
+    )
+
+
+@async_api_view
+async def active_services(request):
+    """
+    Active services (paginated)
+    GET /api/async/services/active_services/
+    """
+    return await list_services(request, Service.objects.active().order_by('expiry_date', 'id'))
+
+
+@async_api_view
+async def expired_services(request):
+    """
+    Expired services (paginated)
+    GET /api/async/services/expired_services/
+    """
+    return await list_services(request, Service.objects.expired().order_by('expiry_date', 'id'))
+
+
+@async_api_view
+async def dashboard_summary(request):
+    """
+    Dashboard counts and top-N lists, sharing the cache of /api/dashboard/summary/
+    GET /api/async/dashboard/summary/?days=15&top_n=5
+    """
+    try:
+        days = parse_days(request.query_params.get('days', 15))
+        top_n = int(request.query_params.get('top_n', 5))
+        if not 0 <= top_n <= 50:
+            raise ValueError
+    except ValueError:
+        return json_response(
+            {'error': f'days must be between 0 and {MAX_WINDOW_DAYS} and top_n between 0 and 50'}, status=400
+        )
+    summary = await acached_aggregate(
+        'dashboard_summary',
+        lambda: aget_dashboard_summary(days=days, top_n=top_n),
+        params=(days, top_n)
+    )
+    return json_response(summary)
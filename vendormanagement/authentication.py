@@ -0,0 +1,116 @@
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+
+DEFAULT_AUTH_USER_CACHE_TIMEOUT = 60
+# User fields kept in the cache: what authentication and the permission classes read
+CACHED_USER_FIELDS = ('is_active', 'is_staff', 'is_superuser')
+
+
+def get_user_cache():
+    return caches[getattr(settings, 'AUTH_USER_CACHE_ALIAS', 'default')]
+
+
+def get_user_cache_timeout():
+    return getattr(settings, 'AUTH_USER_CACHE_TIMEOUT', DEFAULT_AUTH_USER_CACHE_TIMEOUT)
+
+
+def user_cache_key(user_id):
+    return f'vendormanagement:auth:user-fields:{user_id}'
+
+
+def invalidate_cached_user(user_id):
+    get_user_cache().delete(user_cache_key(user_id))
+
+
+def cached_user_entry(user):
+    """
+    The cache entry of a user: its primary key and CACHED_USER_FIELDS, never the
+    password hash. With CHECK_REVOKE_TOKEN the entry keeps the hash digest the
+    tokens already carry in their revoke claim.
+    """
+    entry = {'pk': user.pk, **{name: getattr(user, name) for name in CACHED_USER_FIELDS}}
+    if api_settings.CHECK_REVOKE_TOKEN:
+        entry['password_digest'] = get_md5_hash_password(user.password)
+    return entry
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication resolving the token's user from a short-lived cache keyed by the
+    user id claim instead of loading the User row on every request. Only the fields in
+    CACHED_USER_FIELDS are cached; the other fields of the user are loaded from the
+    database on first access. Saving or deleting a user (deactivation, is_staff) and
+    group or permission changes drop its entry (see signals); writes that bypass them
+    (QuerySet.update) show up within AUTH_USER_CACHE_TIMEOUT seconds.
+    """
+
+    def user_from_entry(self, entry):
+        """A User with only the cached fields loaded, as if fetched with .only()"""
+        values = {self.user_model._meta.pk.attname: entry['pk'], **{name: entry[name] for name in CACHED_USER_FIELDS}}
+        # from_db takes the values in the model's field order
+        field_names = [field.attname for field in self.user_model._meta.concrete_fields if field.attname in values]
+        return self.user_model.from_db(
+            self.user_model.objects.db, field_names, [values[name] for name in field_names]
+        )
+
+    def get_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        cache = get_user_cache()
+        key = user_cache_key(user_id)
+        entry = cache.get(key)
+        if entry is None:
+            # Loads and checks the user
+            user = super().get_user(validated_token)
+            cache.set(key, cached_user_entry(user), get_user_cache_timeout())
+            return user
+        user = self.user_from_entry(entry)
+        self.check_user(user, validated_token, entry.get('password_digest'))
+        return user
+
+    def check_user(self, user, validated_token, password_digest=None):
+        """Same checks as JWTAuthentication.get_user, for users not loaded by it"""
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if password_digest is None:
+                password_digest = get_md5_hash_password(user.password)
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != password_digest:
+                raise AuthenticationFailed(_("The user's password has been changed."), code='password_changed')
+
+    async def aauthenticate(self, request):
+        """authenticate() for async views: the user comes from the async cache and ORM APIs"""
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return await self.aget_user(validated_token), validated_token
+
+    async def aget_user(self, validated_token):
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if user_id is None:
+            return super().get_user(validated_token)
+        cache = get_user_cache()
+        key = user_cache_key(user_id)
+        entry = await cache.aget(key)
+        if entry is None:
+            try:
+                user = await self.user_model.objects.aget(**{api_settings.USER_ID_FIELD: user_id})
+            except self.user_model.DoesNotExist:
+                raise AuthenticationFailed(_('User not found'), code='user_not_found')
+            self.check_user(user, validated_token)
+            await cache.aset(key, cached_user_entry(user), get_user_cache_timeout())
+            return user
+        user = self.user_from_entry(entry)
+        self.check_user(user, validated_token, entry.get('password_digest'))
+        return user
@@ -0,0 +1,138 @@
+from datetime import date
+from decimal import Decimal, InvalidOperation
+
+from django.db.models.functions import Lower
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend, OrderingFilter
+
+# Largest value of a 64-bit signed primary key column
+MAX_ID = 2 ** 63 - 1
+# Longest "soon" window, in days (today + days must stay a valid date)
+MAX_WINDOW_DAYS = 3650
+
+
+def parse_id_list(value):
+    """'1,2,3' -> [1, 2, 3]"""
+    try:
+        ids = [int(pk) for pk in value.split(',') if pk.strip()]
+    except ValueError:
+        ids = None
+    if ids is None or not all(0 < pk <= MAX_ID for pk in ids):
+        raise ValueError('Expected a comma-separated list of ids.')
+    return ids
+
+
+def parse_days(value):
+    """Length of a date window: an integer between 0 and MAX_WINDOW_DAYS"""
+    try:
+        days = int(value)
+    except (TypeError, ValueError):
+        days = None
+    if days is None or not 0 <= days <= MAX_WINDOW_DAYS:
+        raise ValueError(f'days must be an integer between 0 and {MAX_WINDOW_DAYS}')
+    return days
+
+
+def parse_date(value):
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError('Expected a date in YYYY-MM-DD format.')
+
+
+def parse_month(value):
+    """'2025-03' -> date(2025, 3, 1)"""
+    try:
+        year, month = value.split('-')
+        return date(int(year), int(month), 1)
+    except ValueError:
+        raise ValueError('Expected a month in YYYY-MM format.')
+
+
+def parse_decimal(value):
+    try:
+        value = Decimal(value)
+    except InvalidOperation:
+        raise ValueError('Expected a number.')
+    # NaN and Infinity parse but cannot be compared with a column
+    if not value.is_finite():
+        raise ValueError('Expected a number.')
+    return value
+
+
+def parse_choice(*choices):
+    def parse(value):
+        if value not in choices:
+            raise ValueError(f"Expected one of: {', '.join(choices)}.")
+        return value
+    return parse
+
+
+class QueryParamFilter(BaseFilterBackend):
+    """
+    Filters on the query parameters declared in the view's filter_params:
+        {param: (lookup or callable(queryset, value), parser)}
+    Every lookup must be backed by an index on the filtered table.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        errors = {}
+        for param, (lookup, parse) in getattr(view, 'filter_params', {}).items():
+            raw = request.query_params.get(param)
+            if raw is None or raw == '':
+                continue
+            try:
+                value = parse(raw)
+            except ValueError as e:
+                errors[param] = [str(e)]
+                continue
+            queryset = lookup(queryset, value) if callable(lookup) else queryset.filter(**{lookup: value})
+        if errors:
+            raise ValidationError(errors)
+        return queryset
+
+
+def prefix_upper_bound(prefix):
+    """The smallest string greater than every string starting with prefix (None if there is none)"""
+    last = ord(prefix[-1])
+    if last >= 0x10FFFF:
+        return None
+    return prefix[:-1] + chr(last + 1)
+
+
+class PrefixSearchFilter(BaseFilterBackend):
+    """
+    ?search=<prefix>: case-insensitive prefix match on the view's search_field.
+    Written as a range on LOWER(field), which the functional index on it answers;
+    startswith keeps the match exact under non-binary collations.
+    """
+    search_param = 'search'
+
+    def filter_queryset(self, request, queryset, view):
+        prefix = request.query_params.get(self.search_param, '').strip().lower()
+        if not prefix:
+            return queryset
+        alias = f'{view.search_field}_lower'
+        conditions = {f'{alias}__gte': prefix, f'{alias}__startswith': prefix}
+        upper = prefix_upper_bound(prefix)
+        if upper is not None:
+            conditions[f'{alias}__lt'] = upper
+        return queryset.alias(**{alias: Lower(view.search_field)}).filter(**conditions)
+
+
+class StableOrderingFilter(OrderingFilter):
+    """
+    DRF ordering limited to the view's ordering_fields (each with an index);
+    the primary key is appended so pages are stable
+    """
+
+    def get_ordering(self, request, queryset, view):
+        params = request.query_params.get(self.ordering_param)
+        if not params:
+            return None
+        ordering = self.remove_invalid_fields(queryset, [term.strip() for term in params.split(',')], view, request)
+        if not ordering:
+            return None
+        if ordering[-1].lstrip('-') not in ('id', 'pk'):
+            ordering.append('-id' if ordering[-1].startswith('-') else 'id')
+        return ordering
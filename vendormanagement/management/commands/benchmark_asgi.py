@@ -0,0 +1,125 @@
+"""
+Management command to compare the async (ASGI) read path with the WSGI path under load
+Seeds a throwaway test database, serves the project from a threaded WSGI server and
+from uvicorn (optional dependency: pip install uvicorn) and reports throughput and
+tail latency of each read endpoint at the given concurrency:
+    python manage.py benchmark_asgi --rows 100000 --concurrency 64 --requests 2000
+"""
+import multiprocessing
+import socket
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+
+from django.contrib.auth.models import User
+from django.core.asgi import get_asgi_application
+from django.core.management.base import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer
+from django.core.wsgi import get_wsgi_application
+from django.test.testcases import QuietWSGIRequestHandler
+from rest_framework_simplejwt.tokens import AccessToken
+from vendormanagement.utils.benchmark_utils import benchmark_database, seed_services
+from vendormanagement.utils.load_utils import run_load
+
+try:
+    import uvicorn
+except ImportError:
+    uvicorn = None
+
+HOST = '127.0.0.1'
+# (name, DRF endpoint, async endpoint)
+ENDPOINTS = [
+    ('expiring_soon', '/api/services/expiring_soon/', '/api/async/services/expiring_soon/'),
+    ('payment_due_soon', '/api/services/payment_due_soon/', '/api/async/services/payment_due_soon/'),
+    ('active_services', '/api/services/active_services/', '/api/async/services/active_services/'),
+    ('expired_services', '/api/services/expired_services/', '/api/async/services/expired_services/'),
+    ('dashboard_summary', '/api/dashboard/summary/', '/api/async/dashboard/summary/'),
+]
+
+
+class BenchmarkWSGIServer(ThreadedWSGIServer):
+    # Accept as many pending connections as uvicorn does
+    request_queue_size = 2048
+
+
+@contextmanager
+def serve_wsgi():
+    """Serve the project from a thread-per-connection WSGI server; yields its port"""
+    server = BenchmarkWSGIServer((HOST, 0), QuietWSGIRequestHandler, allow_reuse_address=False)
+    server.set_app(get_wsgi_application())
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield server.server_address[1]
+    finally:
+        server.shutdown()
+        server.server_close()
+        thread.join()
+
+
+@contextmanager
+def serve_asgi():
+    """Serve the project from uvicorn (one event loop); yields its port"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind((HOST, 0))
+    server = uvicorn.Server(uvicorn.Config(
+        get_asgi_application(), log_level='warning', lifespan='off', backlog=2048
+    ))
+    thread = threading.Thread(target=server.run, kwargs={'sockets': [sock]}, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise CommandError('uvicorn failed to start')
+        time.sleep(0.01)
+    try:
+        yield sock.getsockname()[1]
+    finally:
+        server.should_exit = True
+        thread.join()
+        sock.close()
+
+
+class Command(BaseCommand):
+    help = 'Compare throughput and tail latency of the async read endpoints (uvicorn) with the WSGI path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=100000, help='Services to seed (default: 100000)')
+        parser.add_argument('--vendors', type=int, default=1000, help='Vendors to seed (default: 1000)')
+        parser.add_argument('--concurrency', type=int, default=64, help='Requests in flight (default: 64)')
+        parser.add_argument('--requests', type=int, default=2000, help='Requests per endpoint and server (default: 2000)')
+
+    def handle(self, *args, **options):
+        if uvicorn is None:
+            raise CommandError('benchmark_asgi needs uvicorn: pip install uvicorn')
+
+        # The load comes from another process so it does not compete with the servers for the GIL
+        load = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn'))
+        failures = []
+        with benchmark_database() as connection, load:
+            self.stdout.write(f'Seeding {options["rows"]} services on {connection.vendor}...')
+            seed_services(options['rows'], vendor_count=options['vendors'])
+            user = User.objects.create_user('benchmark', password='benchmark')
+            headers = {'Authorization': f'Bearer {AccessToken.for_user(user)}'}
+
+            with serve_wsgi() as wsgi_port, serve_asgi() as asgi_port:
+                for name, sync_path, async_path in ENDPOINTS:
+                    for server, port, path in [
+                        ('WSGI, sync view', wsgi_port, sync_path),
+                        ('ASGI, sync view', asgi_port, sync_path),
+                        ('ASGI, async view', asgi_port, async_path),
+                    ]:
+                        stats = load.submit(
+                            run_load, HOST, port, path, headers,
+                            concurrency=options['concurrency'], requests=options['requests'],
+                        ).result()
+                        self.stdout.write(
+                            f'{name:<18} {server:<17} {stats["requests_per_second"]:>8} req/s  '
+                            f'median={stats["median_ms"]}ms p95={stats["p95_ms"]}ms '
+                            f'p99={stats["p99_ms"]}ms max={stats["max_ms"]}ms errors={stats["errors"]}'
+                        )
+                        if stats['errors']:
+                            failures.append(f'{name} ({server}): {stats["errors"]} failed requests')
+
+        if failures:
+            raise CommandError('Benchmark failed:\n' + '\n'.join(failures))
@@ -0,0 +1,64 @@
+"""
+Management command to benchmark the per-request cost of JWT authentication
+Compares simplejwt's JWTAuthentication (one User query per request) with
+CachedJWTAuthentication, on its own and on an endpoint that runs no other query:
+    python manage.py benchmark_auth --repeat 2000
+"""
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import AccessToken
+from vendormanagement.authentication import CachedJWTAuthentication, get_user_cache, user_cache_key
+from vendormanagement.utils.benchmark_utils import benchmark_database, count_queries, time_call
+from vendormanagement.views import DashboardViewSet
+
+# Needs no query besides authentication
+URL = '/api/dashboard/cache_stats/'
+
+
+class Command(BaseCommand):
+    help = 'Benchmark JWT authentication per request with and without the user cache'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=2000, help='Timed calls per measurement (default: 2000)')
+
+    def handle(self, *args, **options):
+        repeat = options['repeat']
+        with benchmark_database() as db:
+            self.stdout.write(f'Benchmarking on {db.vendor}...')
+            user = User.objects.create_user('benchmark', password='benchmark')
+            header = f'Bearer {AccessToken.for_user(user)}'
+            request = RequestFactory().get(URL, HTTP_AUTHORIZATION=header)
+            client = APIClient()
+            client.credentials(HTTP_AUTHORIZATION=header)
+            cache = get_user_cache()
+
+            # (name, authentication class, evict the cached user before every call)
+            cases = [
+                ('JWTAuthentication', JWTAuthentication, False),
+                ('CachedJWTAuthentication (miss)', CachedJWTAuthentication, True),
+                ('CachedJWTAuthentication (hit)', CachedJWTAuthentication, False),
+            ]
+            for name, authentication_class, evict in cases:
+                def authenticate():
+                    if evict:
+                        cache.delete(user_cache_key(user.pk))
+                    authentication_class().authenticate(request)
+
+                def get():
+                    if evict:
+                        cache.delete(user_cache_key(user.pk))
+                    client.get(URL)
+
+                queries = count_queries(authenticate)
+                auth = time_call(authenticate, repeat=repeat)
+                with mock.patch.object(DashboardViewSet, 'authentication_classes', [authentication_class]):
+                    endpoint = time_call(get, repeat=repeat // 4 or 1)
+                self.stdout.write(
+                    f'{name:<32} queries={queries}  authenticate median={auth["median_ms"]}ms '
+                    f'p95={auth["p95_ms"]}ms  {URL} median={endpoint["median_ms"]}ms p95={endpoint["p95_ms"]}ms'
+                )
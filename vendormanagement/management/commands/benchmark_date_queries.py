@@ -0,0 +1,72 @@
+"""
+Management command to benchmark the date-window service queries
+Seeds a throwaway test database, checks with EXPLAIN that every endpoint
+query is served by an index and that each endpoint stays under a latency budget:
+    python manage.py benchmark_date_queries --rows 1000000 --budget-ms 250
+"""
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.test import APIClient
+from vendormanagement.models import Service
+from vendormanagement.utils.benchmark_utils import (
+    benchmark_database, seed_services, time_call, plan_uses_index, explain
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark expiry/payment due date-window queries on a seeded test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000, help='Services to seed (default: 1000000)')
+        parser.add_argument('--vendors', type=int, default=1000, help='Vendors to seed (default: 1000)')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed calls per endpoint (default: 20)')
+        parser.add_argument('--budget-ms', type=float, default=250, help='Median latency budget per endpoint (default: 250)')
+
+    def handle(self, *args, **options):
+        with benchmark_database() as connection:
+            self.stdout.write(f'Seeding {options["rows"]} services on {connection.vendor}...')
+            vendor_ids = seed_services(options['rows'], vendor_count=options['vendors'])
+
+            client = APIClient()
+            client.force_authenticate(User.objects.create_user('benchmark', password='benchmark'))
+
+            page = Service.objects.select_related('vendor')
+            checks = [
+                ('expiring_soon', '/api/services/expiring_soon/',
+                 page.expiring_soon().order_by('expiry_date', 'id')[:20]),
+                ('payment_due_soon', '/api/services/payment_due_soon/',
+                 page.payment_due_soon().order_by('payment_due_date', 'id')[:20]),
+                ('active_services', '/api/services/active_services/',
+                 page.active().order_by('expiry_date', 'id')[:20]),
+                ('expired_services', '/api/services/expired_services/',
+                 page.expired().order_by('expiry_date', 'id')[:20]),
+                ('reminders (expiring)', None, Service.objects.expiring_soon()),
+                ('reminders (payment due)', None, Service.objects.payment_due_soon()),
+                ('vendor active services', None, Service.objects.active().filter(vendor_id=vendor_ids[0])),
+            ]
+
+            failures = []
+            for name, url, queryset in checks:
+                plan = explain(queryset)
+                uses_index = plan_uses_index(plan, Service._meta.db_table)
+                line = f'{name:<26} index={"yes" if uses_index else "NO"}'
+                if not uses_index:
+                    failures.append(f'{name}: no index scan\n{plan}')
+
+                if url:
+                    stats = time_call(lambda: self.get(client, url), repeat=options['repeat'])
+                    line += f'  median={stats["median_ms"]}ms p95={stats["p95_ms"]}ms max={stats["max_ms"]}ms'
+                    if stats['median_ms'] > options['budget_ms']:
+                        failures.append(f'{name}: median {stats["median_ms"]}ms over budget {options["budget_ms"]}ms')
+                self.stdout.write(line)
+                if options['verbosity'] > 1:
+                    self.stdout.write(plan)
+
+        if failures:
+            raise CommandError('Benchmark failed:\n' + '\n'.join(failures))
+        self.stdout.write(self.style.SUCCESS('All date-window queries use an index and are within budget'))
+
+    def get(self, client, url):
+        response = client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f'{url} returned {response.status_code}')
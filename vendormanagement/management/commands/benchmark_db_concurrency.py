@@ -0,0 +1,159 @@
+"""
+Management command to benchmark concurrent reads and writes on a SQLite file database
+Reader threads run the payment-due list query while writer threads insert reminder log
+batches like the reminder job, first with Django's SQLite defaults (rollback journal,
+deferred transactions) and then with the OPTIONS of the DATABASES setting (WAL,
+synchronous=NORMAL, immediate transactions, busy timeout). Readers do not wait on the
+busy timeout: every read that finds the database locked is counted as a lock wait and
+retried after a millisecond.
+    python manage.py benchmark_db_concurrency --rows 50000 --readers 4 --writers 2 --seconds 10
+"""
+import itertools
+import os
+import statistics
+import tempfile
+import threading
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import OperationalError, connection, transaction
+from django.utils import timezone
+from vendormanagement.models import ReminderLog, Service
+from vendormanagement.utils.benchmark_utils import benchmark_database, seed_services
+
+# Django's SQLite defaults, made explicit: journal_mode is stored in the database file
+DEFAULT_OPTIONS = {'init_command': 'PRAGMA journal_mode=DELETE'}
+
+
+def percentile(samples, p):
+    return round(samples[min(len(samples) - 1, int(len(samples) * p))], 2) if samples else 0
+
+
+class Command(BaseCommand):
+    help = 'Compare read latency, lock waits and write throughput of SQLite defaults and the configured options'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50000, help='Services to seed (default: 50000)')
+        parser.add_argument('--readers', type=int, default=4, help='Reader threads (default: 4)')
+        parser.add_argument('--writers', type=int, default=2, help='Writer threads (default: 2)')
+        parser.add_argument('--batch', type=int, default=500, help='Rows per write transaction (default: 500)')
+        parser.add_argument('--seconds', type=float, default=10, help='Duration per configuration (default: 10)')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('benchmark_db_concurrency compares SQLite configurations (DB_ENGINE=sqlite)')
+
+        configured = dict(connection.settings_dict['OPTIONS'])
+        # Reminder log target dates unique across writers and runs
+        self.target_offsets = itertools.count()
+        with tempfile.TemporaryDirectory() as directory, \
+                benchmark_database(test_name=os.path.join(directory, 'benchmark.sqlite3')):
+            self.stdout.write(f'Seeding {options["rows"]} services...')
+            seed_services(options['rows'])
+            service_ids = list(Service.objects.values_list('id', flat=True))
+
+            try:
+                for name, db_options in [('SQLite defaults', DEFAULT_OPTIONS), ('DATABASES setting', configured)]:
+                    stats = self.run(db_options, service_ids, options)
+                    self.stdout.write(
+                        f'{name:<18} reads={stats["reads_per_second"]}/s median={stats["read_median_ms"]}ms '
+                        f'p99={stats["read_p99_ms"]}ms max={stats["read_max_ms"]}ms '
+                        f'lock_waits={stats["lock_waits"]}  writes={stats["writes_per_second"]} rows/s '
+                        f'commit_p99={stats["write_p99_ms"]}ms  locked_errors={stats["errors"]}'
+                    )
+                    if options['verbosity'] > 1:
+                        self.stdout.write(f'    journal_mode={stats["journal_mode"]} options={db_options}')
+            finally:
+                connection.close()
+                connection.settings_dict['OPTIONS'] = configured
+
+    def run(self, db_options, service_ids, options):
+        """Run the readers and writers with db_options for the configured duration"""
+        # Every thread opens its own connection from this settings dict
+        connection.close()
+        connection.settings_dict['OPTIONS'] = dict(db_options)
+        with connection.cursor() as cursor:
+            # Switch the journal mode while no other connection is open
+            journal_mode = cursor.execute('PRAGMA journal_mode').fetchone()[0]
+        connection.close()
+
+        stop = threading.Event()
+        read_ms, write_ms = [], []
+        lock_waits = [0]
+        errors = []
+        written = [0]
+        lock = threading.Lock()
+        today = timezone.now().date()
+        batch_size = min(options['batch'], len(service_ids))
+
+        def read():
+            services = Service.objects.payment_due_soon(today=today).order_by('payment_due_date', 'id')
+            services.count()
+            list(services.values('id', 'service_name', 'payment_due_date', 'amount')[:20])
+
+        def reader():
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute('PRAGMA busy_timeout = 0')
+                while not stop.is_set():
+                    started = time.perf_counter()
+                    while True:
+                        try:
+                            read()
+                            break
+                        except OperationalError:
+                            with lock:
+                                lock_waits[0] += 1
+                            time.sleep(0.001)
+                    with lock:
+                        read_ms.append((time.perf_counter() - started) * 1000)
+            finally:
+                connection.close()
+
+        def writer():
+            try:
+                while not stop.is_set():
+                    target = today + timedelta(days=next(self.target_offsets))
+                    batch = [
+                        ReminderLog(service_id=service_id, reminder_type='payment', target_date=target)
+                        for service_id in service_ids[:batch_size]
+                    ]
+                    started = time.perf_counter()
+                    try:
+                        with transaction.atomic():
+                            ReminderLog.objects.bulk_create(batch)
+                    except OperationalError as e:
+                        with lock:
+                            errors.append(str(e))
+                        continue
+                    with lock:
+                        write_ms.append((time.perf_counter() - started) * 1000)
+                        written[0] += len(batch)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=reader) for _ in range(options['readers'])]
+        threads += [threading.Thread(target=writer) for _ in range(options['writers'])]
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        time.sleep(options['seconds'])
+        stop.set()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        read_ms.sort()
+        write_ms.sort()
+        return {
+            'journal_mode': journal_mode,
+            'reads_per_second': round(len(read_ms) / elapsed, 1),
+            'read_median_ms': round(statistics.median(read_ms), 2) if read_ms else 0,
+            'read_p99_ms': percentile(read_ms, 0.99),
+            'read_max_ms': round(read_ms[-1], 2) if read_ms else 0,
+            'lock_waits': lock_waits[0],
+            'writes_per_second': round(written[0] / elapsed),
+            'write_p99_ms': percentile(write_ms, 0.99),
+            'errors': len(errors),
+        }
@@ -0,0 +1,104 @@
+"""
+Management command to benchmark the list filters, prefix search and ordering
+Seeds a throwaway test database, checks with EXPLAIN that every filtered list
+query is served by an index and that each filtered endpoint stays under a latency budget:
+    python manage.py benchmark_filters --rows 1000000 --budget-ms 250
+"""
+from datetime import timedelta
+from urllib.parse import urlencode
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models.functions import Lower
+from django.utils import timezone
+from rest_framework.test import APIClient
+from vendormanagement.filters import prefix_upper_bound
+from vendormanagement.models import Vendor, Service
+from vendormanagement.utils.benchmark_utils import (
+    benchmark_database, seed_services, time_call, plan_uses_index, explain
+)
+
+
+class Command(BaseCommand):
+    help = 'Benchmark filtered, searched and ordered service/vendor list queries on a seeded test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000, help='Services to seed (default: 1000000)')
+        parser.add_argument('--vendors', type=int, default=1000, help='Vendors to seed (default: 1000)')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed calls per endpoint (default: 20)')
+        parser.add_argument('--budget-ms', type=float, default=250, help='Median latency budget per endpoint (default: 250)')
+
+    def handle(self, *args, **options):
+        with benchmark_database() as connection:
+            self.stdout.write(f'Seeding {options["rows"]} services on {connection.vendor}...')
+            vendor_ids = seed_services(options['rows'], vendor_count=options['vendors'])
+
+            client = APIClient()
+            client.force_authenticate(User.objects.create_user('benchmark', password='benchmark'))
+
+            today = timezone.now().date()
+            services = Service.objects.order_by('expiry_date', 'id')
+            search = 'service12'
+            checks = [
+                ('vendor', Service, {'vendor': vendor_ids[0]},
+                 services.filter(vendor__in=[vendor_ids[0]])),
+                ('vendor_status', Service, {'vendor_status': 'Inactive'},
+                 services.filter(vendor__status='Inactive')),
+                ('expiry range', Service, {'expiry_from': today, 'expiry_to': today + timedelta(days=30)},
+                 services.filter(expiry_date__gte=today, expiry_date__lte=today + timedelta(days=30))),
+                ('payment due range', Service,
+                 {'payment_due_from': today, 'payment_due_to': today + timedelta(days=7), 'ordering': 'payment_due_date'},
+                 Service.objects.filter(
+                     payment_due_date__gte=today, payment_due_date__lte=today + timedelta(days=7)
+                 ).order_by('payment_due_date', 'id')),
+                ('amount range', Service, {'amount_min': 100, 'amount_max': 150, 'ordering': 'amount'},
+                 Service.objects.filter(amount__gte=100, amount__lte=150).order_by('amount', 'id')),
+                ('ordering -amount', Service, {'ordering': '-amount'},
+                 Service.objects.order_by('-amount', '-id')),
+                ('status (snapshot)', Service, {'status': 'Expiring Soon'},
+                 services.with_status_snapshot('Expiring Soon')),
+                ('color (snapshot)', Service, {'color': 'orange'},
+                 services.status_color('orange')),
+                ('service search', Service, {'search': search},
+                 services.alias(n=Lower('service_name')).filter(
+                     n__gte=search, n__lt=prefix_upper_bound(search), n__startswith=search
+                 )),
+                # The vendor list embeds every service of each vendor, so for vendors the
+                # filtered page query and its COUNT are timed rather than the endpoint
+                ('vendor search', Vendor, None,
+                 Vendor.objects.order_by('name', 'id').alias(n=Lower('name')).filter(
+                     n__gte='vendor12', n__lt=prefix_upper_bound('vendor12'), n__startswith='vendor12'
+                 )),
+                ('vendor status', Vendor, None,
+                 Vendor.objects.filter(status='Inactive').order_by('name', 'id')),
+            ]
+
+            failures = []
+            for name, model, params, queryset in checks:
+                plan = explain(queryset[:20])
+                uses_index = plan_uses_index(plan, model._meta.db_table)
+                line = f'{name:<20} index={"yes" if uses_index else "NO"}'
+                if not uses_index:
+                    failures.append(f'{name}: no index scan\n{plan}')
+
+                if params is None:
+                    stats = time_call(lambda: (queryset.count(), list(queryset[:20])), repeat=options['repeat'])
+                    line += '  (query)'
+                else:
+                    url = f'/api/services/?{urlencode(params)}'
+                    stats = time_call(lambda: self.get(client, url), repeat=options['repeat'])
+                line += f'  median={stats["median_ms"]}ms p95={stats["p95_ms"]}ms max={stats["max_ms"]}ms'
+                if stats['median_ms'] > options['budget_ms']:
+                    failures.append(f'{name}: median {stats["median_ms"]}ms over budget {options["budget_ms"]}ms')
+                self.stdout.write(line)
+                if options['verbosity'] > 1:
+                    self.stdout.write(plan)
+
+        if failures:
+            raise CommandError('Benchmark failed:\n' + '\n'.join(failures))
+        self.stdout.write(self.style.SUCCESS('All filtered list queries use an index and are within budget'))
+
+    def get(self, client, url):
+        response = client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f'{url} returned {response.status_code}: {response.content[:200]}')
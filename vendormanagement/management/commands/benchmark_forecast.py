@@ -0,0 +1,44 @@
+"""
+Management command to benchmark the cash-flow and renewal forecast
+Seeds a throwaway test database and checks that the forecast of every granularity
+stays under a latency budget:
+    python manage.py benchmark_forecast --rows 1000000 --months 12 --budget-ms 1000
+"""
+from django.core.management.base import BaseCommand, CommandError
+from vendormanagement.utils.benchmark_utils import benchmark_database, count_queries, seed_services, time_call
+from vendormanagement.utils.forecast_utils import FORECAST_GRANULARITIES, get_service_forecast
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the vectorized service forecast on a seeded test database'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000000, help='Services to seed (default: 1000000)')
+        parser.add_argument('--vendors', type=int, default=1000, help='Vendors to seed (default: 1000)')
+        parser.add_argument('--months', type=int, default=12, help='Forecast horizon in months (default: 12)')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed calls per granularity (default: 5)')
+        parser.add_argument('--budget-ms', type=float, default=1000, help='Median latency budget (default: 1000)')
+
+    def handle(self, *args, **options):
+        failures = []
+        with benchmark_database() as connection:
+            self.stdout.write(f'Seeding {options["rows"]} services on {connection.vendor}...')
+            seed_services(options['rows'], vendor_count=options['vendors'])
+
+            for granularity in FORECAST_GRANULARITIES:
+                def forecast():
+                    return get_service_forecast(months=options['months'], granularity=granularity)
+
+                queries = count_queries(forecast)
+                stats = time_call(forecast, repeat=options['repeat'])
+                totals = forecast()['totals']
+                self.stdout.write(
+                    f'{granularity:<6} queries={queries}  median={stats["median_ms"]}ms p95={stats["p95_ms"]}ms  '
+                    f'payments={totals["payments"]} renewals={totals["renewals"]}'
+                )
+                if stats['median_ms'] > options['budget_ms']:
+                    failures.append(f'{granularity}: median {stats["median_ms"]}ms over budget {options["budget_ms"]}ms')
+
+        if failures:
+            raise CommandError('Benchmark failed:\n' + '\n'.join(failures))
+        self.stdout.write(self.style.SUCCESS('Every forecast granularity is within budget'))
@@ -0,0 +1,86 @@
+"""
+Management command to benchmark the read-only list serialization fast path
+Seeds a throwaway test database, checks that the .values() fast path renders
+byte-identical JSON to the model serializers and reports the per-row cost of each:
+    python manage.py benchmark_serializers --rows 20000 --page-size 100
+"""
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.test.utils import override_settings
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from vendormanagement.models import Service
+from vendormanagement.serializers import ServiceSerializer, ServiceRowSerializer
+from vendormanagement.utils.benchmark_utils import benchmark_database, seed_services, time_call
+
+
+class Command(BaseCommand):
+    help = 'Benchmark the .values() list serialization fast path against the model serializers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=20000, help='Services to seed (default: 20000)')
+        parser.add_argument('--vendors', type=int, default=200, help='Vendors to seed (default: 200)')
+        parser.add_argument('--page-size', type=int, default=100, help='Rows per list page (default: 100)')
+        parser.add_argument('--repeat', type=int, default=20, help='Timed calls per measurement (default: 20)')
+
+    def handle(self, *args, **options):
+        page_size = options['page_size']
+        with benchmark_database() as connection:
+            self.stdout.write(f'Seeding {options["rows"]} services on {connection.vendor}...')
+            seed_services(options['rows'], vendor_count=options['vendors'])
+
+            # Serializer cost alone, on rows already fetched from the database
+            row_count = options['rows']
+            instances = list(Service.objects.select_related('vendor').order_by('id'))
+            values = list(Service.objects.order_by('id').as_rows(today=timezone.now().date()))
+            renderer = JSONRenderer()
+            slow_json = renderer.render(ServiceSerializer(instances, many=True).data)
+            fast_json = renderer.render(ServiceRowSerializer(values).data)
+            if slow_json != fast_json:
+                raise CommandError('ServiceRowSerializer output differs from ServiceSerializer')
+
+            slow = time_call(lambda: ServiceSerializer(instances, many=True).data, repeat=3)
+            fast = time_call(lambda: ServiceRowSerializer(values).data, repeat=3)
+            self.stdout.write(
+                f'{"serialize only":<42} model={self.per_row(slow, row_count)}us/row  '
+                f'fast={self.per_row(fast, row_count)}us/row  speedup={self.speedup(slow, fast)}x'
+            )
+
+            # Whole request: query, serialization and rendering
+            client = APIClient()
+            client.force_authenticate(User.objects.create_user('benchmark', password='benchmark'))
+            for url in [
+                '/api/services/',
+                '/api/services/active_services/',
+                '/api/services/expiring_soon/',
+                '/api/vendors/',
+                '/api/vendors/list_with_active_services/',
+            ]:
+                fast_content = self.get(client, url, page_size)
+                with override_settings(FAST_LIST_SERIALIZATION=False):
+                    slow_content = self.get(client, url, page_size)
+                    slow = time_call(lambda: self.get(client, url, page_size), repeat=options['repeat'])
+                if fast_content != slow_content:
+                    raise CommandError(f'{url}: fast path JSON differs from the model serializers')
+                fast = time_call(lambda: self.get(client, url, page_size), repeat=options['repeat'])
+                self.stdout.write(
+                    f'{url:<42} model={slow["median_ms"]}ms  fast={fast["median_ms"]}ms  '
+                    f'speedup={self.speedup(slow, fast)}x'
+                )
+
+        self.stdout.write(self.style.SUCCESS('Fast path JSON is byte-identical on every endpoint'))
+
+    def get(self, client, url, page_size):
+        response = client.get(url, {'page_size': page_size})
+        if response.status_code != 200:
+            raise CommandError(f'{url} returned {response.status_code}')
+        return response.content
+
+    @staticmethod
+    def per_row(stats, rows):
+        return round(stats['median_ms'] * 1000 / rows, 2)
+
+    @staticmethod
+    def speedup(slow, fast):
+        return round(slow['median_ms'] / fast['median_ms'], 1) if fast['median_ms'] else None
@@ -17,13 +17,35 @@ class Command(BaseCommand):
             default=15,
             help='Number of days ahead to check (default: 15)',
         )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=None,
+            help='Number of concurrent sending threads (default: REMINDER_EMAIL_WORKERS setting or 4)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Messages sent per connection round (default: REMINDER_EMAIL_BATCH_SIZE setting or 50)',
+        )
+        parser.add_argument(
+            '--digest',
+            action='store_true',
+            help='Send one digest per vendor and one summary to ADMIN_EMAIL instead of one email per service',
+        )
 
     def handle(self, *args, **options):
         days = options['days']
         
         self.stdout.write(self.style.SUCCESS(f'Checking services for reminders (next {days} days)...'))
         
-        result = check_and_send_reminders(days=days)
+        result = check_and_send_reminders(
+            days=days,
+            workers=options['workers'],
+            batch_size=options['batch_size'],
+            digest=options['digest'],
+        )
         
         self.stdout.write(self.style.SUCCESS(
             f'\nReminder check completed:\n'
@@ -31,6 +53,8 @@ class Command(BaseCommand):
             f'  - Services expiring soon: {result["expiring_count"]}\n'
             f'  - Services with payment due: {result["payment_due_count"]}\n'
             f'  - Emails sent: {result["emails_sent"]}\n'
-            f'  - Emails failed: {result["emails_failed"]}'
+            f'  - Emails failed: {result["emails_failed"]}\n'
+            f'  - Reminders skipped (already sent): {result["reminders_skipped"]}\n'
+            f'  - Elapsed: {result["elapsed_seconds"]}s ({result["emails_per_second"]} emails/sec)'
         ))
 
@@ -0,0 +1,73 @@
+"""
+Management command to bulk import vendors and services from CSV files
+Streams the files in batches, e.g. for a nightly vendor feed:
+    python manage.py import_csv --vendors Vendors.csv --services Services.csv --batch-size 5000
+"""
+from django.core.management.base import BaseCommand, CommandError
+from vendormanagement.utils.import_utils import CSVFileError, import_vendors, import_services
+
+
+class Command(BaseCommand):
+    help = 'Stream vendors and/or services from CSV files into the database using batched bulk writes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--vendors',
+            help='Path to a vendors CSV file (name, contact_person, email, phone, status)',
+        )
+        parser.add_argument(
+            '--services',
+            help='Path to a services CSV file (vendor, service_name, start_date, expiry_date, payment_due_date, amount)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help='Rows written per bulk insert/transaction (default: IMPORT_BATCH_SIZE setting or 1000)',
+        )
+        parser.add_argument(
+            '--show-errors',
+            type=int,
+            default=20,
+            help='Number of row validation errors to print (default: 20)',
+        )
+
+    def handle(self, *args, **options):
+        if not options['vendors'] and not options['services']:
+            raise CommandError('Provide --vendors and/or --services')
+
+        batch_size = options['batch_size']
+        if batch_size is not None and batch_size < 1:
+            raise CommandError('--batch-size must be a positive integer')
+
+        # Vendors are imported first so the services file can reference them
+        if options['vendors']:
+            with open(options['vendors'], newline='', encoding='utf-8-sig') as csv_file:
+                try:
+                    result = import_vendors(csv_file, batch_size=batch_size)
+                except CSVFileError as e:
+                    raise CommandError(f"{options['vendors']}: {e}")
+            self.report('Vendors', result, options['show_errors'])
+
+        if options['services']:
+            with open(options['services'], newline='', encoding='utf-8-sig') as csv_file:
+                try:
+                    result = import_services(csv_file, batch_size=batch_size)
+                except CSVFileError as e:
+                    raise CommandError(f"{options['services']}: {e}")
+            self.report('Services', result, options['show_errors'])
+
+    def report(self, label, result, show_errors):
+        style = self.style.SUCCESS if not result['rows_failed'] else self.style.WARNING
+        self.stdout.write(style(
+            f'\n{label} import completed:\n'
+            f'  - Rows processed: {result["rows_processed"]}\n'
+            f'  - Rows written: {result["rows_written"]}\n'
+            f'  - Rows failed: {result["rows_failed"]}\n'
+            f'  - Elapsed: {result["elapsed_seconds"]}s ({result["rows_per_second"]} rows/sec)'
+        ))
+        for error in result['errors'][:show_errors]:
+            messages = '; '.join(
+                f'{field}: {" ".join(msgs)}' for field, msgs in error['errors'].items()
+            )
+            self.stdout.write(self.style.ERROR(f'  line {error["line"]}: {messages}'))
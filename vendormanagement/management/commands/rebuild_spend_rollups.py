@@ -0,0 +1,25 @@
+"""
+Management command that recomputes the vendor monthly spend rollups from the services
+Writes keep the rollups current; run it after loading data that bypasses them
+(loaddata, raw SQL) or to repair drift:
+    python manage.py rebuild_spend_rollups
+    python manage.py rebuild_spend_rollups --vendor 3 --vendor 7
+"""
+from django.core.management.base import BaseCommand
+from vendormanagement.utils.spend_utils import rebuild_spend_rollups
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the vendor monthly spend rollups with one GROUP BY query'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--vendor', type=int, action='append', dest='vendors', help='Only this vendor id (repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        summary = rebuild_spend_rollups(vendor_ids=options['vendors'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {summary['written']} spend rollup row(s) (replaced {summary['deleted']}) "
+            f"in {summary['seconds']:.2f}s"
+        ))
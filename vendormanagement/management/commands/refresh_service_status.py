@@ -0,0 +1,26 @@
+"""
+Management command that materializes today's status and status color of every service
+Run it daily just after midnight so status filters and color groupings can use the snapshot:
+    5 0 * * * cd /path/to/project && python manage.py refresh_service_status
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+from vendormanagement.models import Service
+from vendormanagement.utils.cache_utils import invalidate_aggregates
+
+
+class Command(BaseCommand):
+    help = "Refresh the materialized status snapshot of every service in one UPDATE"
+
+    def handle(self, *args, **options):
+        today = timezone.now().date()
+        started = time.perf_counter()
+        updated = Service.objects.refresh_status_snapshots(today=today)
+        # QuerySet.update sends no post_save signals
+        invalidate_aggregates()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f'Refreshed the status snapshot of {updated} service(s) for {today} in {elapsed:.2f}s'
+        ))
@@ -0,0 +1,61 @@
+"""
+Management command to roll service dates forward for contract renewals
+Preview first, then apply:
+    python manage.py renew_services --months 12 --expiry-from 2025-01-01 --expiry-to 2025-03-31 --dry-run
+    python manage.py renew_services --months 12 --expiry-from 2025-01-01 --expiry-to 2025-03-31
+"""
+from datetime import date
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from vendormanagement.serializers import ServiceRenewalSerializer
+from vendormanagement.utils.renewal_utils import RENEWAL_DATE_FIELDS, renew_services
+
+
+class Command(BaseCommand):
+    help = 'Shift expiry/payment due dates of matching services by months and/or days in one UPDATE'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--months', type=int, default=0, help='Months to add (negative to move back)')
+        parser.add_argument('--days', type=int, default=0, help='Days to add after the months')
+        parser.add_argument(
+            '--fields',
+            nargs='+',
+            choices=RENEWAL_DATE_FIELDS,
+            default=list(RENEWAL_DATE_FIELDS),
+            help='Date fields to shift (default: both)',
+        )
+        parser.add_argument('--vendor', type=int, help='Only services of this vendor id')
+        parser.add_argument('--expiry-from', type=date.fromisoformat, help='Only services expiring on/after (YYYY-MM-DD)')
+        parser.add_argument('--expiry-to', type=date.fromisoformat, help='Only services expiring on/before (YYYY-MM-DD)')
+        parser.add_argument('--amount-min', type=Decimal, help='Only services with at least this amount')
+        parser.add_argument('--amount-max', type=Decimal, help='Only services with at most this amount')
+        parser.add_argument('--dry-run', action='store_true', help='Report what would change without updating')
+
+    def handle(self, *args, **options):
+        data = {
+            name: options[name]
+            for name in ServiceRenewalSerializer.filter_fields + ['months', 'days', 'fields', 'dry_run']
+            if options[name] is not None
+        }
+        serializer = ServiceRenewalSerializer(data=data)
+        if not serializer.is_valid():
+            raise CommandError('; '.join(
+                ' '.join(messages) if name == 'non_field_errors' else f"{name}: {' '.join(messages)}"
+                for name, messages in serializer.errors.items()
+            ))
+        summary = renew_services(**serializer.validated_data)
+
+        self.stdout.write(
+            f"Matched {summary['matched']} service(s) of {summary['vendors']} vendor(s), "
+            f"total amount {summary['total_amount']}"
+        )
+        if summary['matched']:
+            self.stdout.write(
+                f"Expiry dates {summary['expiry_from']}..{summary['expiry_to']} -> "
+                f"{summary['new_expiry_from']}..{summary['new_expiry_to']}"
+            )
+        if summary['dry_run']:
+            self.stdout.write(self.style.WARNING('Dry run: nothing was updated'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Updated {summary['updated']} service(s)"))
@@ -0,0 +1,42 @@
+"""
+Management command that runs queued background jobs (e.g. reminder checks queued by the API)
+Keep it running under a process supervisor:
+    python manage.py run_jobs
+or drain the queue from cron:
+    python manage.py run_jobs --once
+"""
+from django.core.management.base import BaseCommand
+from vendormanagement.utils.job_utils import work
+
+
+class Command(BaseCommand):
+    help = 'Run background jobs from the database job queue'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit when the queue is empty instead of polling for new jobs',
+        )
+        parser.add_argument(
+            '--poll-interval',
+            type=float,
+            default=2.0,
+            help='Seconds to wait between polls of an empty queue (default: 2)',
+        )
+        parser.add_argument(
+            '--max-jobs',
+            type=int,
+            default=None,
+            help='Exit after running this many jobs',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Job worker started'))
+        jobs_run = work(
+            once=options['once'],
+            poll_interval=options['poll_interval'],
+            max_jobs=options['max_jobs'],
+            stdout=self.stdout,
+        )
+        self.stdout.write(self.style.SUCCESS(f'Job worker finished: {jobs_run} job(s) run'))
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.8 on 2026-10-17 22:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendormanagement', '0004_remove_service_status'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['expiry_date', 'id'], name='service_expiry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['payment_due_date', 'id'], name='service_payment_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['vendor', 'expiry_date'], name='service_vendor_expiry_idx'),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.8 on 2026-10-17 22:58
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendormanagement', '0005_service_date_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reminder_type', models.CharField(choices=[('expiry', 'Expiry'), ('payment', 'Payment due')], help_text='Reminder type', max_length=10)),
+                ('target_date', models.DateField(help_text='Expiry or payment due date the reminder was sent for')),
+                ('sent_at', models.DateTimeField(auto_now_add=True, help_text='Reminder send date')),
+                ('service', models.ForeignKey(help_text='Service', on_delete=django.db.models.deletion.CASCADE, related_name='reminder_logs', to='vendormanagement.service')),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('service', 'reminder_type', 'target_date'), name='unique_reminder_log')],
+            },
+        ),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-17 22:59
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendormanagement', '0006_reminderlog'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(help_text='Job type', max_length=50)),
+                ('params', models.JSONField(blank=True, default=dict, help_text='Job parameters')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('succeeded', 'Succeeded'), ('failed', 'Failed')], default='queued', help_text='Job status', max_length=10)),
+                ('progress_done', models.PositiveIntegerField(default=0, help_text='Work items completed')),
+                ('progress_total', models.PositiveIntegerField(default=0, help_text='Work items in total')),
+                ('result', models.JSONField(blank=True, help_text='Job result summary', null=True)),
+                ('error', models.TextField(blank=True, help_text='Error of a failed job')),
+                ('created_at', models.DateTimeField(auto_now_add=True, help_text='Job creation date')),
+                ('started_at', models.DateTimeField(blank=True, help_text='Job start date', null=True)),
+                ('finished_at', models.DateTimeField(blank=True, help_text='Job end date', null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Last progress update')),
+                ('created_by', models.ForeignKey(blank=True, help_text='User who queued the job', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'created_at'], name='job_status_created_idx')],
+            },
+        ),
+    ]
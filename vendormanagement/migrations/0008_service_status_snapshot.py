@@ -0,0 +1,37 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:13
+
+import datetime
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendormanagement', '0007_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='service',
+            name='color_snapshot',
+            field=models.CharField(blank=True, editable=False, help_text='Status color on snapshot date', max_length=10),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='snapshot_date',
+            field=models.DateField(default=datetime.date(1, 1, 1), editable=False, help_text='Date the status snapshot is for (date.min: never computed)'),
+        ),
+        migrations.AddField(
+            model_name='service',
+            name='status_snapshot',
+            field=models.CharField(blank=True, editable=False, help_text='Status on snapshot date', max_length=20),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['snapshot_date', 'color_snapshot', 'expiry_date', 'id'], name='service_snapshot_color_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['snapshot_date', 'status_snapshot', 'expiry_date', 'id'], name='service_snapshot_status_idx'),
+        ),
+    ]
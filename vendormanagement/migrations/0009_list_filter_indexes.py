@@ -0,0 +1,30 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:15
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendormanagement', '0008_service_status_snapshot'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['amount', 'id'], name='service_amount_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(django.db.models.functions.text.Lower('service_name'), name='service_name_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['status', 'name'], name='vendor_status_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='vendor_name_lower_idx'),
+        ),
+    ]
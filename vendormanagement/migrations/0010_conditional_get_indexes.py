@@ -0,0 +1,21 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:29
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendormanagement', '0009_list_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['updated_at'], name='service_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vendor',
+            index=models.Index(fields=['updated_at'], name='vendor_updated_idx'),
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.8 on 2026-10-17 23:44
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncMonth
+
+
+def build_spend_rollups(apps, schema_editor):
+    """Initial rollups of the existing services (the rebuild_spend_rollups query)"""
+    Service = apps.get_model('vendormanagement', 'Service')
+    VendorMonthlySpend = apps.get_model('vendormanagement', 'VendorMonthlySpend')
+    rows = Service.objects.annotate(month=TruncMonth('payment_due_date')).order_by().values('vendor_id', 'month').annotate(
+        total_amount=Sum('amount', output_field=models.DecimalField(max_digits=14, decimal_places=2)),
+        service_count=Count('id'),
+    )
+    VendorMonthlySpend.objects.bulk_create([VendorMonthlySpend(**row) for row in rows], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendormanagement', '0010_conditional_get_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='VendorMonthlySpend',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('month', models.DateField(help_text='First day of the payment due month')),
+                ('total_amount', models.DecimalField(decimal_places=2, help_text='Sum of the service amounts', max_digits=14)),
+                ('service_count', models.PositiveIntegerField(help_text='Services with payment due in the month')),
+                ('updated_at', models.DateTimeField(auto_now=True, help_text='Last refresh date')),
+                ('vendor', models.ForeignKey(help_text='Vendor', on_delete=django.db.models.deletion.CASCADE, related_name='monthly_spend', to='vendormanagement.vendor')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['month', 'vendor'], name='spend_month_vendor_idx')],
+                'constraints': [models.UniqueConstraint(fields=('vendor', 'month'), name='unique_vendor_month_spend')],
+            },
+        ),
+        migrations.RunPython(build_spend_rollups, migrations.RunPython.noop),
+    ]
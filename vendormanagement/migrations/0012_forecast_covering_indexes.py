@@ -0,0 +1,29 @@
+# Generated by Django 5.2.8 on 2026-10-18 00:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('vendormanagement', '0011_vendor_monthly_spend'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='service',
+            name='service_expiry_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='service',
+            name='service_payment_due_idx',
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['expiry_date', 'id', 'amount'], name='service_expiry_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='service',
+            index=models.Index(fields=['payment_due_date', 'id', 'amount'], name='service_payment_due_idx'),
+        ),
+    ]
@@ -1,5 +1,76 @@
+from django.conf import settings
 from django.db import models
+from django.db.models import Case, Count, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Lower
+from django.db.models.lookups import LessThan, LessThanOrEqual
 from django.utils import timezone
+from datetime import date, timedelta
+
+
+STATUS_COLORS = ('red', 'orange', 'yellow', 'green', 'gray')
+SERVICE_STATUSES = ('Expired', 'Expiring Soon', 'Active')
+# The materialized status snapshot is computed for this "soon" window
+STATUS_SNAPSHOT_DAYS = 15
+STATUS_SNAPSHOT_FIELDS = ('status_snapshot', 'color_snapshot', 'snapshot_date')
+
+
+def status_color_conditions(days=15, today=None):
+    """
+    Mutually exclusive filters for each status color, mirroring Service.get_status_color:
+    red = expired, orange = payment overdue, yellow = expiring/payment due within days,
+    gray = everything else. Green is never assigned.
+    """
+    today = today or timezone.now().date()
+    soon = today + timedelta(days=days)
+    not_overdue = Q(expiry_date__gte=today, payment_due_date__gte=today)
+    return {
+        'red': Q(expiry_date__lt=today),
+        'orange': Q(expiry_date__gte=today, payment_due_date__lt=today),
+        'yellow': not_overdue & (Q(expiry_date__lte=soon) | Q(payment_due_date__lte=soon)),
+        'green': Q(pk__in=[]),
+        'gray': Q(expiry_date__gt=soon, payment_due_date__gt=soon),
+    }
+
+
+def status_case(days=15, today=None, expiry=None):
+    """
+    Case expression for the ServiceSerializer status (Expired/Expiring Soon/Active).
+    expiry defaults to the expiry_date column; pass an expression to evaluate shifted dates.
+    """
+    today = today or timezone.now().date()
+    expiry = expiry if expiry is not None else F('expiry_date')
+    return Case(
+        When(LessThan(expiry, Value(today)), then=Value('Expired')),
+        When(LessThanOrEqual(expiry, Value(today + timedelta(days=days))), then=Value('Expiring Soon')),
+        default=Value('Active'),
+        output_field=models.CharField(),
+    )
+
+
+def status_color_case(days=15, today=None, expiry=None, payment=None):
+    """Case expression for Service.get_status_color, see status_case"""
+    today = today or timezone.now().date()
+    soon = Value(today + timedelta(days=days))
+    expiry = expiry if expiry is not None else F('expiry_date')
+    payment = payment if payment is not None else F('payment_due_date')
+    return Case(
+        When(LessThan(expiry, Value(today)), then=Value('red')),
+        When(LessThan(payment, Value(today)), then=Value('orange')),
+        When(LessThanOrEqual(expiry, soon), then=Value('yellow')),
+        When(LessThanOrEqual(payment, soon), then=Value('yellow')),
+        default=Value('gray'),
+        output_field=models.CharField(),
+    )
+
+
+def status_snapshot_values(today=None, expiry=None, payment=None):
+    """QuerySet.update() values that materialize the status snapshot for today"""
+    today = today or timezone.now().date()
+    return {
+        'status_snapshot': status_case(STATUS_SNAPSHOT_DAYS, today, expiry),
+        'color_snapshot': status_color_case(STATUS_SNAPSHOT_DAYS, today, expiry, payment),
+        'snapshot_date': today,
+    }
 
 
 class Vendor(models.Model):
@@ -16,10 +87,103 @@ class Vendor(models.Model):
     created_at = models.DateTimeField(auto_now_add=True, help_text='Vendor creation date')
     updated_at = models.DateTimeField(auto_now=True, help_text='Vendor last update date')
 
+    class Meta:
+        indexes = [
+            # ?status= filter, already in list order
+            models.Index(fields=['status', 'name'], name='vendor_status_name_idx'),
+            # Case-insensitive prefix search on name
+            models.Index(Lower('name'), name='vendor_name_lower_idx'),
+            # MAX(updated_at) of the conditional GET validators
+            models.Index(fields=['updated_at'], name='vendor_updated_idx'),
+        ]
+
     def __str__(self):
         return self.name
 
 
+class ServiceQuerySet(models.QuerySet):
+    """Date-window filters shared by the API, reminders and benchmarks (index-backed)"""
+
+    def expiring_soon(self, days=15, today=None):
+        """Services expiring between today and today + days"""
+        today = today or timezone.now().date()
+        return self.filter(expiry_date__gte=today, expiry_date__lte=today + timedelta(days=days))
+
+    def payment_due_soon(self, days=15, today=None):
+        """Services with payment due between today and today + days"""
+        today = today or timezone.now().date()
+        return self.filter(payment_due_date__gte=today, payment_due_date__lte=today + timedelta(days=days))
+
+    def active(self, today=None):
+        """Services that have not expired yet"""
+        return self.filter(expiry_date__gte=today or timezone.now().date())
+
+    def expired(self, today=None):
+        """Services whose expiry date has passed"""
+        return self.filter(expiry_date__lt=today or timezone.now().date())
+
+    def with_status_color(self, days=15, today=None):
+        """Annotate status_color computed by the database with Case/When"""
+        return self.annotate(status_color=status_color_case(days=days, today=today))
+
+    def with_status(self, days=15, today=None):
+        """Annotate the ServiceSerializer status (Expired/Expiring Soon/Active) computed by the database"""
+        return self.annotate(status=status_case(days=days, today=today))
+
+    def as_rows(self, today=None):
+        """Plain .values() rows with everything ServiceSerializer outputs, for read-only fast paths"""
+        # vendor_name is a correlated subquery rather than a join so that the pagination
+        # COUNT(*) drops it and can still be answered from the filter's index
+        vendor_name = Subquery(Vendor.objects.filter(pk=OuterRef('vendor')).values('name')[:1])
+        return self.with_status(today=today).values(
+            'id', 'vendor', 'service_name', 'start_date', 'expiry_date', 'payment_due_date', 'amount',
+            'created_at', 'updated_at', 'status', vendor_name=vendor_name,
+        )
+
+    def snapshot_is_current(self, today=None):
+        """True when every service has a status snapshot for today (one indexed EXISTS query)"""
+        today = today or timezone.now().date()
+        return not self.filter(snapshot_date__lt=today).exists()
+
+    def use_snapshot(self, days, today, use_snapshot=None):
+        if days != STATUS_SNAPSHOT_DAYS:
+            return False
+        return self.snapshot_is_current(today) if use_snapshot is None else use_snapshot
+
+    def status_color(self, color, days=15, today=None, use_snapshot=None):
+        """
+        Services of one status color: an indexed equality lookup on the materialized snapshot
+        when it is current, otherwise filtered on the indexed date columns
+        """
+        today = today or timezone.now().date()
+        if self.use_snapshot(days, today, use_snapshot):
+            return self.filter(snapshot_date=today, color_snapshot=color)
+        return self.filter(status_color_conditions(days=days, today=today)[color])
+
+    def with_status_snapshot(self, status, days=15, today=None, use_snapshot=None):
+        """Services with one ServiceSerializer status, from the snapshot when it is current"""
+        today = today or timezone.now().date()
+        if self.use_snapshot(days, today, use_snapshot):
+            return self.filter(snapshot_date=today, status_snapshot=status)
+        return self.alias(computed_status=status_case(days=days, today=today)).filter(computed_status=status)
+
+    def status_color_counts(self, days=15, today=None, use_snapshot=None):
+        """Number of services per status color from a single GROUP BY query"""
+        today = today or timezone.now().date()
+        counts = dict.fromkeys(STATUS_COLORS, 0)
+        if self.use_snapshot(days, today, use_snapshot):
+            rows = self.filter(snapshot_date=today).order_by().values(status_color=F('color_snapshot'))
+        else:
+            rows = self.with_status_color(days=days, today=today).order_by().values('status_color')
+        for row in rows.annotate(count=Count('id')):
+            counts[row['status_color']] = row['count']
+        return counts
+
+    def refresh_status_snapshots(self, today=None):
+        """Materialize today's status snapshot of every service in one UPDATE"""
+        return self.update(**status_snapshot_values(today=today))
+
+
 class Service(models.Model):
     
     vendor = models.ForeignKey(Vendor, on_delete=models.CASCADE, related_name='services', help_text='Vendor')
@@ -28,36 +192,178 @@ class Service(models.Model):
     expiry_date = models.DateField('expiry date', help_text='Service expiry date')
     payment_due_date = models.DateField('payment due date', help_text='Service payment due date')
     amount = models.DecimalField(max_digits=10, decimal_places=2, help_text='Service amount')
+    # Materialized status, refreshed daily by refresh_service_status and on save;
+    # only valid when snapshot_date is today
+    status_snapshot = models.CharField(max_length=20, blank=True, editable=False, help_text='Status on snapshot date')
+    color_snapshot = models.CharField(max_length=10, blank=True, editable=False, help_text='Status color on snapshot date')
+    snapshot_date = models.DateField(
+        default=date.min, editable=False, help_text='Date the status snapshot is for (date.min: never computed)'
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ServiceQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Range scans on the date windows, ordered by (date, id) for stable paging;
+            # amount makes them covering for the per-day sums of the forecast
+            models.Index(fields=['expiry_date', 'id', 'amount'], name='service_expiry_idx'),
+            models.Index(fields=['payment_due_date', 'id', 'amount'], name='service_payment_due_idx'),
+            # Per-vendor expiry lookups (active services of a vendor)
+            models.Index(fields=['vendor', 'expiry_date'], name='service_vendor_expiry_idx'),
+            # Equality lookups on the status snapshot, already in list order
+            models.Index(fields=['snapshot_date', 'color_snapshot', 'expiry_date', 'id'], name='service_snapshot_color_idx'),
+            models.Index(fields=['snapshot_date', 'status_snapshot', 'expiry_date', 'id'], name='service_snapshot_status_idx'),
+            # Amount range filters and ordering
+            models.Index(fields=['amount', 'id'], name='service_amount_idx'),
+            # Case-insensitive prefix search on service_name
+            models.Index(Lower('service_name'), name='service_name_lower_idx'),
+            # MAX(updated_at) of the conditional GET validators
+            models.Index(fields=['updated_at'], name='service_updated_idx'),
+        ]
+
     def __str__(self):
         return f"{self.service_name} - {self.vendor.name}"
     
-    def is_expiring_soon(self, days=15):
+    def is_expiring_soon(self, days=15, today=None):
         """Check if service is expiring within specified days"""
-        from django.utils import timezone
-        today = timezone.now().date()
+        today = today or timezone.now().date()
         days_until_expiry = (self.expiry_date - today).days
         return 0 <= days_until_expiry <= days
     
-    def is_payment_due_soon(self, days=15):
+    def is_payment_due_soon(self, days=15, today=None):
         """Check if payment is due within specified days"""
-        from django.utils import timezone
-        today = timezone.now().date()
+        today = today or timezone.now().date()
         days_until_payment = (self.payment_due_date - today).days
         return 0 <= days_until_payment <= days
     
-    def get_status_color(self):
+    def get_status_color(self, today=None):
         """Get color code based on service status and dates"""
-        from django.utils import timezone
-        today = timezone.now().date()
+        today = today or timezone.now().date()
         
         if self.expiry_date < today:
             return 'red'
         elif self.payment_due_date < today:
             return 'orange'
-        elif self.is_expiring_soon() or self.is_payment_due_soon():
+        elif self.is_expiring_soon(today=today) or self.is_payment_due_soon(today=today):
             return 'yellow'
         else:
             return 'gray'
+
+    def get_status(self, today=None):
+        """Get the ServiceSerializer status: Expired, Expiring Soon or Active"""
+        today = today or timezone.now().date()
+        if self.expiry_date < today:
+            return 'Expired'
+        elif (self.expiry_date - today).days <= STATUS_SNAPSHOT_DAYS:
+            return 'Expiring Soon'
+        return 'Active'
+
+    def refresh_status_snapshot(self, today=None):
+        """Recompute the materialized status fields (without saving); used by bulk writes"""
+        today = today or timezone.now().date()
+        self.status_snapshot = self.get_status(today)
+        self.color_snapshot = self.get_status_color(today)
+        self.snapshot_date = today
+
+    def current_status_color(self, today=None):
+        """Status color from the snapshot when it is for today, computed otherwise"""
+        today = today or timezone.now().date()
+        return self.color_snapshot if self.snapshot_date == today else self.get_status_color(today)
+
+    def current_status(self, today=None):
+        """Status from the snapshot when it is for today, computed otherwise"""
+        today = today or timezone.now().date()
+        return self.status_snapshot if self.snapshot_date == today else self.get_status(today)
+
+    def save(self, *args, **kwargs):
+        # Dates may still be strings here (e.g. Service.objects.create(expiry_date='2025-01-31'))
+        self.expiry_date = self._meta.get_field('expiry_date').to_python(self.expiry_date)
+        self.payment_due_date = self._meta.get_field('payment_due_date').to_python(self.payment_due_date)
+        if self.expiry_date is not None and self.payment_due_date is not None:
+            self.refresh_status_snapshot()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, *STATUS_SNAPSHOT_FIELDS}
+        super().save(*args, **kwargs)
+
+
+class ReminderLog(models.Model):
+    """Ledger of reminders already sent, so repeated reminder runs skip them"""
+    REMINDER_TYPE_CHOICES = [
+        ('expiry', 'Expiry'),
+        ('payment', 'Payment due'),
+    ]
+
+    service = models.ForeignKey(Service, on_delete=models.CASCADE, related_name='reminder_logs', help_text='Service')
+    reminder_type = models.CharField(max_length=10, choices=REMINDER_TYPE_CHOICES, help_text='Reminder type')
+    target_date = models.DateField(help_text='Expiry or payment due date the reminder was sent for')
+    sent_at = models.DateTimeField(auto_now_add=True, help_text='Reminder send date')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['service', 'reminder_type', 'target_date'], name='unique_reminder_log'),
+        ]
+
+    def __str__(self):
+        return f"{self.get_reminder_type_display()} reminder for service {self.service_id} ({self.target_date})"
+
+
+class Job(models.Model):
+    """Background job stored in the database and executed by the run_jobs worker command"""
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('succeeded', 'Succeeded'),
+        ('failed', 'Failed'),
+    ]
+
+    kind = models.CharField(max_length=50, help_text='Job type')
+    params = models.JSONField(default=dict, blank=True, help_text='Job parameters')
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued', help_text='Job status')
+    progress_done = models.PositiveIntegerField(default=0, help_text='Work items completed')
+    progress_total = models.PositiveIntegerField(default=0, help_text='Work items in total')
+    result = models.JSONField(null=True, blank=True, help_text='Job result summary')
+    error = models.TextField(blank=True, help_text='Error of a failed job')
+    created_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, null=True, blank=True, on_delete=models.SET_NULL, related_name='jobs',
+        help_text='User who queued the job'
+    )
+    created_at = models.DateTimeField(auto_now_add=True, help_text='Job creation date')
+    started_at = models.DateTimeField(null=True, blank=True, help_text='Job start date')
+    finished_at = models.DateTimeField(null=True, blank=True, help_text='Job end date')
+    updated_at = models.DateTimeField(auto_now=True, help_text='Last progress update')
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'created_at'], name='job_status_created_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} #{self.pk} ({self.status})"
+
+
+class VendorMonthlySpend(models.Model):
+    """
+    Amount owed to a vendor per month of payment_due_date, precomputed from its services.
+    Kept current by the Service signals and the bulk write paths; rebuilt in full by the
+    rebuild_spend_rollups command.
+    """
+    vendor = models.ForeignKey(Vendor, on_delete=models.CASCADE, related_name='monthly_spend', help_text='Vendor')
+    month = models.DateField(help_text='First day of the payment due month')
+    total_amount = models.DecimalField(max_digits=14, decimal_places=2, help_text='Sum of the service amounts')
+    service_count = models.PositiveIntegerField(help_text='Services with payment due in the month')
+    updated_at = models.DateTimeField(auto_now=True, help_text='Last refresh date')
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['vendor', 'month'], name='unique_vendor_month_spend'),
+        ]
+        indexes = [
+            # Month range filters across vendors
+            models.Index(fields=['month', 'vendor'], name='spend_month_vendor_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.vendor_id} {self.month:%Y-%m}: {self.total_amount}"
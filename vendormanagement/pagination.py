@@ -1,4 +1,14 @@
-from rest_framework.pagination import PageNumberPagination
+import base64
+import binascii
+import json
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
 
 
 class CustomPageNumberPagination(PageNumberPagination):
@@ -9,3 +19,183 @@ class CustomPageNumberPagination(PageNumberPagination):
     page_size_query_param = 'page_size'
     max_page_size = 100
 
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (cursor) pagination: each page is fetched with WHERE (a, id) > (last a, last id)
+    on an indexed ordering instead of OFFSET, so every page costs the same however deep it is.
+
+    Query parameters:
+        cursor: Opaque position returned in the next/previous links
+        page_size: Items per page (capped at max_page_size)
+        count: 'none' (default, no COUNT query), 'estimate' or 'exact'
+    """
+    page_size = CustomPageNumberPagination.page_size
+    page_size_query_param = 'page_size'
+    max_page_size = CustomPageNumberPagination.max_page_size
+    cursor_query_param = 'cursor'
+    count_query_param = 'count'
+    ordering = ('id',)
+    # Estimates on backends without planner row estimates count at most this many rows
+    count_estimate_cap = 10000
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.ordering = self.get_ordering(queryset, view)
+        position, reverse = self.decode_cursor(request)
+        self.count, self.count_is_estimate = self.get_count(queryset, request)
+
+        ordering = [self.invert(field) for field in self.ordering] if reverse else list(self.ordering)
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(self.keyset_filter(ordering, position))
+
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        results = results[:self.page_size]
+        if reverse:
+            results.reverse()
+            self.has_next, self.has_previous = position is not None, has_more
+        else:
+            self.has_next, self.has_previous = has_more, position is not None
+        self.page = results
+        return results
+
+    def get_paginated_response(self, data):
+        response = {}
+        if self.count is not None:
+            response['count'] = self.count
+            response['count_is_estimate'] = self.count_is_estimate
+        response['next'] = self.get_next_link()
+        response['previous'] = self.get_previous_link()
+        response['results'] = data
+        return Response(response)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_ordering(self, queryset, view):
+        """
+        Use the queryset's explicit ordering, otherwise the view's cursor_ordering;
+        the primary key is always the tie-breaker. Only plain fields of the model can
+        be keyset-paginated, anything else is a 400.
+        """
+        ordering = list(queryset.query.order_by) or list(getattr(view, 'cursor_ordering', self.ordering))
+        for field in ordering:
+            if not isinstance(field, str) or '__' in field or field.lstrip('-') == '?':
+                raise ValidationError({'ordering': [f'Cursor pagination does not support ordering by {field}']})
+        if ordering[-1].lstrip('-') not in ('id', 'pk'):
+            ordering.append('id')
+        return ordering
+
+    def get_count(self, queryset, request):
+        mode = request.query_params.get(self.count_query_param, 'none')
+        if mode == 'exact':
+            return queryset.count(), False
+        if mode == 'estimate':
+            return self.estimate_count(queryset)
+        return None, False
+
+    def estimate_count(self, queryset):
+        """
+        Cheap row count: the planner's estimate on PostgreSQL, elsewhere an exact
+        count bounded by count_estimate_cap (flagged as an estimate once the cap is hit).
+        """
+        if connections[queryset.db].vendor == 'postgresql':
+            plan = json.loads(queryset.order_by().explain(format='json'))
+            return int(plan[0]['Plan']['Plan Rows']), True
+        count = queryset.order_by()[:self.count_estimate_cap].count()
+        return count, count >= self.count_estimate_cap
+
+    @staticmethod
+    def invert(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+    @staticmethod
+    def keyset_filter(ordering, position):
+        """
+        Rows strictly after position in ordering:
+        (a > va) OR (a = va AND b > vb) OR ... with a leading a >= va so the index range is used
+        """
+        condition = Q()
+        equal = {}
+        for field, value in zip(ordering, position):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            condition |= Q(**equal, **{f'{name}__{lookup}': value})
+            equal[name] = value
+        first = ordering[0]
+        leading = 'lte' if first.startswith('-') else 'gte'
+        return Q(**{f'{first.lstrip("-")}__{leading}': position[0]}) & condition
+
+    def get_position(self, item):
+        position = []
+        for field in self.ordering:
+            name = field.lstrip('-')
+            if isinstance(item, dict):
+                value = item[name] if name in item else item[f'{name}_id']
+            else:
+                value = getattr(item, 'pk' if name == 'pk' else item._meta.get_field(name).attname)
+            position.append(value)
+        return position
+
+    def encode_cursor(self, item, reverse):
+        payload = json.dumps({'p': self.get_position(item), 'r': reverse, 'o': self.ordering}, cls=DjangoJSONEncoder)
+        cursor = base64.urlsafe_b64encode(payload.encode()).decode()
+        return replace_query_param(self.base_url, self.cursor_query_param, cursor)
+
+    def decode_cursor(self, request):
+        cursor = request.query_params.get(self.cursor_query_param)
+        if not cursor:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode()).decode())
+            position, reverse, ordering = payload['p'], bool(payload['r']), payload['o']
+        except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+            raise NotFound(self.invalid_cursor_message)
+        # A cursor is only a position in the ordering it was issued for
+        if ordering != list(self.ordering) or not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self.encode_cursor(self.page[0], reverse=True)
+
+
+class KeysetPaginationMixin:
+    """
+    ViewSet mixin that switches every paginated action to KeysetPagination
+    when the request opts in with ?pagination=cursor (or carries a cursor)
+    """
+    cursor_pagination_class = KeysetPagination
+    cursor_ordering = ('id',)
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            pagination_class = self.pagination_class
+            if params.get('pagination') == 'cursor' or self.cursor_pagination_class.cursor_query_param in params:
+                pagination_class = self.cursor_pagination_class
+            self._paginator = pagination_class() if pagination_class is not None else None
+        return self._paginator
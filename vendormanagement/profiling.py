@@ -0,0 +1,192 @@
+"""
+Request profiling: per-endpoint latency, database query count/time and serializer time
+Enabled with PROFILING_ENABLED; the percentiles of the last PROFILING_WINDOW requests of
+every endpoint are kept in memory (per process) and served by /api/_metrics/.
+"""
+import logging
+import math
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.serializers import ListSerializer
+
+logger = logging.getLogger('vendormanagement.profiling')
+
+DEFAULT_PROFILING_WINDOW = 1000
+DEFAULT_PROFILING_SLOW_MS = 500
+# Queries kept per request for the slow log
+MAX_LOGGED_QUERIES = 200
+PROFILE_METRICS = ('latency_ms', 'queries', 'db_ms', 'serializer_ms')
+PERCENTILES = (50, 90, 99)
+
+current_profile = ContextVar('current_profile', default=None)
+
+
+class RequestProfile:
+    """Counters of the request being handled, reachable through current_profile"""
+
+    def __init__(self):
+        self.query_count = 0
+        self.db_ms = 0.0
+        self.serializer_ms = 0.0
+        self.serializing = False
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        """Database execute wrapper timing every query"""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.query_count += 1
+            self.db_ms += elapsed
+            if len(self.queries) < MAX_LOGGED_QUERIES:
+                self.queries.append((sql, elapsed))
+
+
+@contextmanager
+def serializer_timer():
+    """
+    Add the time spent in the block to the current request's serializer time, less the
+    queries it runs (lazy querysets). Nested blocks are only counted once.
+    """
+    profile = current_profile.get()
+    if profile is None or profile.serializing:
+        yield
+        return
+    profile.serializing = True
+    started, db_ms = time.perf_counter(), profile.db_ms
+    try:
+        yield
+    finally:
+        profile.serializing = False
+        profile.serializer_ms += (time.perf_counter() - started) * 1000 - (profile.db_ms - db_ms)
+
+
+class ProfiledSerializerMixin:
+    """
+    Serializer mixin adding the time spent rendering .data to the current request's
+    serializer time; set Meta.list_serializer_class = ProfiledListSerializer to time
+    many=True lists as well
+    """
+
+    @property
+    def data(self):
+        with serializer_timer():
+            return super().data
+
+
+class ProfiledListSerializer(ProfiledSerializerMixin, ListSerializer):
+    pass
+
+
+def percentile(ordered, p):
+    """Nearest-rank percentile of a sorted list"""
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+class ProfileStore:
+    """Rolling windows of request samples per endpoint"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.endpoints = {}
+
+    def record(self, endpoint, sample, status_code):
+        window = getattr(settings, 'PROFILING_WINDOW', DEFAULT_PROFILING_WINDOW)
+        with self.lock:
+            stats = self.endpoints.get(endpoint)
+            if stats is None:
+                stats = self.endpoints[endpoint] = {
+                    'count': 0, 'errors': 0,
+                    'sums': dict.fromkeys(PROFILE_METRICS, 0),
+                    'samples': {metric: deque(maxlen=window) for metric in PROFILE_METRICS},
+                }
+            stats['count'] += 1
+            stats['errors'] += status_code >= 500
+            for metric in PROFILE_METRICS:
+                stats['sums'][metric] += sample[metric]
+                stats['samples'][metric].append(sample[metric])
+
+    def snapshot(self):
+        """
+        Returns:
+            dict: Per endpoint, the request and 5xx counts (since start) and for each
+                  metric its percentiles and max over the window and its running sum
+        """
+        with self.lock:
+            endpoints = {
+                endpoint: (stats['count'], stats['errors'], dict(stats['sums']),
+                           {metric: sorted(samples) for metric, samples in stats['samples'].items()})
+                for endpoint, stats in self.endpoints.items()
+            }
+        result = {}
+        for endpoint, (count, errors, sums, samples) in sorted(endpoints.items()):
+            result[endpoint] = {'count': count, 'errors': errors}
+            for metric, ordered in samples.items():
+                summary = {f'p{p}': round(percentile(ordered, p), 3) for p in PERCENTILES}
+                summary.update(max=round(ordered[-1], 3), sum=round(sums[metric], 3))
+                result[endpoint][metric] = summary
+        return {
+            'enabled': getattr(settings, 'PROFILING_ENABLED', False),
+            'window': getattr(settings, 'PROFILING_WINDOW', DEFAULT_PROFILING_WINDOW),
+            'endpoints': result,
+        }
+
+    def reset(self):
+        with self.lock:
+            self.endpoints.clear()
+
+
+profile_store = ProfileStore()
+
+
+class ProfilingMiddleware:
+    """
+    Profiles every request under its URL name (e.g. service-expiring-soon) and logs
+    requests slower than PROFILING_SLOW_MS with their SQL. Place it first in MIDDLEWARE.
+    Content streamed after the view returns (exports) is not included.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        profile = RequestProfile()
+        token = current_profile.set(profile)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            current_profile.reset(token)
+        latency_ms = (time.perf_counter() - started) * 1000
+
+        match = getattr(request, 'resolver_match', None)
+        endpoint = match.view_name if match else 'unresolved'
+        profile_store.record(endpoint, {
+            'latency_ms': latency_ms,
+            'queries': profile.query_count,
+            'db_ms': profile.db_ms,
+            'serializer_ms': profile.serializer_ms,
+        }, response.status_code)
+
+        if latency_ms >= getattr(settings, 'PROFILING_SLOW_MS', DEFAULT_PROFILING_SLOW_MS):
+            logger.warning(
+                'Slow request %s %s (%s) %s: %.1f ms, %d queries in %.1f ms, serializer %.1f ms\n%s',
+                request.method, request.get_full_path(), endpoint, response.status_code, latency_ms,
+                profile.query_count, profile.db_ms, profile.serializer_ms,
+                '\n'.join(f'  {ms:8.2f} ms  {sql}' for sql, ms in profile.queries),
+            )
+        return response
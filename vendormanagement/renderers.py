@@ -0,0 +1,59 @@
+from rest_framework.renderers import BaseRenderer
+
+from .profiling import PERCENTILES
+
+
+# JSON metric name -> (Prometheus name, scale, help)
+PROMETHEUS_METRICS = {
+    'latency_ms': ('vendormanagement_request_duration_seconds', 0.001, 'Request latency'),
+    'queries': ('vendormanagement_request_queries', 1, 'Database queries per request'),
+    'db_ms': ('vendormanagement_request_db_seconds', 0.001, 'Database time per request'),
+    'serializer_ms': ('vendormanagement_request_serializer_seconds', 0.001, 'Serializer time per request'),
+}
+
+
+def label(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class PrometheusRenderer(BaseRenderer):
+    """
+    Renders ProfileStore.snapshot() in the Prometheus text exposition format,
+    one summary per metric labelled by endpoint (?format=prometheus)
+    """
+    media_type = 'text/plain'
+    format = 'prometheus'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if not isinstance(data, dict) or 'endpoints' not in data:
+            # Error responses (e.g. 403)
+            return ''.join(f'# {key}: {value}\n' for key, value in (data or {}).items())
+        endpoints = data['endpoints']
+        lines = [
+            '# HELP vendormanagement_requests_total Requests handled',
+            '# TYPE vendormanagement_requests_total counter',
+        ]
+        lines += [
+            f'vendormanagement_requests_total{{endpoint="{label(endpoint)}"}} {stats["count"]}'
+            for endpoint, stats in endpoints.items()
+        ]
+        lines += [
+            '# HELP vendormanagement_request_errors_total Requests answered with a 5xx status',
+            '# TYPE vendormanagement_request_errors_total counter',
+        ]
+        lines += [
+            f'vendormanagement_request_errors_total{{endpoint="{label(endpoint)}"}} {stats["errors"]}'
+            for endpoint, stats in endpoints.items()
+        ]
+        for metric, (name, scale, help_text) in PROMETHEUS_METRICS.items():
+            lines += [f'# HELP {name} {help_text}', f'# TYPE {name} summary']
+            for endpoint, stats in endpoints.items():
+                summary, endpoint = stats[metric], label(endpoint)
+                lines += [
+                    f'{name}{{endpoint="{endpoint}",quantile="{p / 100}"}} {summary[f"p{p}"] * scale:g}'
+                    for p in PERCENTILES
+                ]
+                lines.append(f'{name}_sum{{endpoint="{endpoint}"}} {summary["sum"] * scale:g}')
+                lines.append(f'{name}_count{{endpoint="{endpoint}"}} {stats["count"]}')
+        return '\n'.join(lines) + '\n'
@@ -1,16 +1,18 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
-from .models import Vendor, Service
+from .models import Vendor, Service, Job
+from .profiling import ProfiledListSerializer, ProfiledSerializerMixin, serializer_timer
 from django.utils import timezone
 
-class ServiceSerializer(serializers.ModelSerializer):
+class ServiceSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
 
     status = serializers.SerializerMethodField()
     vendor_name = serializers.SerializerMethodField()
 
     class Meta:
         model = Service
+        list_serializer_class = ProfiledListSerializer
         fields = [
             'id', 'vendor', 'service_name', 'start_date', 'expiry_date',
             'payment_due_date', 'amount',
@@ -19,22 +21,19 @@ class ServiceSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at', 'status', 'vendor_name']
     
     def get_status(self, obj):
-        if obj.expiry_date < timezone.now().date():
-            return 'Expired'
-        elif (obj.expiry_date - timezone.now().date()).days<=15:
-            return 'Expiring Soon'
-        else:
-            return 'Active'
+        # Materialized snapshot when it is for today, computed otherwise
+        return obj.current_status()
     
     def get_vendor_name(self, obj):
         return obj.vendor.name
 
-class VendorSerializer(serializers.ModelSerializer):
+class VendorSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     services = ServiceSerializer(many=True, read_only=True)
     active_services_count = serializers.SerializerMethodField()
     
     class Meta:
         model = Vendor
+        list_serializer_class = ProfiledListSerializer
         fields = [
             'id', 'name', 'contact_person', 'email', 'phone', 'status',
             'services', 'active_services_count', 'created_at', 'updated_at'
@@ -42,15 +41,20 @@ class VendorSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at', 'active_services_count']
     
     def get_active_services_count(self, obj):
+        # Annotated by VendorViewSet.get_queryset; fall back to a query for plain instances
+        count = getattr(obj, 'active_services_count', None)
+        if count is not None:
+            return count
         return obj.services.filter(expiry_date__gte=timezone.now()).count()
 
 
-class VendorListSerializer(serializers.ModelSerializer):
+class VendorListSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
     """Serializer for listing vendors with only active services"""
     active_services = serializers.SerializerMethodField()
     
     class Meta:
         model = Vendor
+        list_serializer_class = ProfiledListSerializer
         fields = [
             'id', 'name', 'contact_person', 'email', 'phone', 'status',
             'active_services', 'created_at', 'updated_at'
@@ -58,10 +62,99 @@ class VendorListSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
     
     def get_active_services(self, obj):
-        active_services = obj.services.filter(expiry_date__gte=timezone.now())
+        # Prefetched by VendorViewSet.get_queryset; fall back to a query for plain instances
+        active_services = getattr(obj, 'active_service_list', None)
+        if active_services is None:
+            active_services = obj.services.filter(expiry_date__gte=timezone.now())
         return ServiceSerializer(active_services, many=True).data
 
 
+class ServiceRowSerializer:
+    """
+    Read-only fast path for list endpoints: renders ServiceQuerySet.as_rows() dicts
+    into exactly the output of ServiceSerializer, without per-object field machinery
+    """
+    date_field = serializers.DateField()
+    datetime_field = serializers.DateTimeField()
+    amount_field = serializers.DecimalField(max_digits=10, decimal_places=2)
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @property
+    def data(self):
+        with serializer_timer():
+            return [self.to_representation(row) for row in self.rows]
+
+    @classmethod
+    def to_representation(cls, row):
+        date = cls.date_field.to_representation
+        datetime = cls.datetime_field.to_representation
+        return {
+            'id': row['id'],
+            'vendor': row['vendor'],
+            'service_name': row['service_name'],
+            'start_date': date(row['start_date']),
+            'expiry_date': date(row['expiry_date']),
+            'payment_due_date': date(row['payment_due_date']),
+            'amount': cls.amount_field.to_representation(row['amount']),
+            'created_at': datetime(row['created_at']),
+            'updated_at': datetime(row['updated_at']),
+            'status': row['status'],
+            'vendor_name': row['vendor_name'],
+        }
+
+
+VENDOR_ROW_FIELDS = ('id', 'name', 'contact_person', 'email', 'phone', 'status', 'created_at', 'updated_at')
+
+
+class VendorRowSerializer:
+    """
+    Read-only fast path for vendor lists: renders .values() rows of VENDOR_ROW_FIELDS plus
+    their service rows into exactly the output of VendorSerializer (or VendorListSerializer
+    when active_only is set)
+    """
+    datetime_field = serializers.DateTimeField()
+
+    def __init__(self, rows, service_rows, active_only=False, today=None):
+        today = today or timezone.now().date()
+        self.rows = rows
+        self.services_by_vendor = {}
+        # Same condition as the active_services_count annotation of VendorViewSet
+        self.active_counts = {}
+        with serializer_timer():
+            for service in service_rows:
+                vendor = service['vendor']
+                self.services_by_vendor.setdefault(vendor, []).append(ServiceRowSerializer.to_representation(service))
+                self.active_counts[vendor] = self.active_counts.get(vendor, 0) + (service['expiry_date'] >= today)
+        self.active_only = active_only
+
+    @property
+    def data(self):
+        with serializer_timer():
+            return [self.to_representation(row) for row in self.rows]
+
+    def to_representation(self, row):
+        datetime = self.datetime_field.to_representation
+        services = self.services_by_vendor.get(row['id'], [])
+        data = {
+            'id': row['id'],
+            'name': row['name'],
+            'contact_person': row['contact_person'],
+            'email': row['email'],
+            'phone': row['phone'],
+            'status': row['status'],
+        }
+        if self.active_only:
+            data['active_services'] = services
+        else:
+            data['services'] = services
+            data['active_services_count'] = self.active_counts.get(row['id'], 0)
+        data['created_at'] = datetime(row['created_at'])
+        data['updated_at'] = datetime(row['updated_at'])
+        return data
+
+
 class ServiceStatusUpdateSerializer(serializers.ModelSerializer):
     """Serializer for updating service status only"""
     class Meta:
@@ -69,6 +162,50 @@ class ServiceStatusUpdateSerializer(serializers.ModelSerializer):
         fields = ['expiry_date', 'payment_due_date']
 
 
+class ServiceRenewalSerializer(serializers.Serializer):
+    """Validates a bulk renewal: the date shift and the filters selecting the services"""
+    months = serializers.IntegerField(default=0, min_value=-120, max_value=120)
+    days = serializers.IntegerField(default=0, min_value=-3660, max_value=3660)
+    fields = serializers.ListField(
+        child=serializers.ChoiceField(choices=['expiry_date', 'payment_due_date']),
+        default=['expiry_date', 'payment_due_date'],
+        allow_empty=False,
+    )
+    vendor = serializers.PrimaryKeyRelatedField(queryset=Vendor.objects.all(), required=False)
+    expiry_from = serializers.DateField(required=False)
+    expiry_to = serializers.DateField(required=False)
+    amount_min = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    amount_max = serializers.DecimalField(max_digits=10, decimal_places=2, required=False)
+    dry_run = serializers.BooleanField(default=False)
+
+    filter_fields = ['vendor', 'expiry_from', 'expiry_to', 'amount_min', 'amount_max']
+
+    def validate(self, attrs):
+        if not attrs['months'] and not attrs['days']:
+            raise serializers.ValidationError('months or days must be non-zero.')
+        if not any(name in attrs for name in self.filter_fields):
+            raise serializers.ValidationError(f"Give at least one filter: {', '.join(self.filter_fields)}.")
+        if 'expiry_from' in attrs and 'expiry_to' in attrs and attrs['expiry_from'] > attrs['expiry_to']:
+            raise serializers.ValidationError({'expiry_to': 'Must not be before expiry_from.'})
+        if 'amount_min' in attrs and 'amount_max' in attrs and attrs['amount_min'] > attrs['amount_max']:
+            raise serializers.ValidationError({'amount_max': 'Must not be less than amount_min.'})
+        if 'vendor' in attrs:
+            attrs['vendor'] = attrs['vendor'].pk
+        return attrs
+
+
+class JobSerializer(ProfiledSerializerMixin, serializers.ModelSerializer):
+    """Serializer for reporting background job status and progress"""
+    class Meta:
+        model = Job
+        list_serializer_class = ProfiledListSerializer
+        fields = [
+            'id', 'kind', 'params', 'status', 'progress_done', 'progress_total',
+            'result', 'error', 'created_at', 'started_at', 'finished_at'
+        ]
+        read_only_fields = fields
+
+
 class UserRegistrationSerializer(serializers.ModelSerializer):
     """Serializer for user registration"""
     password = serializers.CharField(write_only=True, required=True, validators=[validate_password])
@@ -0,0 +1,81 @@
+"""
+Signal handlers that keep cached aggregates, spend rollups and cached users consistent with writes
+"""
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
+from django.dispatch import receiver
+from rest_framework_simplejwt.settings import api_settings
+
+from .authentication import invalidate_cached_user
+from .models import Vendor, Service
+from .utils.cache_utils import invalidate_aggregates
+from .utils.spend_utils import spend_changed, spend_key
+
+# Service fields the spend rollups are computed from
+SPEND_FIELDS = {'vendor', 'vendor_id', 'payment_due_date', 'amount'}
+
+
+@receiver([post_save, post_delete], sender=Vendor)
+@receiver([post_save, post_delete], sender=Service)
+def invalidate_cached_aggregates(sender, **kwargs):
+    """
+    Any vendor or service change invalidates the dashboard aggregates, once committed:
+    a bump before commit would let a concurrent request cache pre-commit numbers
+    under the new version
+    """
+    transaction.on_commit(invalidate_aggregates)
+
+
+def affects_spend(update_fields):
+    return update_fields is None or not SPEND_FIELDS.isdisjoint(update_fields)
+
+
+@receiver(pre_save, sender=Service)
+def remember_spend_key(sender, instance, raw=False, update_fields=None, **kwargs):
+    """The rollup key of the stored row, which the save may move the service away from"""
+    instance._previous_spend_key = None
+    if raw or instance._state.adding or instance.pk is None or not affects_spend(update_fields):
+        return
+    instance._previous_spend_key = Service.objects.filter(pk=instance.pk).values_list(
+        'vendor_id', 'payment_due_date'
+    ).first()
+
+
+@receiver(post_save, sender=Service)
+def refresh_spend_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not affects_spend(update_fields):
+        return
+    keys = [spend_key(instance)]
+    if getattr(instance, '_previous_spend_key', None) is not None:
+        keys.append(instance._previous_spend_key)
+    spend_changed(keys)
+
+
+@receiver(post_delete, sender=Service)
+def refresh_spend_on_delete(sender, instance, origin=None, **kwargs):
+    # Services deleted with their vendor: the vendor's rollup rows cascade away too
+    if isinstance(origin, Vendor) or getattr(origin, 'model', None) is Vendor:
+        return
+    spend_changed([spend_key(instance)])
+
+
+@receiver([post_save, post_delete], sender=User)
+def invalidate_cached_user_on_write(sender, instance, update_fields=None, **kwargs):
+    """Drop the cached user on save/delete, except for last_login updates (token issue)"""
+    if update_fields is not None and set(update_fields) <= {'last_login'}:
+        return
+    invalidate_cached_user(getattr(instance, api_settings.USER_ID_FIELD))
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+def invalidate_cached_user_on_permissions(sender, instance, action, reverse, pk_set, **kwargs):
+    """Group and permission changes of a user (or of a group's users)"""
+    if not action.startswith('post_'):
+        return
+    if not reverse:
+        invalidate_cached_user(getattr(instance, api_settings.USER_ID_FIELD))
+    elif pk_set:
+        for user_id in User.objects.filter(pk__in=pk_set).values_list(api_settings.USER_ID_FIELD, flat=True):
+            invalidate_cached_user(user_id)
@@ -114,6 +114,19 @@ async function getVendors(page = 1, pageSize = 20) {
     throw new Error('Failed to fetch vendors');
 }
 
+async function getVendorChoices(search = '', limit = 1000) {
+    const params = new URLSearchParams({ limit });
+    if (search) {
+        params.set('search', search);
+    }
+    // The browser revalidates with the ETag and reuses its cached copy on 304
+    const response = await apiRequest(`/vendors/choices/?${params}`);
+    if (response.ok) {
+        return await response.json();
+    }
+    throw new Error('Failed to fetch vendor choices');
+}
+
 async function getActiveServices() {
     const response = await apiRequest('/services/active_services/');
     if (response.ok) {
@@ -230,6 +243,14 @@ async function getPaymentDueSoon() {
     throw new Error('Failed to fetch payment due services');
 }
 
+async function getDashboardSummary(days = 15, topN = 5) {
+    const response = await apiRequest(`/dashboard/summary/?days=${days}&top_n=${topN}`);
+    if (response.ok) {
+        return await response.json();
+    }
+    throw new Error('Failed to fetch dashboard summary');
+}
+
 async function checkRemindersAPI(days = 15) {
     const response = await apiRequest('/services/check_reminders/', {
         method: 'POST',
@@ -241,6 +262,14 @@ async function checkRemindersAPI(days = 15) {
     throw new Error('Failed to check reminders');
 }
 
+async function getJob(id) {
+    const response = await apiRequest(`/jobs/${id}/`);
+    if (response.ok) {
+        return await response.json();
+    }
+    throw new Error('Failed to fetch job');
+}
+
 // Check if user is authenticated
 function isAuthenticated() {
     // Try to get token from localStorage if not already loaded
@@ -62,19 +62,17 @@ function updateNavActive(activeText) {
 // Dashboard
 async function loadDashboard() {
     try {
-        const vendors = await getVendors(1, 5);
-        const expiring = await getExpiringSoon();
-        const paymentDue = await getPaymentDueSoon();
-        const activeServices = await getActiveServices();
-        const expiredServices = await getExpiredServices();
+        // One round-trip for every count and list on the dashboard
+        const summary = await getDashboardSummary(15, 5);
+        const counts = summary.counts;
         
-        document.getElementById('totalVendors').textContent = vendors.count || 0;
-        document.getElementById('activeServices').textContent = activeServices.count || 0;
-        document.getElementById('expiringSoon').textContent = expiring.count || 0;
-        document.getElementById('paymentDue').textContent = paymentDue.count || 0;
-        document.getElementById('expiredServices').textContent = expiredServices.count || 0;
+        document.getElementById('totalVendors').textContent = counts.total_vendors || 0;
+        document.getElementById('activeServices').textContent = counts.active_services || 0;
+        document.getElementById('expiringSoon').textContent = counts.expiring_soon || 0;
+        document.getElementById('paymentDue').textContent = counts.payment_due_soon || 0;
+        document.getElementById('expiredServices').textContent = counts.expired_services || 0;
         
-        displayRecentVendors(vendors.results);
+        displayRecentVendors(summary.recent_vendors);
     } catch (error) {
         console.error('Dashboard load error:', error);
     }
@@ -276,7 +274,7 @@ function changeServicePageSize() {
 
 async function loadVendorOptions() {
     try {
-        const vendors = await getVendors(1, 1000);
+        const vendors = await getVendorChoices();
         const select = document.getElementById('serviceVendor');
         select.innerHTML = '<option value="">Select Vendor</option>';
         vendors.results.forEach(v => {
@@ -471,14 +469,39 @@ function filterServices() {
 async function checkReminders() {
     if (confirm('Check and send reminder emails for services expiring or with payment due?')) {
         try {
-            const result = await checkRemindersAPI(15);
-            alert(`Reminder check completed!\n\nTotal flagged: ${result.summary.total_services_flagged}\nEmails sent: ${result.summary.emails_sent}\nEmails failed: ${result.summary.emails_failed}`);
+            const queued = await checkRemindersAPI(15);
+            const job = await waitForJob(queued.job_id);
+            if (job.status !== 'succeeded' && job.status !== 'failed') {
+                alert(`Reminder check is still ${job.status} (job #${job.id}).\n\nIs the run_jobs worker running? The emails will be sent once it picks the job up.`);
+                return;
+            }
+            if (job.status === 'failed') {
+                alert('Reminder check failed');
+                return;
+            }
+            alert(`Reminder check completed!\n\nTotal flagged: ${job.result.total_services_flagged}\nEmails sent: ${job.result.emails_sent}\nEmails failed: ${job.result.emails_failed}\nAlready sent (skipped): ${job.result.reminders_skipped}`);
         } catch (error) {
             alert('Failed to check reminders');
         }
     }
 }
 
+// Poll a background job until the worker has finished it, for at most maxAttempts polls;
+// returns the last state seen (still queued or running when the wait ran out)
+async function waitForJob(jobId, intervalMs = 2000, maxAttempts = 30) {
+    let job;
+    for (let attempt = 0; attempt < maxAttempts; attempt++) {
+        if (attempt > 0) {
+            await new Promise(resolve => setTimeout(resolve, intervalMs));
+        }
+        job = await getJob(jobId);
+        if (job.status === 'succeeded' || job.status === 'failed') {
+            return job;
+        }
+    }
+    return job;
+}
+
 // Modal
 function closeModal(modalId) {
     document.getElementById(modalId).style.display = 'none';
@@ -0,0 +1,1226 @@
+import csv
+import gzip
+import io
+import json
+import os
+import tempfile
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest import mock
+from urllib.parse import parse_qs, urlsplit
+
+from django.contrib.auth.models import User, update_last_login
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.mail.backends.locmem import EmailBackend as LocmemEmailBackend
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.test import RequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.serializers import BaseSerializer
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .pagination import KeysetPagination
+from .models import Vendor, Service, ReminderLog, Job, VendorMonthlySpend
+from .utils.import_utils import import_services, import_vendors
+from .utils.reminder_utils import check_and_send_reminders
+from .utils.job_utils import work
+from .utils.cache_utils import cache_stats, get_aggregate_version
+from .utils.renewal_utils import renew_services
+from .utils.spend_utils import rebuild_spend_rollups
+from .utils.forecast_utils import get_service_forecast
+from .profiling import profile_store
+from .authentication import CachedJWTAuthentication, user_cache_key
+
+
+def create_vendors_with_services(vendor_count, active_per_vendor=2, expired_per_vendor=1):
+    """Create vendors, each with active and expired services"""
+    today = timezone.now().date()
+    vendors = Vendor.objects.bulk_create([
+        Vendor(name=f'vendor{i}', contact_person=f'contact{i}', email=f'vendor{i}@example.com', phone='12345')
+        for i in range(vendor_count)
+    ])
+    services = []
+    for vendor in vendors:
+        for i in range(active_per_vendor + expired_per_vendor):
+            expiry = today + timedelta(days=30) if i < active_per_vendor else today - timedelta(days=30)
+            services.append(Service(
+                vendor=vendor, service_name=f'{vendor.name}-service{i}', start_date=today - timedelta(days=365),
+                expiry_date=expiry, payment_due_date=expiry, amount=Decimal('100.00'),
+            ))
+    Service.objects.bulk_create(services)
+    return vendors
+
+
+def csv_file(rows):
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(rows)
+    buffer.seek(0)
+    return buffer
+
+
+SERVICE_CSV_HEADER = ['vendor', 'service_name', 'start_date', 'expiry_date', 'payment_due_date', 'amount']
+
+
+class CsvImportTests(APITestCase):
+    """Batched CSV imports upsert vendors and services and report row errors"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='password')
+        cls.vendor = Vendor.objects.create(
+            name='Acme', contact_person='Old Contact', email='old@acme.com', phone='1', status='Active'
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_vendors_are_upserted_on_name(self):
+        result = import_vendors(csv_file([
+            ['name', 'contact_person', 'email', 'phone', 'status'],
+            ['Acme', 'New Contact', 'new@acme.com', '2', 'Inactive'],
+            ['Globex', 'Hank', 'hank@globex.com', '3', 'Active'],
+            ['Globex', 'Hank Scorpio', 'hank@globex.com', '3', 'Active'],
+        ]), batch_size=10)
+        self.assertEqual((result['rows_processed'], result['rows_written'], result['rows_failed']), (3, 2, 0))
+        self.assertEqual(Vendor.objects.count(), 2)
+        self.vendor.refresh_from_db()
+        self.assertEqual((self.vendor.contact_person, self.vendor.status), ('New Contact', 'Inactive'))
+        # The last row of a name wins
+        self.assertEqual(Vendor.objects.get(name='Globex').contact_person, 'Hank Scorpio')
+
+    def test_services_are_inserted_in_batches_with_row_errors(self):
+        rows = [SERVICE_CSV_HEADER] + [
+            ['Acme', f'service{i}', '2025-01-01', '2026-01-01', '2025-06-01', '100.50'] for i in range(5)
+        ] + [
+            ['Nobody', 'orphan', '2025-01-01', '2026-01-01', '2025-06-01', '1'],
+            ['Acme', 'broken', 'soon', '2026-01-01', '2025-06-01', 'abc'],
+        ]
+        with CaptureQueriesContext(connection) as queries:
+            result = import_services(csv_file(rows), batch_size=2)
+        inserts = [q for q in queries if q['sql'].startswith('INSERT INTO "vendormanagement_service"')]
+        self.assertEqual(len(inserts), 3)
+        self.assertEqual((result['rows_processed'], result['rows_written'], result['rows_failed']), (7, 5, 2))
+        self.assertEqual(result['errors'][0], {'line': 7, 'errors': {'vendor': ["Vendor 'Nobody' does not exist."]}})
+        self.assertEqual(result['errors'][1]['line'], 8)
+        self.assertEqual(set(result['errors'][1]['errors']), {'start_date', 'amount'})
+        services = Service.objects.filter(vendor=self.vendor)
+        self.assertEqual(services.count(), 5)
+        self.assertTrue(all(s.amount == Decimal('100.50') and s.status_snapshot for s in services))
+
+    def test_vendor_names_are_mapped_to_ids(self):
+        other = Vendor.objects.create(name='Initech', contact_person='Bill', email='bill@initech.com', phone='4')
+        result = import_services(csv_file([
+            SERVICE_CSV_HEADER,
+            [' Initech ', 'tps', '2025-01-01', '2026-01-01', '2025-06-01', '5'],
+        ]))
+        self.assertEqual(result['rows_written'], 1)
+        self.assertEqual(Service.objects.get(service_name='tps').vendor, other)
+
+    def test_reimported_services_are_updated_not_duplicated(self):
+        rows = [SERVICE_CSV_HEADER, ['Acme', 'hosting', '2025-01-01', '2026-01-01', '2025-06-01', '10']]
+        import_services(csv_file(rows))
+        rows[1][4:] = ['2025-07-01', '12']
+        result = import_services(csv_file(rows))
+        self.assertEqual(result['rows_written'], 1)
+        service = Service.objects.get(vendor=self.vendor)
+        self.assertEqual((service.payment_due_date, service.amount), (date(2025, 7, 1), Decimal('12')))
+        # The rollup moves with the payment month
+        self.assertEqual(
+            list(VendorMonthlySpend.objects.values_list('month', 'total_amount')), [(date(2025, 7, 1), Decimal('12'))]
+        )
+
+    def test_undecodable_upload_is_rejected(self):
+        upload = SimpleUploadedFile('services.csv', (
+            ','.join(SERVICE_CSV_HEADER) + '\nAcme,caf\xe9,2025-01-01,2026-01-01,2025-06-01,1\n'
+        ).encode('latin-1'))
+        response = self.client.post('/api/services/import_csv/', {'file': upload})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('not UTF-8', response.data['error'])
+
+        upload = SimpleUploadedFile('vendors.csv', b'name,contact_person\nAcme,' + b'x' * (csv.field_size_limit() + 1))
+        response = self.client.post('/api/vendors/import_csv/', {'file': upload})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('field larger than field limit', response.data['error'])
+
+    def test_upload_endpoints(self):
+        upload = SimpleUploadedFile('services.csv', (
+            ','.join(SERVICE_CSV_HEADER) + '\nAcme,hosting,2025-01-01,2026-01-01,2025-06-01,9.99\n'
+        ).encode('utf-8-sig'))
+        response = self.client.post('/api/services/import_csv/', {'file': upload, 'batch_size': 1})
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(response.data['summary']['rows_written'], 1)
+        self.assertTrue(Service.objects.filter(service_name='hosting', vendor=self.vendor).exists())
+
+        upload = SimpleUploadedFile('vendors.csv', b'name,contact_person,email,phone,status\nAcme,C,c@acme.com,5,Active\n')
+        response = self.client.post('/api/vendors/import_csv/', {'file': upload})
+        self.assertEqual(response.data['summary']['rows_written'], 1)
+        self.assertEqual(self.client.post('/api/vendors/import_csv/', {}).status_code, 400)
+        upload = SimpleUploadedFile('vendors.csv', b'name\n')
+        self.assertEqual(self.client.post('/api/vendors/import_csv/', {'file': upload, 'batch_size': 0}).status_code, 400)
+
+    def test_import_command(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'vendors.csv')
+            with open(path, 'w', newline='') as f:
+                f.write('name,contact_person,email,phone,status\nUmbrella,Al,al@umbrella.com,6,Active\n')
+            out = io.StringIO()
+            call_command('import_csv', vendors=path, stdout=out)
+        self.assertIn('Rows written: 1', out.getvalue())
+        self.assertTrue(Vendor.objects.filter(name='Umbrella').exists())
+
+
+class VendorListQueryCountTests(APITestCase):
+    """Serializing a page of vendors must not issue queries per vendor"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='password')
+        create_vendors_with_services(100)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_vendor_list_query_count_is_constant(self):
+        # Validators of both tables, COUNT for pagination, the vendor page and the services prefetch
+        with self.assertNumQueries(4):
+            response = self.client.get('/api/vendors/', {'page_size': 100})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 100)
+        for vendor in response.data['results']:
+            self.assertEqual(vendor['active_services_count'], 2)
+            self.assertEqual(len(vendor['services']), 3)
+
+    def test_list_with_active_services_query_count_is_constant(self):
+        # COUNT for pagination, the vendor page and the active services prefetch
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/vendors/list_with_active_services/', {'page_size': 100})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 100)
+        for vendor in response.data['results']:
+            self.assertEqual(len(vendor['active_services']), 2)
+            self.assertTrue(all(s['vendor_name'] == vendor['name'] for s in vendor['active_services']))
+
+
+BOUNDARY_OFFSETS = (-16, -1, 0, 1, 14, 15, 16, 100)
+
+
+def create_boundary_services(today):
+    """One service per (expiry, payment due) pair of offsets around the 15-day window edges"""
+    vendor = Vendor.objects.create(name='boundary', contact_person='c', email='b@example.com', phone='1')
+    Service.objects.bulk_create([
+        Service(
+            vendor=vendor, service_name=f'e{expiry}p{payment}', start_date=today - timedelta(days=365),
+            expiry_date=today + timedelta(days=expiry), payment_due_date=today + timedelta(days=payment),
+            amount=Decimal('1.00'),
+        )
+        for expiry in BOUNDARY_OFFSETS for payment in BOUNDARY_OFFSETS
+    ])
+
+
+class DateWindowTests(TestCase):
+    """The indexed date window filters and the database status classification match the model methods"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = date(2025, 3, 10)
+        create_boundary_services(cls.today)
+
+    def ids(self, queryset):
+        return set(queryset.values_list('id', flat=True))
+
+    def test_windows_match_model_methods(self):
+        services = list(Service.objects.all())
+        today = self.today
+        self.assertEqual(
+            self.ids(Service.objects.expiring_soon(today=today)),
+            {s.id for s in services if s.is_expiring_soon(today=today)},
+        )
+        self.assertEqual(
+            self.ids(Service.objects.payment_due_soon(days=1, today=today)),
+            {s.id for s in services if s.is_payment_due_soon(days=1, today=today)},
+        )
+        self.assertEqual(self.ids(Service.objects.active(today=today)), {s.id for s in services if s.expiry_date >= today})
+        self.assertEqual(self.ids(Service.objects.expired(today=today)), {s.id for s in services if s.expiry_date < today})
+
+    def test_status_and_color_match_model_methods(self):
+        rows = Service.objects.with_status(today=self.today).with_status_color(today=self.today)
+        for service in rows:
+            with self.subTest(service=service.service_name):
+                self.assertEqual(service.status, service.get_status(today=self.today))
+                self.assertEqual(service.status_color, service.get_status_color(today=self.today))
+
+
+    def test_status_color_counts_in_one_query(self):
+        services = list(Service.objects.all())
+        expected = {color: 0 for color in ('red', 'orange', 'yellow', 'green', 'gray')}
+        for service in services:
+            expected[service.get_status_color(today=self.today)] += 1
+        with self.assertNumQueries(1):
+            counts = Service.objects.status_color_counts(today=self.today, use_snapshot=False)
+        self.assertEqual(counts, expected)
+        for color, count in counts.items():
+            self.assertEqual(Service.objects.status_color(color, today=self.today, use_snapshot=False).count(), count)
+
+
+class KeysetPaginationTests(APITestCase):
+    """Cursor pages traverse the ordering in both directions without gaps or repeats"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='password')
+        create_vendors_with_services(4)
+        # Many ties on amount
+        for i, service in enumerate(Service.objects.order_by('id')):
+            Service.objects.filter(pk=service.pk).update(amount=Decimal(100 * (i % 3)))
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def traverse(self, url, params, direction):
+        pages = []
+        response = self.client.get(url, params)
+        while url:
+            self.assertEqual(response.status_code, 200, response.content)
+            pages.append([row['id'] for row in response.data['results']])
+            url = response.data[direction]
+            if url:
+                response = self.client.get(url)
+        return pages
+
+    def test_forward_and_backward_traversal(self):
+        for url, params, ordering in [
+            ('/api/services/', {}, ('expiry_date', 'id')),
+            ('/api/services/', {'ordering': '-amount'}, ('-amount', '-id')),
+            ('/api/vendors/', {}, ('name', 'id')),
+        ]:
+            with self.subTest(url=url, params=params):
+                model = Service if url == '/api/services/' else Vendor
+                expected = list(model.objects.order_by(*ordering).values_list('id', flat=True))
+                forward = self.traverse(url, {'pagination': 'cursor', 'page_size': 5, **params}, 'next')
+                self.assertEqual(sum(forward, []), expected)
+                self.assertTrue(all(len(page) == 5 for page in forward[:-1]))
+
+                # Walk back from the last page
+                response = self.client.get(url, {'pagination': 'cursor', 'page_size': 5, **params})
+                while response.data['next']:
+                    response = self.client.get(response.data['next'])
+                backward = self.traverse(response.data['previous'], {}, 'previous') if response.data['previous'] else []
+                self.assertEqual(sum(reversed(backward), []) + [row['id'] for row in response.data['results']], expected)
+
+    def test_count_modes(self):
+        params = {'pagination': 'cursor', 'page_size': 5}
+        response = self.client.get('/api/services/', params)
+        self.assertNotIn('count', response.data)
+        response = self.client.get('/api/services/', {**params, 'count': 'exact'})
+        self.assertEqual((response.data['count'], response.data['count_is_estimate']), (12, False))
+        response = self.client.get('/api/services/', {**params, 'count': 'estimate'})
+        self.assertEqual((response.data['count'], response.data['count_is_estimate']), (12, False))
+        with mock.patch.object(KeysetPagination, 'count_estimate_cap', 10):
+            response = self.client.get('/api/services/', {**params, 'count': 'estimate'})
+        self.assertEqual((response.data['count'], response.data['count_is_estimate']), (10, True))
+
+    def test_invalid_cursor_is_not_found(self):
+        for cursor in ['garbage', 'eyJwIjogWzFdfQ==', 'eyJwIjogWzFdLCAiciI6IGZhbHNlfQ==']:
+            with self.subTest(cursor=cursor):
+                self.assertEqual(self.client.get('/api/services/', {'cursor': cursor}).status_code, 404)
+
+
+    def test_cursor_is_bound_to_its_ordering(self):
+        params = {'pagination': 'cursor', 'page_size': 5}
+        next_url = self.client.get('/api/services/', {**params, 'ordering': '-amount'}).data['next']
+        cursor = parse_qs(urlsplit(next_url).query)['cursor'][0]
+        self.assertEqual(self.client.get('/api/services/', {'cursor': cursor, 'ordering': '-amount'}).status_code, 200)
+        self.assertEqual(self.client.get('/api/services/', {'cursor': cursor, 'ordering': 'amount'}).status_code, 404)
+        self.assertEqual(self.client.get('/api/services/', {'cursor': cursor}).status_code, 404)
+
+    def test_unsupported_ordering_is_rejected(self):
+        request = Request(RequestFactory().get('/api/services/', {'pagination': 'cursor'}))
+        for ordering in ['vendor__name', '?']:
+            with self.subTest(ordering=ordering), self.assertRaises(ValidationError):
+                KeysetPagination().paginate_queryset(Service.objects.order_by(ordering), request)
+
+class FastListSerializationTests(APITestCase):
+    """The .values() fast path renders exactly the same JSON as the model serializers"""
+
+    urls = [
+        '/api/services/',
+        '/api/services/?pagination=cursor',
+        '/api/services/expiring_soon/',
+        '/api/services/payment_due_soon/',
+        '/api/services/active_services/',
+        '/api/services/expired_services/',
+        '/api/services/services_by_color/?color=orange',
+        '/api/vendors/',
+        '/api/vendors/?pagination=cursor',
+        '/api/vendors/list_with_active_services/',
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='password')
+        today = timezone.now().date()
+        vendors = create_vendors_with_services(5)
+        # Expiry dates on both sides of the Expired / Expiring Soon / Active boundaries
+        for i, offset in enumerate([-1, 0, 1, 15, 16, 100]):
+            expiry = today + timedelta(days=offset)
+            Service.objects.create(
+                vendor=vendors[i % len(vendors)], service_name=f'boundary{i}', start_date=today,
+                expiry_date=expiry, payment_due_date=expiry, amount=Decimal('1234.5'),
+            )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_fast_path_output_is_byte_identical(self):
+        for url in self.urls:
+            with self.subTest(url=url):
+                fast = self.client.get(url, {'page_size': 100})
+                with override_settings(FAST_LIST_SERIALIZATION=False):
+                    slow = self.client.get(url, {'page_size': 100})
+                self.assertEqual(fast.status_code, 200)
+                self.assertEqual(fast.content, slow.content)
+
+    def test_status_is_computed_by_the_database(self):
+        response = self.client.get('/api/services/', {'page_size': 100})
+        statuses = {row['service_name']: row['status'] for row in response.data['results']}
+        self.assertEqual(
+            [statuses[f'boundary{i}'] for i in range(6)],
+            ['Expired', 'Expiring Soon', 'Expiring Soon', 'Expiring Soon', 'Active', 'Active']
+        )
+
+
+class ExportTests(APITestCase):
+    """Exports stream every row in the list endpoint format"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='password')
+        create_vendors_with_services(4)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def read(self, response):
+        self.assertEqual(response.status_code, 200)
+        content = b''.join(response.streaming_content)
+        if response.get('Content-Encoding') == 'gzip':
+            content = gzip.decompress(content)
+        return content.decode()
+
+    def test_ndjson_export_matches_list_endpoint(self):
+        exported = [json.loads(line) for line in self.read(self.client.get('/api/services/export/')).splitlines()]
+        listed = self.client.get('/api/services/', {'page_size': 100}).json()['results']
+        self.assertEqual(sorted(exported, key=lambda row: row['id']), sorted(listed, key=lambda row: row['id']))
+
+    def test_csv_export_with_window(self):
+        response = self.client.get('/api/services/export/', {'export_format': 'csv', 'window': 'expired'})
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        rows = list(csv.DictReader(self.read(response).splitlines()))
+        self.assertEqual(len(rows), 4)
+        self.assertTrue(all(row['status'] == 'Expired' for row in rows))
+
+    def test_vendor_export_is_gzipped_when_accepted(self):
+        response = self.client.get('/api/vendors/export/', HTTP_ACCEPT_ENCODING='gzip, deflate')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        vendors = [json.loads(line) for line in self.read(response).splitlines()]
+        self.assertEqual(len(vendors), 4)
+        self.assertTrue(all(vendor['active_services_count'] == 2 for vendor in vendors))
+
+    def test_invalid_parameters_are_rejected(self):
+        self.assertEqual(self.client.get('/api/services/export/', {'export_format': 'xml'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/services/export/', {'window': 'soon'}).status_code, 400)
+        for url in ['/api/services/export/', '/api/vendors/export/']:
+            response = self.client.get(url, {'export_format': 'csv', 'window': 'expiring_soon', 'days': 99999999})
+            self.assertEqual(response.status_code, 400)
+
+
+class ServiceBulkTests(APITestCase):
+    """Bulk writes validate every item and apply the valid ones in one transaction"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='password')
+        cls.vendors = create_vendors_with_services(2, active_per_vendor=1, expired_per_vendor=1)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+        self.services = list(Service.objects.order_by('id'))
+
+    def new_service(self, **fields):
+        item = {
+            'vendor': self.vendors[0].id, 'service_name': 'bulk', 'start_date': '2025-01-01',
+            'expiry_date': '2026-01-01', 'payment_due_date': '2025-12-01', 'amount': '10.50',
+        }
+        item.update(fields)
+        return item
+
+    def test_mixed_operations_with_per_item_results(self):
+        items = [
+            self.new_service(),
+            {'id': self.services[0].id, 'amount': '99.99', 'vendor': self.vendors[1].id},
+            {'op': 'delete', 'id': self.services[1].id},
+            self.new_service(vendor=999999),
+            {'id': self.services[2].id, 'expiry_date': 'not a date'},
+        ]
+        # Vendors and services lookups, then in one savepoint: insert, update, the cascading delete
+        # and one spend rollup refresh (aggregate, upsert, delete) in a nested savepoint
+        with self.assertNumQueries(14):
+            response = self.client.post('/api/services/bulk/', items, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [r['status'] for r in response.data['results']],
+            ['created', 'updated', 'deleted', 'error', 'error']
+        )
+        self.assertIn('vendor', response.data['results'][3]['errors'])
+        self.assertIn('expiry_date', response.data['results'][4]['errors'])
+
+        updated = Service.objects.get(pk=self.services[0].id)
+        self.assertEqual((updated.amount, updated.vendor_id), (Decimal('99.99'), self.vendors[1].id))
+        self.assertFalse(Service.objects.filter(pk=self.services[1].id).exists())
+        self.assertTrue(Service.objects.filter(pk=response.data['results'][0]['id'], service_name='bulk').exists())
+
+    def test_atomic_mode_writes_nothing_on_error(self):
+        items = [self.new_service(), self.new_service(amount='abc')]
+        response = self.client.post('/api/services/bulk/?atomic=true', items, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual([r['status'] for r in response.data['results']], ['skipped', 'error'])
+        self.assertEqual(Service.objects.count(), len(self.services))
+
+    def test_ndjson_body(self):
+        body = '\n'.join(json.dumps(self.new_service(service_name=f'line{i}')) for i in range(3))
+        response = self.client.post('/api/services/bulk/', body, content_type='application/x-ndjson')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['created'], 3)
+
+
+class ServiceRenewalTests(APITestCase):
+    """Renewals shift matching service dates with one UPDATE"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='password')
+        vendor = Vendor.objects.create(name='v', contact_person='c', email='v@example.com', phone='1')
+        for expiry, amount in [('2025-01-31', '100.00'), ('2025-02-15', '500.00'), ('2025-06-30', '100.00')]:
+            Service.objects.create(
+                vendor=vendor, service_name=expiry, start_date='2024-01-01',
+                expiry_date=expiry, payment_due_date=expiry, amount=amount,
+            )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def renew(self, **data):
+        return self.client.post('/api/services/renew/', data, format='json')
+
+    def expiry_dates(self):
+        return [str(d) for d in Service.objects.order_by('service_name').values_list('expiry_date', flat=True)]
+
+    def test_dry_run_reports_counts_without_updating(self):
+        with self.assertNumQueries(1):
+            response = self.renew(months=1, expiry_to='2025-03-01', dry_run=True)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data['matched'], response.data['updated']), (2, 0))
+        self.assertEqual(response.data['total_amount'], '600.00')
+        self.assertEqual(str(response.data['new_expiry_from']), '2025-02-28')
+        self.assertEqual(self.expiry_dates(), ['2025-01-31', '2025-02-15', '2025-06-30'])
+
+    def test_renewal_shifts_matching_services_clamping_month_ends(self):
+        response = self.renew(months=1, expiry_to='2025-03-01', amount_max='200')
+        self.assertEqual(response.data['updated'], 1)
+        self.assertEqual(self.expiry_dates(), ['2025-02-28', '2025-02-15', '2025-06-30'])
+        self.assertEqual(str(Service.objects.get(service_name='2025-01-31').payment_due_date), '2025-02-28')
+
+    def test_invalid_renewals_are_rejected(self):
+        self.assertEqual(self.renew(expiry_to='2025-03-01').status_code, 400)
+        self.assertEqual(self.renew(months=12).status_code, 400)
+        self.assertEqual(self.renew(months=1, vendor=999999).status_code, 400)
+
+
+class StatusSnapshotTests(APITestCase):
+    """The materialized status is kept current on save and used only when it is for today"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='password')
+        create_vendors_with_services(3)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_save_refreshes_the_snapshot(self):
+        service = Service.objects.first()
+        service.expiry_date = timezone.now().date() - timedelta(days=1)
+        service.save(update_fields=['expiry_date'])
+        service.refresh_from_db()
+        self.assertEqual((service.status_snapshot, service.color_snapshot), ('Expired', 'red'))
+        self.assertEqual(service.snapshot_date, timezone.now().date())
+
+    def test_color_groupings_use_the_snapshot_only_when_current(self):
+        # bulk_create left the snapshot unset, so the computed colors are used
+        self.assertFalse(Service.objects.snapshot_is_current())
+        computed = Service.objects.status_color_counts()
+        self.assertEqual((computed['gray'], computed['red']), (6, 3))
+
+        call_command('refresh_service_status', stdout=io.StringIO())
+        self.assertTrue(Service.objects.snapshot_is_current())
+        self.assertEqual(Service.objects.status_color_counts(), computed)
+
+        # A stale snapshot (e.g. the daily refresh has not run yet) is ignored
+        Service.objects.update(color_snapshot='orange', snapshot_date=timezone.now().date() - timedelta(days=1))
+        self.assertEqual(Service.objects.status_color_counts(), computed)
+        response = self.client.get('/api/services/services_by_color/', {'color': 'red'})
+        self.assertEqual(response.data['count'], 3)
+
+
+class ConditionalGetTests(APITestCase):
+    """List and detail responses carry validators and answer matching requests with 304"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='password')
+        cls.vendors = create_vendors_with_services(2)
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_unchanged_resources_answer_304_without_serializing(self):
+        service = Service.objects.filter(vendor=self.vendors[0]).first()
+        for url in ('/api/vendors/', '/api/services/', f'/api/vendors/{self.vendors[0].id}/', f'/api/services/{service.id}/'):
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertIn('Last-Modified', response)
+            # Only the validator query (MAX/COUNT of both tables) runs
+            with self.assertNumQueries(1):
+                response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.content, b'')
+
+    def test_changes_invalidate_the_etag(self):
+        service = Service.objects.filter(vendor=self.vendors[0]).first()
+        etags = {url: self.client.get(url)['ETag'] for url in (
+            '/api/vendors/', f'/api/vendors/{self.vendors[0].id}/', f'/api/vendors/{self.vendors[1].id}/'
+        )}
+        service.amount = Decimal('5.00')
+        service.save()
+        self.assertEqual(self.client.get('/api/vendors/', HTTP_IF_NONE_MATCH=etags['/api/vendors/']).status_code, 200)
+        url = f'/api/vendors/{self.vendors[0].id}/'
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etags[url]).status_code, 200)
+        # Another vendor's detail is unaffected
+        url = f'/api/vendors/{self.vendors[1].id}/'
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etags[url]).status_code, 304)
+        self.assertEqual(self.client.get('/api/vendors/abc/').status_code, 404)
+
+    def test_deleting_an_older_row_invalidates_the_etag(self):
+        etag = self.client.get('/api/services/')['ETag']
+        # Not the latest updated_at: only the row count changes
+        Service.objects.order_by('updated_at', 'id').first().delete()
+        self.assertEqual(self.client.get('/api/services/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class ListFilterTests(APITestCase):
+    """Query-param filters, prefix search and whitelisted ordering on the list endpoints"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='password')
+        cls.vendors = create_vendors_with_services(3)
+        Vendor.objects.filter(pk=cls.vendors[2].pk).update(status='Inactive')
+        Service.objects.filter(vendor=cls.vendors[0]).update(amount=Decimal('250.00'))
+        Service.objects.filter(pk=Service.objects.first().pk).update(service_name='Cloud Hosting')
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def ids(self, url, **params):
+        response = self.client.get(url, {'page_size': 100, **params})
+        self.assertEqual(response.status_code, 200, response.content)
+        return [row['id'] for row in response.data['results']]
+
+    def test_service_filters(self):
+        vendor_ids = f'{self.vendors[0].id},{self.vendors[1].id}'
+        self.assertEqual(len(self.ids('/api/services/', vendor=vendor_ids)), 6)
+        self.assertEqual(len(self.ids('/api/services/', vendor=vendor_ids, amount_min='200')), 3)
+        self.assertEqual(len(self.ids('/api/services/', vendor_status='Inactive')), 3)
+        self.assertEqual(len(self.ids('/api/services/', status='Expired')), 3)
+        today = timezone.now().date()
+        self.assertEqual(len(self.ids('/api/services/', expiry_from=today, expiry_to=today + timedelta(days=60))), 6)
+        self.assertEqual(len(self.ids('/api/services/active_services/', vendor=self.vendors[0].id)), 2)
+
+    def test_prefix_search_is_case_insensitive(self):
+        self.assertEqual(len(self.ids('/api/services/', search='cloud h')), 1)
+        self.assertEqual(self.ids('/api/services/', search='loud'), [])
+        self.assertEqual(self.ids('/api/vendors/', search='VENDOR1'), [self.vendors[1].id])
+
+    def test_ordering_is_whitelisted_and_stable(self):
+        ordered = Service.objects.order_by('-amount', '-id').values_list('id', flat=True)
+        self.assertEqual(self.ids('/api/services/', ordering='-amount'), list(ordered))
+        # Fields without an index are ignored
+        self.assertEqual(self.ids('/api/services/', ordering='start_date'), self.ids('/api/services/'))
+
+    def test_invalid_filter_values_are_rejected(self):
+        response = self.client.get('/api/services/', {'expiry_from': 'yesterday', 'status': 'Late'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(set(response.data), {'expiry_from', 'status'})
+        for params in [{'amount_min': 'NaN'}, {'amount_max': 'Infinity'}, {'vendor': '0'},
+                       {'vendor': f'1,{2 ** 63}'}]:
+            with self.subTest(params=params):
+                response = self.client.get('/api/services/', params)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(set(response.data), set(params))
+
+    def test_vendor_choices_are_compact_and_revalidated(self):
+        response = self.client.get('/api/vendors/choices/', {'search': 'vendor', 'limit': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, {
+            'results': [{'id': v.id, 'name': v.name} for v in self.vendors[:2]], 'more': True
+        })
+        # An unchanged vendor table answers 304 without running the list query
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                '/api/vendors/choices/', {'search': 'vendor', 'limit': 2}, HTTP_IF_NONE_MATCH=response['ETag']
+            )
+        self.assertEqual(response.status_code, 304)
+        etag = response['ETag']
+        self.vendors[0].delete()
+        response = self.client.get('/api/vendors/choices/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 2)
+
+
+@override_settings(PROFILING_ENABLED=True, PROFILING_SLOW_MS=10000)
+class ProfilingTests(APITestCase):
+    """The profiling middleware records per-endpoint stats served at /api/_metrics/"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser('admin', password='password')
+        cls.user = User.objects.create_user('tester', password='password')
+        create_vendors_with_services(3)
+
+    def setUp(self):
+        profile_store.reset()
+        self.client.force_authenticate(self.admin)
+
+    def test_endpoint_stats_in_json_and_prometheus_format(self):
+        self.client.get('/api/services/expiring_soon/')
+        self.client.get('/api/services/expiring_soon/')
+        self.client.get(f'/api/vendors/{Vendor.objects.first().id}/')
+        stats = self.client.get('/api/_metrics/').json()['endpoints']
+        self.assertEqual(stats['service-expiring-soon']['count'], 2)
+        self.assertGreater(stats['service-expiring-soon']['queries']['p50'], 0)
+        self.assertGreater(stats['vendor-detail']['serializer_ms']['max'], 0)
+        # Serializers outside the app are left alone
+        self.assertEqual(BaseSerializer.data.fget.__module__, 'rest_framework.serializers')
+
+        response = self.client.get('/api/_metrics/', {'format': 'prometheus'})
+        self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+        self.assertIn(
+            'vendormanagement_request_duration_seconds_count{endpoint="service-expiring-soon"} 2',
+            response.content.decode()
+        )
+
+    def test_slow_requests_are_logged_with_their_sql(self):
+        with override_settings(PROFILING_SLOW_MS=0), \
+                self.assertLogs('vendormanagement.profiling', 'WARNING') as logs:
+            self.client.get('/api/services/')
+        self.assertIn('(service-list)', logs.output[0])
+        self.assertIn('SELECT', logs.output[0])
+
+    def test_metrics_are_admin_only(self):
+        self.client.force_authenticate(self.user)
+        self.assertEqual(self.client.get('/api/_metrics/').status_code, 403)
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    """Token users come from the cache until the user is saved"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user('tester', password='password')
+        token = AccessToken.for_user(self.user)
+        self.request = RequestFactory().get('/api/jobs/', HTTP_AUTHORIZATION=f'Bearer {token}')
+        self.authentication = CachedJWTAuthentication()
+
+    def test_user_is_loaded_once_and_invalidated_on_save(self):
+        with self.assertNumQueries(1):
+            self.authentication.authenticate(self.request)
+        with self.assertNumQueries(0):
+            user, _ = self.authentication.authenticate(self.request)
+        self.assertEqual(user, self.user)
+        self.assertEqual((user.is_active, user.is_staff, user.is_superuser), (True, False, False))
+        # Only the fields authentication needs are cached; the rest load on access
+        entry = cache.get(user_cache_key(self.user.pk))
+        self.assertNotIn(self.user.password, entry.values())
+        self.assertNotIn('password', entry)
+        with self.assertNumQueries(1):
+            self.assertEqual(user.username, 'tester')
+        # Token issue only updates last_login, which keeps the entry
+        update_last_login(None, self.user)
+        with self.assertNumQueries(0):
+            self.authentication.authenticate(self.request)
+
+        self.user.is_active = False
+        self.user.save()
+        with self.assertRaises(AuthenticationFailed):
+            self.authentication.authenticate(self.request)
+
+    def test_staff_flag_changes_are_seen_on_save(self):
+        self.authentication.authenticate(self.request)
+        self.user.is_staff = True
+        self.user.save()
+        user, _ = self.authentication.authenticate(self.request)
+        self.assertTrue(user.is_staff)
+        with self.assertNumQueries(0):
+            user, _ = self.authentication.authenticate(self.request)
+        self.assertTrue(user.is_staff)
+
+
+class AsyncReadPathTests(TestCase):
+    """The async endpoints render exactly the JSON of their DRF counterparts"""
+
+    endpoints = ['expiring_soon', 'payment_due_soon', 'active_services', 'expired_services']
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='password')
+        cls.vendors = create_vendors_with_services(3)
+        today = timezone.now().date()
+        for i in range(7):
+            Service.objects.create(
+                vendor=cls.vendors[i % 3], service_name=f'soon{i}', start_date=today,
+                expiry_date=today + timedelta(days=i), payment_due_date=today + timedelta(days=i + 1),
+                amount=Decimal(10 * i),
+            )
+
+    def setUp(self):
+        cache.clear()
+        self.auth = {'HTTP_AUTHORIZATION': f'Bearer {AccessToken.for_user(self.user)}'}
+
+    def assertSameResponse(self, sync_url, async_url, params=None, **extra):
+        expected = self.client.get(sync_url, params, **extra)
+        response = self.client.get(async_url, params, **extra)
+        self.assertEqual(response.status_code, expected.status_code)
+        # Page links point at the endpoint itself
+        self.assertEqual(response.content.replace(b'/api/async/', b'/api/'), expected.content)
+
+    def test_service_windows(self):
+        for name in self.endpoints:
+            for params in (
+                {}, {'page': 2, 'page_size': 2}, {'page': 'last', 'page_size': 3}, {'page': 99},
+                {'vendor': self.vendors[1].id, 'ordering': '-amount'}, {'status': 'Late'},
+            ):
+                with self.subTest(endpoint=name, params=params):
+                    self.assertSameResponse(f'/api/services/{name}/', f'/api/async/services/{name}/', params, **self.auth)
+
+    def test_dashboard_summary(self):
+        expected = self.client.get('/api/dashboard/summary/', {'top_n': 3}, **self.auth)
+        cache.clear()
+        response = self.client.get('/api/async/dashboard/summary/', {'top_n': 3}, **self.auth)
+        self.assertEqual(response.content, expected.content)
+
+    def test_days_are_bounded(self):
+        self.assertSameResponse(
+            '/api/dashboard/summary/', '/api/async/dashboard/summary/', {'days': 99999999}, **self.auth
+        )
+        response = self.client.get('/api/async/dashboard/summary/', {'days': 99999999}, **self.auth)
+        self.assertEqual(response.status_code, 400)
+
+    def test_authentication_is_required(self):
+        self.assertSameResponse('/api/services/expiring_soon/', '/api/async/services/expiring_soon/')
+        self.assertSameResponse(
+            '/api/services/expiring_soon/', '/api/async/services/expiring_soon/', HTTP_AUTHORIZATION='Bearer x'
+        )
+
+
+class SpendRollupTests(APITestCase):
+    """Monthly spend rollups follow service writes and serve the analytics endpoints"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='password')
+        cls.acme = Vendor.objects.create(name='acme', contact_person='c', email='a@example.com', phone='1')
+        cls.zeta = Vendor.objects.create(name='zeta', contact_person='c', email='z@example.com', phone='1')
+        for vendor, due, amount in [
+            (cls.acme, '2025-01-10', '100.00'), (cls.acme, '2025-01-31', '50.25'),
+            (cls.acme, '2025-02-01', '10.00'), (cls.zeta, '2025-01-15', '400.00'),
+        ]:
+            Service.objects.create(
+                vendor=vendor, service_name=due, start_date='2024-01-01',
+                expiry_date='2026-01-01', payment_due_date=due, amount=amount,
+            )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def rollups(self):
+        return {
+            (vendor.name, f'{month:%Y-%m}'): (str(amount), count)
+            for vendor, month, amount, count in (
+                (row.vendor, row.month, row.total_amount, row.service_count)
+                for row in VendorMonthlySpend.objects.select_related('vendor')
+            )
+        }
+
+    def test_saves_and_deletes_refresh_their_months(self):
+        self.assertEqual(self.rollups(), {
+            ('acme', '2025-01'): ('150.25', 2), ('acme', '2025-02'): ('10.00', 1), ('zeta', '2025-01'): ('400.00', 1),
+        })
+        service = Service.objects.get(service_name='2025-01-10')
+        service.payment_due_date = '2025-02-20'
+        service.vendor = self.zeta
+        service.save()
+        Service.objects.get(service_name='2025-01-31').delete()
+        self.assertEqual(self.rollups(), {('acme', '2025-02'): ('10.00', 1), ('zeta', '2025-01'): ('400.00', 1),
+                                          ('zeta', '2025-02'): ('100.00', 1)})
+
+    def test_vendor_delete_does_not_refresh_per_service(self):
+        Service.objects.bulk_create([
+            Service(vendor=self.zeta, service_name=f'extra{i}', start_date='2025-01-01', expiry_date='2026-01-01',
+                    payment_due_date=f'2025-{i + 1:02d}-05', amount=Decimal('1.00'))
+            for i in range(6)
+        ])
+        with CaptureQueriesContext(connection) as queries:
+            self.zeta.delete()
+        spend_queries = [q for q in queries if 'vendormonthlyspend' in q['sql'].lower()]
+        # The cascade collects and deletes the vendor's rollup rows, nothing per service
+        self.assertLessEqual(len(spend_queries), 2)
+        self.assertEqual(self.rollups(), {('acme', '2025-02'): ('10.00', 1), ('acme', '2025-01'): ('150.25', 2)})
+        response = self.client.delete(f'/api/vendors/{self.acme.id}/')
+        self.assertEqual(response.status_code, 204)
+        self.assertFalse(VendorMonthlySpend.objects.exists())
+
+    def test_bulk_writes_and_renewals_keep_rollups_equal_to_a_rebuild(self):
+        services = {s.service_name: s.id for s in Service.objects.all()}
+        response = self.client.post('/api/services/bulk/', [
+            {'vendor': self.zeta.id, 'service_name': 'new', 'start_date': '2025-01-01',
+             'expiry_date': '2026-01-01', 'payment_due_date': '2025-03-05', 'amount': '1.50'},
+            {'id': services['2025-02-01'], 'payment_due_date': '2025-01-02'},
+            {'op': 'delete', 'id': services['2025-01-15']},
+        ], format='json')
+        self.assertEqual(response.status_code, 200)
+        renew_services(months=1, vendor=self.acme.id)
+        refreshed = self.rollups()
+        self.assertEqual(refreshed[('acme', '2025-02')], ('160.25', 3))
+        self.assertNotIn(('zeta', '2025-01'), refreshed)
+        rebuild_spend_rollups()
+        self.assertEqual(self.rollups(), refreshed)
+
+    def test_spend_endpoints(self):
+        with self.assertNumQueries(3):
+            response = self.client.get('/api/analytics/spend/?from=2025-01&to=2025-01&top_n=1')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['total'], {'amount': '550.25', 'services': 3})
+        self.assertEqual(response.data['months'], [{'month': '2025-01', 'amount': '550.25', 'services': 3}])
+        self.assertEqual(response.data['top_vendors'], [
+            {'vendor': self.zeta.id, 'vendor_name': 'zeta', 'amount': '400.00', 'services': 1}
+        ])
+
+        response = self.client.get(f'/api/analytics/vendor_spend/?vendor={self.acme.id}')
+        self.assertEqual(response.data['count'], 2)
+        self.assertEqual([(row['month'], row['amount']) for row in response.data['results']],
+                         [('2025-01', '150.25'), ('2025-02', '10.00')])
+        self.assertEqual(self.client.get('/api/analytics/spend/?from=2025-13').status_code, 400)
+
+
+class ServiceForecastTests(APITestCase):
+    """The forecast buckets payments and renewals of the window with one query"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='password')
+        vendor = Vendor.objects.create(name='v', contact_person='c', email='v@example.com', phone='1')
+        other = Vendor.objects.create(name='w', contact_person='c', email='w@example.com', phone='1')
+        for vendor, due, expiry, amount in [
+            (vendor, '2025-01-15', '2025-03-31', '100.10'),  # Wednesday
+            (vendor, '2025-01-20', '2024-12-01', '0.20'),    # Monday, expired before the window
+            (vendor, '2025-02-28', '2026-06-01', '50.00'),
+            (vendor, '2024-12-31', '2025-04-30', '7.00'),    # paid before the window
+            (other, '2025-01-16', '2025-01-16', '1000.00'),
+        ]:
+            Service.objects.create(
+                vendor=vendor, service_name=due, start_date='2024-01-01',
+                expiry_date=expiry, payment_due_date=due, amount=amount,
+            )
+        cls.other = other
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_monthly_and_weekly_buckets(self):
+        today = date(2025, 1, 15)
+        with self.assertNumQueries(1):
+            forecast = get_service_forecast(months=3, today=today)
+        self.assertEqual((forecast['start'], forecast['end']), ('2025-01-15', '2025-04-14'))
+        self.assertEqual(forecast['totals'], {
+            'payments': 4, 'payment_amount': '1150.30', 'renewals': 2, 'renewal_amount': '1100.10',
+        })
+        self.assertEqual(
+            [(p['period'], p['payment_amount'], p['renewals'], p['cumulative_payment_amount'])
+             for p in forecast['periods']],
+            [('2025-01', '1100.30', 1, '1100.30'), ('2025-02', '50.00', 0, '1150.30'),
+             ('2025-03', '0.00', 1, '1150.30'), ('2025-04', '0.00', 0, '1150.30')]
+        )
+
+        weeks = get_service_forecast(months=1, granularity='week', today=today)['periods']
+        self.assertEqual(weeks[0]['period'], '2025-01-13')
+        self.assertEqual([w['payments'] for w in weeks[:2]], [2, 1])
+
+        only_other = get_service_forecast(months=3, vendor_ids=[self.other.id], today=today)
+        self.assertEqual(only_other['totals']['payment_amount'], '1000.00')
+
+    def test_forecast_endpoint(self):
+        response = self.client.get('/api/analytics/forecast/?months=2&granularity=day')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['periods'][0]['period'], timezone.now().date().isoformat())
+        self.assertEqual(self.client.get('/api/analytics/forecast/?granularity=year').status_code, 400)
+        self.assertEqual(self.client.get('/api/analytics/forecast/?months=0').status_code, 400)
+
+
+class FailingEmailBackend(LocmemEmailBackend):
+    """Locmem backend that rejects any batch containing a message to fail@example.com"""
+
+    def send_messages(self, messages):
+        if any('fail@example.com' in message.to for message in messages):
+            raise ConnectionError('Recipient refused')
+        return super().send_messages(messages)
+
+
+class ReminderDispatchTests(TestCase):
+    """Reminders are built up front and sent in batches over pooled connections"""
+
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.now().date()
+        for i in range(7):
+            vendor = Vendor.objects.create(
+                name=f'vendor{i}', contact_person=f'contact{i}',
+                email='fail@example.com' if i == 3 else f'vendor{i}@example.com', phone='12345',
+            )
+            Service.objects.create(
+                vendor=vendor, service_name=f'service{i}', start_date=today - timedelta(days=365),
+                expiry_date=today + timedelta(days=5), payment_due_date=today + timedelta(days=60),
+                amount=Decimal('100.00'),
+            )
+        # Outside the reminder window
+        Service.objects.create(
+            vendor=vendor, service_name='later', start_date=today, expiry_date=today + timedelta(days=90),
+            payment_due_date=today + timedelta(days=90), amount=Decimal('100.00'),
+        )
+
+    def test_sends_all_flagged_services_in_batches(self):
+        result = check_and_send_reminders(days=15, workers=3, batch_size=2)
+        self.assertEqual(result['total_services_flagged'], 7)
+        self.assertEqual(result['emails_sent'], 7)
+        self.assertEqual(result['emails_failed'], 0)
+        self.assertEqual(result['expiring_count'], 7)
+        self.assertEqual(result['payment_due_count'], 0)
+        self.assertEqual(len(mail.outbox), 7)
+
+    @override_settings(EMAIL_BACKEND='vendormanagement.tests.FailingEmailBackend')
+    def test_failed_batch_is_retried_per_message(self):
+        with self.assertLogs('vendormanagement.utils.dispatch_utils', 'WARNING') as logs:
+            result = check_and_send_reminders(days=15, workers=2, batch_size=3)
+        self.assertIn('Batch send failed, retrying 3 messages individually', logs.output[0])
+        self.assertIn('ERROR:vendormanagement.utils.dispatch_utils:Error sending email to fail@example.com', logs.output[1])
+        self.assertEqual(result['emails_sent'], 6)
+        self.assertEqual(result['emails_failed'], 1)
+        self.assertEqual(len(mail.outbox), 6)
+        self.assertNotIn('fail@example.com', [to for message in mail.outbox for to in message.to])
+
+    def test_repeated_run_skips_already_sent_reminders(self):
+        check_and_send_reminders(days=15)
+        self.assertEqual(ReminderLog.objects.count(), 7)
+        mail.outbox = []
+
+        result = check_and_send_reminders(days=15)
+        self.assertEqual(result['total_services_flagged'], 7)
+        self.assertEqual(result['emails_sent'], 0)
+        self.assertEqual(result['reminders_skipped'], 7)
+        self.assertEqual(mail.outbox, [])
+
+    @override_settings(EMAIL_BACKEND='vendormanagement.tests.FailingEmailBackend')
+    def test_failed_reminders_are_retried_on_next_run(self):
+        check_and_send_reminders(days=15)
+        self.assertEqual(ReminderLog.objects.count(), 6)
+        mail.outbox = []
+
+        with self.settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend'):
+            result = check_and_send_reminders(days=15)
+        self.assertEqual(result['emails_sent'], 1)
+        self.assertEqual(result['reminders_skipped'], 6)
+        self.assertEqual(mail.outbox[0].to, ['fail@example.com'])
+
+
+@override_settings(ADMIN_EMAIL='admin@example.com')
+class ReminderDigestTests(TestCase):
+    """Digest mode sends one message per vendor and one summary to the admin"""
+
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.now().date()
+        for i in range(2):
+            vendor = Vendor.objects.create(
+                name=f'vendor{i}', contact_person=f'contact{i}', email=f'vendor{i}@example.com', phone='12345',
+            )
+            for j in range(3):
+                Service.objects.create(
+                    vendor=vendor, service_name=f'service{i}-{j}', start_date=today - timedelta(days=365),
+                    expiry_date=today + timedelta(days=5), payment_due_date=today + timedelta(days=j),
+                    amount=Decimal('100.00'),
+                )
+
+    def test_one_message_per_vendor_and_admin_summary(self):
+        result = check_and_send_reminders(days=15, digest=True)
+        self.assertEqual(result['total_services_flagged'], 6)
+        self.assertEqual(result['emails_sent'], 3)
+        recipients = sorted(message.to[0] for message in mail.outbox)
+        self.assertEqual(recipients, ['admin@example.com', 'vendor0@example.com', 'vendor1@example.com'])
+
+        vendor_message = next(message for message in mail.outbox if message.to == ['vendor0@example.com'])
+        self.assertIn('3 services', vendor_message.subject)
+        for j in range(3):
+            self.assertIn(f'service0-{j}', vendor_message.body)
+        admin_message = next(message for message in mail.outbox if message.to == ['admin@example.com'])
+        self.assertIn('Services flagged: 6', admin_message.body)
+        self.assertIn('Payment due soon: 3 ($300.00)', admin_message.body)
+
+
+class ReminderJobTests(APITestCase):
+    """The check_reminders action queues a job that the worker runs in the background"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='password')
+        today = timezone.now().date()
+        vendor = Vendor.objects.create(name='vendor', contact_person='contact', email='vendor@example.com', phone='1')
+        Service.objects.create(
+            vendor=vendor, service_name='service', start_date=today - timedelta(days=365),
+            expiry_date=today + timedelta(days=5), payment_due_date=today + timedelta(days=5),
+            amount=Decimal('100.00'),
+        )
+
+    def setUp(self):
+        self.client.force_authenticate(self.user)
+
+    def test_check_reminders_is_queued_and_run_by_worker(self):
+        response = self.client.post('/api/services/check_reminders/', {'days': 15}, format='json')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data['job']['status'], 'queued')
+        self.assertEqual(mail.outbox, [])
+
+        self.assertEqual(work(once=True), 1)
+
+        response = self.client.get(f"/api/jobs/{response.data['job_id']}/")
+        self.assertEqual(response.data['status'], 'succeeded')
+        self.assertEqual(response.data['progress_done'], 1)
+        self.assertEqual(response.data['progress_total'], 1)
+        self.assertEqual(response.data['result']['emails_sent'], 1)
+        self.assertEqual(len(mail.outbox), 1)
+
+    def test_invalid_days_are_rejected_without_queueing(self):
+        for days in [-1, 99999999, 'soon']:
+            with self.subTest(days=days):
+                response = self.client.post('/api/services/check_reminders/', {'days': days}, format='json')
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(Job.objects.exists())
+
+    def test_jobs_of_other_users_are_hidden(self):
+        other = User.objects.create_user('other', password='password')
+        job = Job.objects.create(kind='check_reminders', created_by=other)
+        self.assertEqual(self.client.get(f'/api/jobs/{job.id}/').status_code, 404)
+
+
+class DashboardSummaryTests(APITestCase):
+    """The dashboard summary counts and top-N lists"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='password')
+        cls.vendors = create_vendors_with_services(3)
+        Vendor.objects.filter(pk=cls.vendors[2].pk).update(status='Inactive')
+        today = timezone.now().date()
+        cls.soon = [
+            Service.objects.create(
+                vendor=cls.vendors[0], service_name=f'soon{i}', start_date=today,
+                expiry_date=today + timedelta(days=i), payment_due_date=today + timedelta(days=20 + i),
+                amount=Decimal('10.50'),
+            )
+            for i in range(4)
+        ]
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def test_counts_and_top_n(self):
+        response = self.client.get('/api/dashboard/summary/', {'top_n': 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['counts'], {
+            'total_vendors': 3, 'active_vendors': 2, 'total_services': 13, 'active_services': 10,
+            'expired_services': 3, 'expiring_soon': 4, 'payment_due_soon': 0,
+        })
+        self.assertEqual([v['id'] for v in response.data['recent_vendors']], [self.vendors[2].id, self.vendors[1].id])
+        self.assertEqual([s['id'] for s in response.data['expiring_soon']], [s.id for s in self.soon[:2]])
+        self.assertEqual(response.data['expiring_soon'][0]['amount'], '10.50')
+        self.assertEqual(response.data['expiring_soon'][0]['vendor_name'], 'vendor0')
+        self.assertEqual(response.data['payment_due_soon'], [])
+
+        response = self.client.get('/api/dashboard/summary/', {'days': 30, 'top_n': 0})
+        self.assertEqual(response.data['counts']['expiring_soon'], 10)
+        self.assertEqual(response.data['counts']['payment_due_soon'], 10)
+        self.assertEqual(response.data['recent_vendors'], [])
+
+    def test_invalid_parameters_are_rejected(self):
+        for params in [{'days': -1}, {'days': 99999999}, {'days': 'soon'}, {'top_n': 51}]:
+            with self.subTest(params=params):
+                self.assertEqual(self.client.get('/api/dashboard/summary/', params).status_code, 400)
+
+
+class DashboardCacheTests(APITestCase):
+    """Dashboard aggregates are cached and invalidated by vendor/service writes"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('tester', password='password')
+        create_vendors_with_services(3)
+
+    def setUp(self):
+        cache.clear()
+        cache_stats.reset()
+        self.client.force_authenticate(self.user)
+
+    def test_summary_is_served_from_cache_until_a_service_changes(self):
+        response = self.client.get('/api/dashboard/summary/')
+        self.assertEqual(response.data['counts']['total_services'], 9)
+
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/dashboard/summary/')
+        self.assertEqual(response.data['counts']['total_services'], 9)
+        version = get_aggregate_version()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            Service.objects.first().delete()
+            # Not invalidated before the commit
+            self.assertEqual(get_aggregate_version(), version)
+        response = self.client.get('/api/dashboard/summary/')
+        self.assertEqual(response.data['counts']['total_services'], 8)
+
+        stats = self.client.get('/api/dashboard/cache_stats/').data
+        self.assertEqual(stats['aggregates']['dashboard_summary'], {'hits': 1, 'misses': 2})
+
+    def test_delete_only_bulk_request_invalidates_after_commit(self):
+        version = get_aggregate_version()
+        service = Service.objects.first()
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            response = self.client.post('/api/services/bulk/', [{'op': 'delete', 'id': service.id}], format='json')
+            self.assertEqual(get_aggregate_version(), version)
+        self.assertEqual(response.data['deleted'], 1)
+        self.assertTrue(callbacks)
+        self.assertNotEqual(get_aggregate_version(), version)
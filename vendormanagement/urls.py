@@ -5,14 +5,18 @@ from rest_framework_simplejwt.views import (
     TokenRefreshView,
     TokenVerifyView,
 )
+from . import async_views
 from .views import (
-    VendorViewSet, ServiceViewSet, RegisterView,
-    login_view, dashboard_view
+    VendorViewSet, ServiceViewSet, DashboardViewSet, AnalyticsViewSet, JobViewSet, RegisterView,
+    login_view, dashboard_view, metrics_view
 )
 
 router = DefaultRouter()
 router.register(r'vendors', VendorViewSet, basename='vendor')
 router.register(r'services', ServiceViewSet, basename='service')
+router.register(r'dashboard', DashboardViewSet, basename='dashboard')
+router.register(r'analytics', AnalyticsViewSet, basename='analytics')
+router.register(r'jobs', JobViewSet, basename='job')
 
 urlpatterns = [
     # UI Routes
@@ -25,6 +29,16 @@ urlpatterns = [
     path('api/token/verify/', TokenVerifyView.as_view(), name='token_verify'),
     path('api/register/', RegisterView.as_view(), name='register'),
     
+    # Async (ASGI) read path
+    path('api/async/services/expiring_soon/', async_views.expiring_soon, name='async-service-expiring-soon'),
+    path('api/async/services/payment_due_soon/', async_views.payment_due_soon, name='async-service-payment-due-soon'),
+    path('api/async/services/active_services/', async_views.active_services, name='async-service-active-services'),
+    path('api/async/services/expired_services/', async_views.expired_services, name='async-service-expired-services'),
+    path('api/async/dashboard/summary/', async_views.dashboard_summary, name='async-dashboard-summary'),
+
+    # Request profiling (PROFILING_ENABLED), admin only
+    path('api/_metrics/', metrics_view, name='metrics'),
+
     # API endpoints
     path('api/', include(router.urls))
 ]
@@ -0,0 +1,142 @@
+"""
+Helpers for the benchmark management commands: a throwaway test database,
+synthetic data seeding, timing and query-plan inspection
+"""
+import random
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from vendormanagement.models import Vendor, Service
+from vendormanagement.utils.spend_utils import rebuild_spend_rollups
+
+
+@contextmanager
+def benchmark_database(test_name=None):
+    """
+    Create a fresh test database for the duration of a benchmark so the
+    configured database is never touched, and destroy it afterwards.
+    test_name overrides the test database name (for SQLite, a file path instead
+    of the in-memory database).
+    """
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    old_test_name = connection.settings_dict['TEST']['NAME']
+    if test_name is not None:
+        connection.settings_dict['TEST']['NAME'] = test_name
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=False)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        connection.settings_dict['TEST']['NAME'] = old_test_name
+        teardown_test_environment()
+
+
+def seed_services(service_count, vendor_count=1000, spread_days=730, batch_size=5000, seed=42):
+    """
+    Bulk insert vendor_count vendors and service_count services with expiry and
+    payment due dates spread uniformly over today +/- spread_days.
+
+    Returns:
+        list: The created vendor ids
+    """
+    rng = random.Random(seed)
+    today = timezone.now().date()
+
+    Vendor.objects.bulk_create(
+        [
+            Vendor(
+                name=f'vendor{i}', contact_person=f'contact{i}', email=f'vendor{i}@example.com',
+                phone='12345', status='Active' if i % 10 else 'Inactive',
+            )
+            for i in range(vendor_count)
+        ],
+        batch_size=batch_size,
+    )
+    vendor_ids = list(Vendor.objects.values_list('id', flat=True))
+
+    created = 0
+    while created < service_count:
+        batch = []
+        for i in range(created, min(created + batch_size, service_count)):
+            expiry = today + timedelta(days=rng.randint(-spread_days, spread_days))
+            batch.append(Service(
+                vendor_id=rng.choice(vendor_ids),
+                service_name=f'service{i}',
+                start_date=expiry - timedelta(days=365),
+                expiry_date=expiry,
+                payment_due_date=today + timedelta(days=rng.randint(-spread_days, spread_days)),
+                amount=Decimal(rng.randint(100, 1000000)) / 100,
+            ))
+            batch[-1].refresh_status_snapshot(today)
+        Service.objects.bulk_create(batch)
+        created += len(batch)
+
+    # bulk_create bypasses the spend rollup signals
+    rebuild_spend_rollups()
+
+    # Refresh planner statistics so EXPLAIN reflects the seeded distribution
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return vendor_ids
+
+
+def time_call(func, repeat=10, warmup=1):
+    """
+    Call func repeatedly and return latency statistics in milliseconds
+    """
+    for _ in range(warmup):
+        func()
+    samples = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        samples.append((time.perf_counter() - started) * 1000)
+    samples.sort()
+    return {
+        'min_ms': round(samples[0], 2),
+        'median_ms': round(statistics.median(samples), 2),
+        'p95_ms': round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+        'max_ms': round(samples[-1], 2),
+    }
+
+
+def count_queries(func):
+    """Call func and return the number of database queries it ran"""
+    queries = []
+
+    def record(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(record):
+        func()
+    return len(queries)
+
+
+def plan_uses_index(plan, table):
+    """
+    Check an EXPLAIN output (SQLite or PostgreSQL) for an index access on table
+    and the absence of a full scan of it.
+    """
+    index_access = False
+    for line in plan.splitlines():
+        if table not in line and 'Index Scan' not in line:
+            continue
+        if 'USING INDEX' in line or 'USING COVERING INDEX' in line or 'Index Scan' in line \
+                or 'Index Only Scan' in line:
+            index_access = True
+        elif f'SCAN {table}' in line or f'Seq Scan on {table}' in line:
+            return False
+    return index_access
+
+
+def explain(queryset):
+    """Return the database query plan of a queryset"""
+    return queryset.explain()
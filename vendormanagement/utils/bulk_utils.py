@@ -0,0 +1,197 @@
+"""
+Utility functions for bulk creating, updating and deleting services in one request
+"""
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from vendormanagement.models import Vendor, Service, STATUS_SNAPSHOT_FIELDS
+from vendormanagement.utils.cache_utils import invalidate_aggregates
+from vendormanagement.utils.spend_utils import deferred_spend_refresh, spend_key
+
+
+DEFAULT_BULK_MAX_ITEMS = 5000
+BULK_OPERATIONS = ('create', 'update', 'delete')
+SERVICE_BULK_FIELDS = ['vendor', 'service_name', 'start_date', 'expiry_date', 'payment_due_date', 'amount']
+
+
+def get_bulk_max_items():
+    return getattr(settings, 'BULK_MAX_ITEMS', DEFAULT_BULK_MAX_ITEMS)
+
+
+def as_id(value):
+    """A primary key from JSON (int or numeric string), or None"""
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def clean_service_item(item, partial):
+    """
+    Validate the writable fields of one bulk item against the Service model fields.
+    With partial set (updates) only the fields present are validated.
+
+    Returns:
+        tuple: (cleaned values dict, errors dict keyed by field name)
+    """
+    values = {}
+    errors = {}
+    for name in item:
+        if name not in SERVICE_BULK_FIELDS and name not in ('id', 'op'):
+            errors[name] = ['Unknown field.']
+    for name in SERVICE_BULK_FIELDS:
+        if name not in item:
+            if not partial:
+                errors[name] = ['This field is required.']
+            continue
+        if name == 'vendor':
+            # Existence is checked against the prefetched vendor ids
+            values['vendor_id'] = as_id(item['vendor'])
+            if values['vendor_id'] is None:
+                errors['vendor'] = ['A valid vendor id is required.']
+            continue
+        try:
+            values[name] = Service._meta.get_field(name).clean(item[name], None)
+        except ValidationError as e:
+            errors[name] = e.messages
+        except (TypeError, ValueError):
+            errors[name] = ['Invalid value.']
+    return values, errors
+
+
+def get_item_operation(item):
+    """The item's 'op', defaulting to update when it has an id and create otherwise"""
+    return item.get('op') or ('update' if 'id' in item else 'create')
+
+
+def bulk_write_services(items, atomic=False):
+    """
+    Validate and apply a list of service operations. Every item is a dict with an
+    optional 'op' (create, update or delete), an 'id' for updates and deletes, and
+    the service fields (vendor given by id). Referenced vendors and services are
+    loaded with one query each, and all writes happen in one transaction with
+    bulk_create/bulk_update/delete.
+
+    Args:
+        items: List of operation dicts
+        atomic: Write nothing if any item is invalid
+
+    Returns:
+        dict: Counts per operation and one result per item, in input order
+    """
+    results = [None] * len(items)
+    operations = [get_item_operation(item) if isinstance(item, dict) else None for item in items]
+
+    # One query each for the referenced vendors and services
+    vendor_ids = set()
+    service_ids = set()
+    for item, op in zip(items, operations):
+        if op is None:
+            continue
+        if op in ('update', 'delete') and as_id(item.get('id')) is not None:
+            service_ids.add(as_id(item['id']))
+        if as_id(item.get('vendor')) is not None:
+            vendor_ids.add(as_id(item['vendor']))
+    existing_vendors = set(Vendor.objects.filter(id__in=vendor_ids).values_list('id', flat=True))
+    services = Service.objects.in_bulk(service_ids)
+
+    to_create = []
+    to_update = {}
+    to_delete = []
+    previous_keys = []
+    update_fields = set()
+    seen_ids = set()
+    for index, (item, op) in enumerate(zip(items, operations)):
+        if op is None:
+            results[index] = {'index': index, 'status': 'error', 'errors': {'non_field_errors': ['Expected an object.']}}
+            continue
+        if op not in BULK_OPERATIONS:
+            results[index] = {'index': index, 'op': op, 'status': 'error',
+                              'errors': {'op': [f"op must be one of: {', '.join(BULK_OPERATIONS)}"]}}
+            continue
+
+        errors = {}
+        service = None
+        if op in ('update', 'delete'):
+            service = services.get(as_id(item.get('id')))
+            if service is None:
+                errors['id'] = [f"Service {item.get('id')!r} does not exist."]
+            elif service.pk in seen_ids:
+                errors['id'] = [f'Service {service.pk} appears more than once.']
+            else:
+                seen_ids.add(service.pk)
+
+        values = {}
+        if op != 'delete':
+            values, field_errors = clean_service_item(item, partial=op == 'update')
+            errors.update(field_errors)
+            if 'vendor_id' in values and values['vendor_id'] not in existing_vendors:
+                errors['vendor'] = [f"Vendor {item['vendor']!r} does not exist."]
+
+        if errors:
+            results[index] = {'index': index, 'op': op, 'status': 'error', 'errors': errors}
+            continue
+
+        if op == 'create':
+            to_create.append((index, Service(**values)))
+        elif op == 'update':
+            # The rollup the service leaves, as loaded
+            previous_keys.append(spend_key(service))
+            for name, value in values.items():
+                setattr(service, name, value)
+            update_fields.update('vendor' if name == 'vendor_id' else name for name in values)
+            to_update[index] = service
+        else:
+            to_delete.append((index, service))
+
+    failed = sum(1 for result in results if result is not None)
+    if atomic and failed:
+        for index, result in enumerate(results):
+            if result is None:
+                results[index] = {'index': index, 'op': operations[index], 'status': 'skipped'}
+        return {'created': 0, 'updated': 0, 'deleted': 0, 'failed': failed, 'results': results}
+
+    # bulk_create/bulk_update bypass Service.save, which keeps the status snapshot current
+    now = timezone.now()
+    for _, service in to_create:
+        service.refresh_status_snapshot(now.date())
+    for service in to_update.values():
+        service.refresh_status_snapshot(now.date())
+        # bulk_update does not apply auto_now
+        service.updated_at = now
+
+    # One spend rollup refresh for the whole request (deletes report their keys through post_delete)
+    with transaction.atomic(), deferred_spend_refresh() as spend_keys:
+        if to_create:
+            Service.objects.bulk_create([service for _, service in to_create])
+        if to_update:
+            Service.objects.bulk_update(
+                to_update.values(), fields=sorted(update_fields) + ['updated_at', *STATUS_SNAPSHOT_FIELDS]
+            )
+        if to_delete:
+            Service.objects.filter(pk__in=[service.pk for _, service in to_delete]).delete()
+        spend_keys.update(spend_key(service) for _, service in to_create)
+        spend_keys.update(spend_key(service) for service in to_update.values())
+        spend_keys.update(previous_keys)
+
+    for index, service in to_create:
+        results[index] = {'index': index, 'op': 'create', 'status': 'created', 'id': service.pk}
+    for index, service in to_update.items():
+        results[index] = {'index': index, 'op': 'update', 'status': 'updated', 'id': service.pk}
+    for index, service in to_delete:
+        results[index] = {'index': index, 'op': 'delete', 'status': 'deleted', 'id': service.pk}
+
+    if to_create or to_update or to_delete:
+        # bulk_create/bulk_update send no post_save signals; after the commit, see signals
+        transaction.on_commit(invalidate_aggregates)
+
+    return {
+        'created': len(to_create),
+        'updated': len(to_update),
+        'deleted': len(to_delete),
+        'failed': failed,
+        'results': results,
+    }
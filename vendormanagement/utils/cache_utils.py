@@ -0,0 +1,128 @@
+"""
+Utility functions for caching dashboard aggregates
+
+Cached values are keyed by a data version and today's date. The version changes
+when a Vendor or Service save or delete commits (see vendormanagement.signals) or
+a bulk write calls invalidate_aggregates(), and the date rolls over at midnight,
+so a cached aggregate is never served stale.
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils import timezone
+
+
+DEFAULT_AGGREGATE_CACHE_TIMEOUT = 3600
+VERSION_KEY = 'vendormanagement:aggregates:version'
+_MISSING = object()
+
+
+class CacheStats:
+    """Thread-safe in-process hit/miss counters per aggregate name"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts = {}
+
+    def record(self, name, hit):
+        with self._lock:
+            counts = self._counts.setdefault(name, {'hits': 0, 'misses': 0})
+            counts['hits' if hit else 'misses'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            aggregates = {name: dict(counts) for name, counts in self._counts.items()}
+        hits = sum(counts['hits'] for counts in aggregates.values())
+        misses = sum(counts['misses'] for counts in aggregates.values())
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_ratio': round(hits / (hits + misses), 3) if hits + misses else None,
+            'aggregates': aggregates,
+        }
+
+    def reset(self):
+        with self._lock:
+            self._counts = {}
+
+
+cache_stats = CacheStats()
+
+
+def get_aggregate_cache():
+    """The cache backend named by the AGGREGATE_CACHE_ALIAS setting (default: 'default')"""
+    return caches[getattr(settings, 'AGGREGATE_CACHE_ALIAS', 'default')]
+
+
+def get_aggregate_version():
+    cache = get_aggregate_cache()
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, time.time_ns(), timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def invalidate_aggregates():
+    """
+    Invalidate every cached aggregate by moving to a new data version.
+    Bulk writes that bypass model signals (bulk_create, QuerySet.update) must call this.
+    """
+    get_aggregate_cache().set(VERSION_KEY, time.time_ns(), timeout=None)
+
+
+def cached_aggregate(name, compute, params=(), timeout=None):
+    """
+    Return the cached value of an aggregate, computing and storing it on a miss
+
+    Args:
+        name: Aggregate name, also used for the hit/miss counters
+        compute: Callable returning the (picklable) aggregate value
+        params: Hashable parameters the value depends on
+        timeout: Cache timeout in seconds (default: AGGREGATE_CACHE_TIMEOUT setting or 3600)
+    """
+    cache = get_aggregate_cache()
+    key = aggregate_key(name, get_aggregate_version(), params)
+
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        cache_stats.record(name, hit=True)
+        return value
+
+    cache_stats.record(name, hit=False)
+    value = compute()
+    cache.set(key, value, get_aggregate_timeout(timeout))
+    return value
+
+
+async def acached_aggregate(name, compute, params=(), timeout=None):
+    """cached_aggregate() for async views: compute is a coroutine function"""
+    cache = get_aggregate_cache()
+    version = await cache.aget(VERSION_KEY)
+    if version is None:
+        await cache.aadd(VERSION_KEY, time.time_ns(), timeout=None)
+        version = await cache.aget(VERSION_KEY)
+    key = aggregate_key(name, version, params)
+
+    value = await cache.aget(key, _MISSING)
+    if value is not _MISSING:
+        cache_stats.record(name, hit=True)
+        return value
+
+    cache_stats.record(name, hit=False)
+    value = await compute()
+    await cache.aset(key, value, get_aggregate_timeout(timeout))
+    return value
+
+
+def aggregate_key(name, version, params):
+    today = timezone.now().date().isoformat()
+    return f'vendormanagement:aggregates:{name}:{version}:{today}:{":".join(map(str, params))}'
+
+
+def get_aggregate_timeout(timeout=None):
+    if timeout is None:
+        timeout = getattr(settings, 'AGGREGATE_CACHE_TIMEOUT', DEFAULT_AGGREGATE_CACHE_TIMEOUT)
+    return timeout
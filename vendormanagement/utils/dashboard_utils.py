@@ -0,0 +1,123 @@
+"""
+Utility functions for the aggregated dashboard summary
+"""
+import asyncio
+from datetime import timedelta
+
+from django.db.models import Count, F, Q
+from django.utils import timezone
+from vendormanagement.models import Vendor, Service
+
+
+DASHBOARD_VENDOR_FIELDS = ('id', 'name', 'contact_person', 'email', 'status')
+DASHBOARD_SERVICE_FIELDS = ('id', 'vendor', 'service_name', 'expiry_date', 'payment_due_date', 'amount')
+
+
+def dashboard_count_aggregates(days=15, today=None):
+    """The vendor and service aggregate() arguments of the dashboard counts"""
+    today = today or timezone.now().date()
+    soon = today + timedelta(days=days)
+    vendor_counts = {
+        'total_vendors': Count('id'),
+        'active_vendors': Count('id', filter=Q(status='Active')),
+    }
+    service_counts = {
+        'total_services': Count('id'),
+        'active_services': Count('id', filter=Q(expiry_date__gte=today)),
+        'expired_services': Count('id', filter=Q(expiry_date__lt=today)),
+        'expiring_soon': Count('id', filter=Q(expiry_date__gte=today, expiry_date__lte=soon)),
+        'payment_due_soon': Count('id', filter=Q(payment_due_date__gte=today, payment_due_date__lte=soon)),
+    }
+    return vendor_counts, service_counts
+
+
+def get_dashboard_counts(days=15, today=None):
+    """
+    Every dashboard count from two aggregate queries (one per table)
+
+    Returns:
+        dict: Vendor and service counts
+    """
+    vendor_counts, service_counts = dashboard_count_aggregates(days=days, today=today)
+    counts = Vendor.objects.aggregate(**vendor_counts)
+    counts.update(Service.objects.aggregate(**service_counts))
+    return counts
+
+
+async def aget_dashboard_counts(days=15, today=None):
+    """get_dashboard_counts() for async views: both aggregate queries are awaited together"""
+    vendor_counts, service_counts = dashboard_count_aggregates(days=days, today=today)
+    vendors, services = await asyncio.gather(
+        Vendor.objects.aaggregate(**vendor_counts),
+        Service.objects.aaggregate(**service_counts),
+    )
+    return {**vendors, **services}
+
+
+def dashboard_top_rows(days=15, top_n=5, today=None):
+    """The top-N row querysets of the dashboard summary"""
+    today = today or timezone.now().date()
+    services = Service.objects.values(*DASHBOARD_SERVICE_FIELDS, vendor_name=F('vendor__name'))
+    return {
+        'recent_vendors': Vendor.objects.order_by('-created_at', '-id').values(*DASHBOARD_VENDOR_FIELDS)[:top_n],
+        'expiring_soon': services.expiring_soon(days=days, today=today).order_by('expiry_date', 'id')[:top_n],
+        'payment_due_soon': services.payment_due_soon(days=days, today=today).order_by('payment_due_date', 'id')[:top_n],
+    }
+
+
+def get_dashboard_summary(days=15, top_n=5, today=None):
+    """
+    Dashboard counts plus the top-N recent vendors, services expiring soonest and
+    payments due soonest, as plain rows (no model instances or serializers)
+
+    Args:
+        days: Number of days ahead for the "soon" windows (default: 15)
+        top_n: Rows per list (default: 5)
+        today: Date the summary is computed for (default: today)
+
+    Returns:
+        dict: {'counts': {...}, 'recent_vendors': [...], 'expiring_soon': [...], 'payment_due_soon': [...]}
+    """
+    today = today or timezone.now().date()
+    rows = dashboard_top_rows(days=days, top_n=top_n, today=today)
+    return {
+        'date': today,
+        'days': days,
+        'counts': get_dashboard_counts(days=days, today=today),
+        'recent_vendors': list(rows['recent_vendors']),
+        'expiring_soon': format_service_rows(rows['expiring_soon']),
+        'payment_due_soon': format_service_rows(rows['payment_due_soon']),
+    }
+
+
+async def aget_dashboard_summary(days=15, top_n=5, today=None):
+    """get_dashboard_summary() for async views: its five queries are awaited together"""
+    today = today or timezone.now().date()
+    rows = dashboard_top_rows(days=days, top_n=top_n, today=today)
+    counts, recent_vendors, expiring_soon, payment_due_soon = await asyncio.gather(
+        aget_dashboard_counts(days=days, today=today),
+        alist(rows['recent_vendors']),
+        alist(rows['expiring_soon']),
+        alist(rows['payment_due_soon']),
+    )
+    return {
+        'date': today,
+        'days': days,
+        'counts': counts,
+        'recent_vendors': recent_vendors,
+        'expiring_soon': format_service_rows(expiring_soon),
+        'payment_due_soon': format_service_rows(payment_due_soon),
+    }
+
+
+async def alist(queryset):
+    """Evaluate a queryset through the async ORM"""
+    return [row async for row in queryset]
+
+
+def format_service_rows(rows):
+    """Render amounts as fixed two-decimal strings, like ServiceSerializer"""
+    rows = list(rows)
+    for row in rows:
+        row['amount'] = f"{row['amount']:.2f}"
+    return rows
@@ -1,5 +1,4 @@
-from vendormanagement.models import Vendor, Service
-import pandas as pd
+from vendormanagement.utils.import_utils import import_csv_files
 import os
 import inspect
 
@@ -17,12 +16,8 @@ def get_function_file_path(func):
     file_path = inspect.getfile(func)
     return os.path.abspath(file_path)
 
-def insert_dummy_data(vendor_file_path, service_file_path):
+def insert_dummy_data(vendor_file_path, service_file_path, batch_size=None):
     
-    df_vendors = pd.read_csv(vendor_file_path)
-    df_services = pd.read_csv(service_file_path)
-
-    for index, row in df_vendors.iterrows():
-        Vendor.objects.create(name=row['name'], contact_person=row['contact_person'], email=row['email'], phone=row['phone'], status=row['status'])
-    for index, row in df_services.iterrows():
-        Service.objects.create(vendor=Vendor.objects.get(name=row['vendor']), service_name=row['service_name'], start_date=row['start_date'], expiry_date=row['expiry_date'], payment_due_date=row['payment_due_date'], amount=row['amount'])
+    with open(vendor_file_path, newline='', encoding='utf-8-sig') as vendor_file, \
+            open(service_file_path, newline='', encoding='utf-8-sig') as service_file:
+        return import_csv_files(vendor_file, service_file, batch_size=batch_size)
@@ -0,0 +1,118 @@
+"""
+Utility functions for sending email messages in batches over reusable connections
+from a pool of worker threads
+"""
+import logging
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMAIL_WORKERS = 4
+DEFAULT_EMAIL_BATCH_SIZE = 50
+
+
+def dispatch_messages(messages, workers=None, batch_size=None, connection_factory=get_connection,
+                      chunk_size=None, on_chunk_sent=None):
+    """
+    Send prebuilt EmailMessage objects concurrently. Each worker thread opens one
+    connection and sends whole batches with send_messages(); when a batch fails its
+    messages are retried one by one on a fresh connection to isolate the failures.
+
+    Args:
+        messages: List of EmailMessage instances
+        workers: Number of sending threads (default: REMINDER_EMAIL_WORKERS setting or 4)
+        batch_size: Messages per send_messages() call (default: REMINDER_EMAIL_BATCH_SIZE setting or 50)
+        connection_factory: Callable returning an email backend connection
+        chunk_size: Send the messages in sequential chunks of this size (default: all at once)
+        on_chunk_sent: Called in the calling thread after each chunk with the indexes
+            of the messages that were sent and the number of messages processed so far,
+            e.g. to checkpoint progress
+
+    Returns:
+        dict: sent/failed counts, throughput and a per-message success list
+    """
+    workers = max(1, int(workers or getattr(settings, 'REMINDER_EMAIL_WORKERS', DEFAULT_EMAIL_WORKERS)))
+    batch_size = max(1, int(batch_size or getattr(settings, 'REMINDER_EMAIL_BATCH_SIZE', DEFAULT_EMAIL_BATCH_SIZE)))
+    chunk_size = max(1, int(chunk_size or len(messages) or 1))
+
+    started = time.perf_counter()
+    results = [False] * len(messages)
+    for chunk_start in range(0, len(messages), chunk_size):
+        chunk_end = min(chunk_start + chunk_size, len(messages))
+        batches = queue.Queue()
+        for start in range(chunk_start, chunk_end, batch_size):
+            batches.put(range(start, min(start + batch_size, chunk_end)))
+
+        threads = [
+            threading.Thread(target=_send_batches, args=(messages, batches, results, connection_factory))
+            for _ in range(min(workers, batches.qsize()))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        if on_chunk_sent is not None:
+            on_chunk_sent([i for i in range(chunk_start, chunk_end) if results[i]], chunk_end)
+
+    elapsed = time.perf_counter() - started
+    sent = sum(results)
+    return {
+        'sent': sent,
+        'failed': len(messages) - sent,
+        'elapsed_seconds': round(elapsed, 3),
+        'messages_per_second': round(len(messages) / elapsed, 1) if elapsed > 0 else 0.0,
+        'results': results,
+    }
+
+
+def _send_batches(messages, batches, results, connection_factory):
+    """Worker loop: drain the batch queue over a single open connection"""
+    connection = None
+    try:
+        while True:
+            try:
+                indexes = batches.get_nowait()
+            except queue.Empty:
+                return
+            try:
+                if connection is None:
+                    connection = connection_factory(fail_silently=False)
+                    connection.open()
+                connection.send_messages([messages[i] for i in indexes])
+                for i in indexes:
+                    results[i] = True
+            except Exception as e:
+                logger.warning('Batch send failed, retrying %d messages individually: %s', len(indexes), e)
+                _close(connection)
+                connection = None
+                for i in indexes:
+                    results[i] = _send_one(messages[i], connection_factory)
+    finally:
+        _close(connection)
+
+
+def _send_one(message, connection_factory):
+    try:
+        connection = connection_factory(fail_silently=False)
+        message.connection = connection
+        return bool(message.send())
+    except Exception:
+        logger.exception('Error sending email to %s', ', '.join(message.to))
+        return False
+    finally:
+        message.connection = None
+
+
+def _close(connection):
+    if connection is None:
+        return
+    try:
+        connection.close()
+    except Exception:
+        pass
@@ -0,0 +1,137 @@
+"""
+Utility functions for streaming NDJSON/CSV exports of services and vendors
+Rows are read with a server-side cursor (QuerySet.iterator) and written out one
+chunk at a time, so memory use does not grow with the size of the table.
+"""
+import csv
+import io
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.utils.encoders import JSONEncoder
+from vendormanagement.models import Vendor, Service
+from vendormanagement.serializers import ServiceRowSerializer, VENDOR_ROW_FIELDS
+
+
+DEFAULT_EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+SERVICE_EXPORT_FIELDS = [
+    'id', 'vendor', 'service_name', 'start_date', 'expiry_date', 'payment_due_date', 'amount',
+    'created_at', 'updated_at', 'status', 'vendor_name',
+]
+VENDOR_EXPORT_FIELDS = list(VENDOR_ROW_FIELDS) + ['active_services_count']
+
+# Date windows accepted by the exports, matching the ServiceViewSet list actions
+SERVICE_WINDOWS = {
+    'expiring_soon': lambda services, days, today: services.expiring_soon(days=days, today=today),
+    'payment_due_soon': lambda services, days, today: services.payment_due_soon(days=days, today=today),
+    'active': lambda services, days, today: services.active(today=today),
+    'expired': lambda services, days, today: services.expired(today=today),
+}
+
+
+def get_export_chunk_size(chunk_size=None):
+    """Resolve the chunk size from the argument or the EXPORT_CHUNK_SIZE setting"""
+    if chunk_size is None:
+        chunk_size = getattr(settings, 'EXPORT_CHUNK_SIZE', DEFAULT_EXPORT_CHUNK_SIZE)
+    return int(chunk_size)
+
+
+def filter_service_window(services, window=None, days=15, today=None):
+    """Restrict services to one of SERVICE_WINDOWS (no window: all services)"""
+    if window is None:
+        return services
+    if window not in SERVICE_WINDOWS:
+        raise ValueError(f"window must be one of: {', '.join(SERVICE_WINDOWS)}")
+    return SERVICE_WINDOWS[window](services, days, today or timezone.now().date())
+
+
+def export_service_rows(window=None, days=15, chunk_size=None):
+    """
+    Stream services in the ServiceSerializer shape, ordered by id. The query is built
+    (and the window checked) on the call, before any row is read.
+
+    Returns:
+        iterator: One service row (dict) at a time
+    """
+    today = timezone.now().date()
+    services = filter_service_window(Service.objects.all(), window, days, today)
+    rows = services.order_by('id').as_rows(today=today)
+    return (
+        ServiceRowSerializer.to_representation(row)
+        for row in rows.iterator(chunk_size=get_export_chunk_size(chunk_size))
+    )
+
+
+def export_vendor_rows(window=None, days=15, chunk_size=None):
+    """
+    Stream vendors with their active services count, ordered by id.
+    With a window, only vendors having at least one service in it are exported.
+    The query is built on the call, before any row is read.
+
+    Returns:
+        iterator: One vendor row (dict) at a time
+    """
+    today = timezone.now().date()
+    vendors = Vendor.objects.all()
+    if window is not None:
+        services = filter_service_window(Service.objects.all(), window, days, today)
+        vendors = vendors.filter(id__in=services.values('vendor'))
+    rows = vendors.annotate(
+        active_services_count=Count('services', filter=Q(services__expiry_date__gte=today))
+    ).order_by('id').values(*VENDOR_EXPORT_FIELDS)
+    return format_vendor_rows(rows.iterator(chunk_size=get_export_chunk_size(chunk_size)))
+
+
+def format_vendor_rows(rows):
+    datetime = serializers.DateTimeField().to_representation
+    for row in rows:
+        row['created_at'] = datetime(row['created_at'])
+        row['updated_at'] = datetime(row['updated_at'])
+        yield row
+
+
+def iter_chunks(rows, chunk_size):
+    """Group an iterable of rows into lists of at most chunk_size rows"""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def render_ndjson(rows, chunk_size=None):
+    """Yield newline-delimited JSON, one string per chunk of rows"""
+    encoder = JSONEncoder(ensure_ascii=False, separators=(',', ':'))
+    for chunk in iter_chunks(rows, get_export_chunk_size(chunk_size)):
+        yield ''.join(encoder.encode(row) + '\n' for row in chunk)
+
+
+def render_csv(rows, fields, chunk_size=None):
+    """Yield CSV with a header row, one string per chunk of rows"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields)
+    writer.writeheader()
+    for chunk in iter_chunks(rows, get_export_chunk_size(chunk_size)):
+        writer.writerows(chunk)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header only: the export is empty
+        yield buffer.getvalue()
+
+
+def render_export(rows, export_format, fields, chunk_size=None):
+    """Render rows in one of EXPORT_FORMATS as an iterator of strings"""
+    if export_format == 'csv':
+        return render_csv(rows, fields, chunk_size=chunk_size)
+    return render_ndjson(rows, chunk_size=chunk_size)
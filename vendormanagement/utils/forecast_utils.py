@@ -0,0 +1,143 @@
+"""
+Utility functions for the cash-flow and renewal forecast
+The payments and expiries of the forecast window are loaded with one query into NumPy
+arrays (day numbers, service counts and amounts in cents, summed per day by the
+database), and the day, week and month buckets are computed with array operations
+instead of per-row model methods.
+"""
+import calendar
+from datetime import date, timedelta
+
+import numpy as np
+from django.db.models import Count, Sum, Value
+from django.utils import timezone
+from vendormanagement.models import Service
+
+
+FORECAST_GRANULARITIES = ('day', 'week', 'month')
+FORECAST_MAX_MONTHS = 36
+
+
+def add_months(day, months):
+    """day + months, clamped to the end of the month (Jan 31 + 1 month = Feb 28/29)"""
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def load_daily_totals(services, start, end):
+    """
+    Services and amount (cents) per payment due day and per expiry day in [start, end),
+    from one query. The database sums each day on an index range scan, so at most two
+    rows per day of the window are transferred whatever the number of services.
+
+    Returns:
+        tuple: (payments, renewals), each an int64 array of (day number, services, cents) rows
+    """
+    def daily(field, kind):
+        return services.filter(**{f'{field}__gte': start, f'{field}__lt': end}).order_by().values(field).annotate(
+            kind=Value(kind),
+            services=Count('id'),
+            amount=Sum('amount'),
+        ).values_list('kind', field, 'services', 'amount')
+
+    rows = list(daily('payment_due_date', 0).union(daily('expiry_date', 1), all=True))
+    kinds = np.array([row[0] for row in rows], dtype=np.int64)
+    data = np.column_stack([
+        np.array([row[1] for row in rows], dtype='datetime64[D]').astype(np.int64),
+        np.array([row[2] for row in rows], dtype=np.int64),
+        # Daily sums are exact to far below a cent
+        np.rint(np.array([row[3] for row in rows], dtype=np.float64) * 100).astype(np.int64),
+    ])
+    return data[kinds == 0], data[kinds == 1]
+
+
+def bucket_starts(start, end, granularity):
+    """First day of every bucket overlapping [start, end), as datetime64[D]"""
+    start, end = np.datetime64(start, 'D'), np.datetime64(end, 'D')
+    if granularity == 'day':
+        return np.arange(start, end)
+    if granularity == 'week':
+        # Weeks start on Monday; 1970-01-01 was a Thursday
+        monday = start - (start.astype(np.int64) + 3) % 7
+        return np.arange(monday, end, 7)
+    return np.arange(start.astype('datetime64[M]'), (end - 1).astype('datetime64[M]') + 1).astype('datetime64[D]')
+
+
+def bucket_index(days, first_bucket, granularity):
+    """Bucket number of every day number in days, relative to the first bucket"""
+    if granularity == 'day':
+        return days - first_bucket.astype(np.int64)
+    if granularity == 'week':
+        return (days - first_bucket.astype(np.int64)) // 7
+    months = days.astype('datetime64[D]').astype('datetime64[M]').astype(np.int64)
+    return months - first_bucket.astype('datetime64[M]').astype(np.int64)
+
+
+def bucket_totals(daily, first_bucket, bucket_count, granularity):
+    """Services and amount (cents) per bucket of (day number, services, cents) rows"""
+    index = bucket_index(daily[:, 0], first_bucket, granularity)
+    counts = np.bincount(index, weights=daily[:, 1], minlength=bucket_count)
+    # float64 sums of integer cents are exact below 2**53 cents
+    cents = np.bincount(index, weights=daily[:, 2], minlength=bucket_count)
+    return np.rint(counts).astype(np.int64), np.rint(cents).astype(np.int64)
+
+
+def format_cents(cents):
+    cents = int(cents)
+    return f'{cents // 100}.{cents % 100:02d}' if cents >= 0 else f'-{format_cents(-cents)}'
+
+
+def get_service_forecast(months=12, granularity='month', vendor_ids=None, today=None):
+    """
+    Projected outflows (payments due) and renewals (services expiring, at their current
+    amount) per day, week or month from today to today + months
+
+    Returns:
+        dict: Window, totals and one entry per bucket with payment and renewal counts
+              and amounts (strings with two decimals) and the cumulative outflow
+    """
+    if granularity not in FORECAST_GRANULARITIES:
+        raise ValueError(f"granularity must be one of: {', '.join(FORECAST_GRANULARITIES)}")
+    if not 1 <= months <= FORECAST_MAX_MONTHS:
+        raise ValueError(f'months must be between 1 and {FORECAST_MAX_MONTHS}')
+    start = today or timezone.now().date()
+    end = add_months(start, months)
+
+    services = Service.objects.all()
+    if vendor_ids:
+        services = services.filter(vendor_id__in=vendor_ids)
+    daily_payments, daily_renewals = load_daily_totals(services, start, end)
+
+    starts = bucket_starts(start, end, granularity)
+    payments, payment_cents = bucket_totals(daily_payments, starts[0], len(starts), granularity)
+    renewals, renewal_cents = bucket_totals(daily_renewals, starts[0], len(starts), granularity)
+    cumulative_cents = np.cumsum(payment_cents)
+
+    labels = np.datetime_as_string(starts, unit='M' if granularity == 'month' else 'D').tolist()
+    return {
+        'start': start.isoformat(),
+        'end': (end - timedelta(days=1)).isoformat(),
+        'months': months,
+        'granularity': granularity,
+        'totals': {
+            'payments': int(payments.sum()),
+            'payment_amount': format_cents(payment_cents.sum()),
+            'renewals': int(renewals.sum()),
+            'renewal_amount': format_cents(renewal_cents.sum()),
+        },
+        'periods': [
+            {
+                'period': label,
+                'payments': payment_count,
+                'payment_amount': format_cents(payment_amount),
+                'renewals': renewal_count,
+                'renewal_amount': format_cents(renewal_amount),
+                'cumulative_payment_amount': format_cents(cumulative_amount),
+            }
+            for label, payment_count, payment_amount, renewal_count, renewal_amount, cumulative_amount in zip(
+                labels, payments.tolist(), payment_cents.tolist(), renewals.tolist(), renewal_cents.tolist(),
+                cumulative_cents.tolist()
+            )
+        ],
+    }
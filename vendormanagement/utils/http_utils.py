@@ -0,0 +1,68 @@
+"""
+Utility functions for HTTP conditional requests
+Validators (ETag / Last-Modified) are derived from one aggregate query, so a client
+revalidating an unchanged resource gets a 304 without anything being serialized.
+"""
+import hashlib
+from calendar import timegm
+
+from django.db.models import F, Func, Subquery
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+
+
+def latest_updated_at():
+    # Plain SQL functions rather than aggregates, so they add no GROUP BY to the subqueries
+    return Func(F('updated_at'), function='MAX')
+
+
+def row_count():
+    return Func(F('pk'), function='COUNT')
+
+
+def queryset_validators(*querysets, extra=()):
+    """
+    ETag and Last-Modified of the rows of querysets: the latest updated_at and the row
+    count of each, so deletions change the ETag too. All of them come from one query:
+    the MAX/COUNT of the first queryset with those of the others as scalar subqueries.
+
+    Args:
+        *querysets: Rows the representation is built from (the models need updated_at)
+        extra: Anything else the representation depends on (e.g. today's date)
+
+    Returns:
+        tuple: (weak ETag, last modified datetime or None when there are no rows)
+    """
+    first, *others = [queryset.order_by() for queryset in querysets]
+    values = {'latest_0': latest_updated_at(), 'count_0': row_count()}
+    for i, queryset in enumerate(others, 1):
+        values[f'latest_{i}'] = Subquery(queryset.values(value=latest_updated_at()))
+        values[f'count_{i}'] = Subquery(queryset.values(value=row_count()))
+    row = first.values(**values).get()
+
+    parts, last_modified = [], None
+    for i in range(len(querysets)):
+        latest = row[f'latest_{i}']
+        parts += [row[f'count_{i}'], latest.isoformat() if latest else '']
+        if latest and (last_modified is None or latest > last_modified):
+            last_modified = latest
+    key = ':'.join(str(part) for part in (*parts, *extra))
+    return f'W/"{hashlib.md5(key.encode(), usedforsecurity=False).hexdigest()}"', last_modified
+
+
+def conditional_response(request, etag, last_modified, build_response, cache_control='private, no-cache'):
+    """
+    304 Not Modified when the request's If-None-Match / If-Modified-Since match the
+    validators, otherwise build_response(). Both carry ETag, Last-Modified and
+    Cache-Control (no-cache: browsers keep the body and revalidate before reusing it).
+    """
+    timestamp = timegm(last_modified.utctimetuple()) if last_modified else None
+    response = get_conditional_response(request, etag=etag, last_modified=timestamp)
+    if response is None:
+        response = build_response()
+    if response.status_code in (200, 304):
+        response.headers['ETag'] = etag
+        if timestamp is not None:
+            response.headers['Last-Modified'] = http_date(timestamp)
+        response.headers['Cache-Control'] = cache_control
+    return response
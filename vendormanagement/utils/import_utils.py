@@ -0,0 +1,252 @@
+"""
+Utility functions for streaming bulk imports of vendors and services from CSV files
+"""
+import csv
+import time
+from itertools import islice
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from vendormanagement.models import Vendor, Service, STATUS_SNAPSHOT_FIELDS
+from vendormanagement.utils.cache_utils import invalidate_aggregates
+from vendormanagement.utils.spend_utils import refresh_spend_rollups, spend_key
+
+
+DEFAULT_IMPORT_BATCH_SIZE = 1000
+
+VENDOR_IMPORT_FIELDS = ['name', 'contact_person', 'email', 'phone', 'status']
+SERVICE_IMPORT_FIELDS = ['service_name', 'start_date', 'expiry_date', 'payment_due_date', 'amount']
+SERVICE_UPDATE_FIELDS = ['expiry_date', 'payment_due_date', 'amount', 'updated_at', *STATUS_SNAPSHOT_FIELDS]
+
+
+class CSVFileError(ValueError):
+    """The upload is not a readable UTF-8 CSV file"""
+
+
+def get_import_batch_size(batch_size=None):
+    """Resolve the batch size from the argument or the IMPORT_BATCH_SIZE setting"""
+    if batch_size is None:
+        batch_size = getattr(settings, 'IMPORT_BATCH_SIZE', DEFAULT_IMPORT_BATCH_SIZE)
+    batch_size = int(batch_size)
+    if batch_size < 1:
+        raise ValueError('batch_size must be a positive integer')
+    return batch_size
+
+
+def iter_csv_batches(csv_file, batch_size):
+    """
+    Stream a CSV file as lists of (line_number, row) tuples without
+    reading the whole file into memory. Raises CSVFileError on undecodable
+    or malformed input; earlier batches stay written.
+    """
+    reader = csv.DictReader(csv_file)
+
+    def rows():
+        try:
+            for row in reader:
+                yield reader.line_num, row
+        except UnicodeDecodeError:
+            raise CSVFileError(f'Line {reader.line_num + 1}: the file is not UTF-8 encoded text') from None
+        except csv.Error as e:
+            raise CSVFileError(f'Line {reader.line_num}: {e}') from None
+
+    rows = rows()
+    while True:
+        batch = list(islice(rows, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def clean_row(model, field_names, row):
+    """
+    Validate the raw CSV values of a row against the model fields.
+
+    Returns:
+        tuple: (cleaned values dict, errors dict keyed by field name)
+    """
+    values = {}
+    errors = {}
+    for name in field_names:
+        raw = row.get(name)
+        raw = raw.strip() if raw is not None else ''
+        try:
+            values[name] = model._meta.get_field(name).clean(raw, None)
+        except ValidationError as e:
+            errors[name] = e.messages
+    return values, errors
+
+
+class ImportReport:
+    """Collects row counts, throughput and per-row validation errors for an import"""
+
+    def __init__(self):
+        self.rows_processed = 0
+        self.rows_written = 0
+        self.rows_failed = 0
+        self.errors = []
+        self.max_errors = getattr(settings, 'IMPORT_MAX_REPORTED_ERRORS', 1000)
+        self.started = time.perf_counter()
+
+    def add_error(self, line, errors):
+        self.rows_failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'line': line, 'errors': errors})
+
+    def as_dict(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            'rows_processed': self.rows_processed,
+            'rows_written': self.rows_written,
+            'rows_failed': self.rows_failed,
+            'elapsed_seconds': round(elapsed, 3),
+            'rows_per_second': round(self.rows_processed / elapsed, 1) if elapsed > 0 else 0.0,
+            'errors': self.errors,
+        }
+
+
+def import_vendors(csv_file, batch_size=None):
+    """
+    Upsert vendors from a CSV file (columns: name, contact_person, email, phone, status).
+    Existing vendors are matched on their unique name and updated in place.
+
+    Args:
+        csv_file: Text file object with a CSV header row
+        batch_size: Rows written per bulk upsert/transaction
+
+    Returns:
+        dict: Import summary with counts, rows/sec and per-row errors
+    """
+    batch_size = get_import_batch_size(batch_size)
+    report = ImportReport()
+
+    for batch in iter_csv_batches(csv_file, batch_size):
+        # Deduplicate names inside the batch; the last row wins, like a sequential import
+        vendors = {}
+        for line, row in batch:
+            report.rows_processed += 1
+            values, errors = clean_row(Vendor, VENDOR_IMPORT_FIELDS, row)
+            if errors:
+                report.add_error(line, errors)
+                continue
+            vendors[values['name']] = Vendor(**values)
+
+        if vendors:
+            with transaction.atomic():
+                Vendor.objects.bulk_create(
+                    vendors.values(),
+                    batch_size=batch_size,
+                    update_conflicts=True,
+                    unique_fields=['name'],
+                    update_fields=['contact_person', 'email', 'phone', 'status', 'updated_at'],
+                )
+            report.rows_written += len(vendors)
+            # bulk_create sends no post_save signals
+            invalidate_aggregates()
+
+    return report.as_dict()
+
+
+def service_import_key(service):
+    """The natural key services are matched on when importing"""
+    return service.vendor_id, service.service_name, service.start_date
+
+
+def existing_services(keys):
+    """
+    Load the stored services matching the given import keys with one query
+
+    Returns:
+        dict: {import key: (id, payment due date)}; the oldest of any duplicates wins
+    """
+    keys = set(keys)
+    candidates = Service.objects.filter(
+        vendor_id__in={vendor_id for vendor_id, _, _ in keys},
+        service_name__in={name for _, name, _ in keys},
+        start_date__in={start_date for _, _, start_date in keys},
+    ).order_by('-id').values_list('id', 'vendor_id', 'service_name', 'start_date', 'payment_due_date')
+    return {
+        (vendor_id, service_name, start_date): (pk, payment_due_date)
+        for pk, vendor_id, service_name, start_date, payment_due_date in candidates
+        if (vendor_id, service_name, start_date) in keys
+    }
+
+
+def import_services(csv_file, batch_size=None, vendor_ids=None):
+    """
+    Upsert services from a CSV file (columns: vendor, service_name, start_date,
+    expiry_date, payment_due_date, amount). The vendor column holds the vendor name.
+    Existing services are matched on (vendor, service_name, start_date) and their
+    dates and amount updated in place, so re-importing a file adds no duplicates.
+
+    Args:
+        csv_file: Text file object with a CSV header row
+        batch_size: Rows written per bulk upsert/transaction
+        vendor_ids: Optional prebuilt {vendor name: vendor id} map
+
+    Returns:
+        dict: Import summary with counts, rows/sec and per-row errors
+    """
+    batch_size = get_import_batch_size(batch_size)
+    report = ImportReport()
+
+    # One query resolves every vendor name used by the file
+    if vendor_ids is None:
+        vendor_ids = dict(Vendor.objects.values_list('name', 'id'))
+
+    today = timezone.now().date()
+    for batch in iter_csv_batches(csv_file, batch_size):
+        # Deduplicate on the natural key inside the batch; the last row wins
+        services = {}
+        for line, row in batch:
+            report.rows_processed += 1
+            values, errors = clean_row(Service, SERVICE_IMPORT_FIELDS, row)
+            vendor_name = (row.get('vendor') or '').strip()
+            vendor_id = vendor_ids.get(vendor_name)
+            if vendor_id is None:
+                errors['vendor'] = [f"Vendor '{vendor_name}' does not exist."]
+            if errors:
+                report.add_error(line, errors)
+                continue
+            service = Service(vendor_id=vendor_id, **values)
+            # bulk_create bypasses Service.save
+            service.refresh_status_snapshot(today)
+            services[service_import_key(service)] = service
+
+        if services:
+            with transaction.atomic():
+                spend_keys = {spend_key(service) for service in services.values()}
+                to_update = []
+                for key, (pk, payment_due_date) in existing_services(services).items():
+                    service = services.pop(key)
+                    service.pk = pk
+                    # bulk_update does not apply auto_now
+                    service.updated_at = timezone.now()
+                    to_update.append(service)
+                    # The month the service leaves is refreshed as well
+                    spend_keys.add((service.vendor_id, payment_due_date))
+                Service.objects.bulk_create(services.values(), batch_size=batch_size)
+                Service.objects.bulk_update(to_update, SERVICE_UPDATE_FIELDS, batch_size=batch_size)
+                refresh_spend_rollups(spend_keys)
+            report.rows_written += len(services) + len(to_update)
+            # bulk_create/bulk_update send no post_save signals
+            invalidate_aggregates()
+
+    return report.as_dict()
+
+
+def import_csv_files(vendor_file=None, service_file=None, batch_size=None):
+    """
+    Import vendors first (if given) and then services (if given)
+
+    Returns:
+        dict: {'vendors': summary, 'services': summary} for the files provided
+    """
+    result = {}
+    if vendor_file is not None:
+        result['vendors'] = import_vendors(vendor_file, batch_size=batch_size)
+    if service_file is not None:
+        result['services'] = import_services(service_file, batch_size=batch_size)
+    return result
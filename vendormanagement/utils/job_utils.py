@@ -0,0 +1,140 @@
+"""
+Utility functions for the database-backed background job queue
+Jobs are queued by the API and executed by the run_jobs management command
+"""
+import time
+import traceback
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import close_old_connections, connection, transaction
+from django.utils import timezone
+from vendormanagement.models import Job
+from vendormanagement.utils.reminder_utils import check_and_send_reminders
+
+
+DEFAULT_JOB_STALE_SECONDS = 600
+
+
+def run_check_reminders_job(job, progress):
+    """Job handler for the reminder scan-and-email run"""
+    return check_and_send_reminders(
+        days=job.params.get('days', 15),
+        digest=job.params.get('digest', False),
+        progress_callback=progress,
+    )
+
+
+# Job kind -> handler(job, progress) returning a JSON-serializable result
+JOB_HANDLERS = {
+    'check_reminders': run_check_reminders_job,
+}
+
+
+def enqueue_job(kind, params=None, user=None):
+    """
+    Queue a job for the worker
+
+    Args:
+        kind: Key of JOB_HANDLERS
+        params: JSON-serializable job parameters
+        user: User who queued the job
+
+    Returns:
+        Job: The queued job
+    """
+    if kind not in JOB_HANDLERS:
+        raise ValueError(f"Unknown job kind '{kind}'")
+    return Job.objects.create(
+        kind=kind,
+        params=params or {},
+        created_by=user if user is not None and user.is_authenticated else None,
+    )
+
+
+def claim_next_job():
+    """
+    Atomically move the oldest queued job to running and return it (None if the queue is empty).
+    The conditional UPDATE guarantees a job is claimed by only one worker.
+    """
+    with transaction.atomic():
+        queued = Job.objects.filter(status='queued').order_by('created_at', 'id')
+        if connection.features.has_select_for_update_skip_locked:
+            queued = queued.select_for_update(skip_locked=True)
+        job = queued.first()
+        if job is None:
+            return None
+        now = timezone.now()
+        claimed = Job.objects.filter(pk=job.pk, status='queued').update(
+            status='running', started_at=now, updated_at=now
+        )
+    if not claimed:
+        return None
+    job.refresh_from_db()
+    return job
+
+
+def run_job(job):
+    """
+    Execute a claimed job, storing progress, the result summary or the error
+
+    Returns:
+        Job: The finished job
+    """
+    def progress(done, total):
+        # Also bumps updated_at, which serves as the worker heartbeat
+        Job.objects.filter(pk=job.pk).update(progress_done=done, progress_total=total, updated_at=timezone.now())
+
+    try:
+        result = JOB_HANDLERS[job.kind](job, progress)
+    except Exception:
+        job.status = 'failed'
+        job.error = traceback.format_exc()
+    else:
+        job.status = 'succeeded'
+        job.result = result
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'result', 'error', 'finished_at', 'updated_at'])
+    return job
+
+
+def requeue_stale_jobs(stale_seconds=None):
+    """
+    Put back running jobs whose worker stopped reporting progress (e.g. it crashed).
+    Reminder jobs are safe to re-run because sent reminders are skipped via the ledger.
+
+    Returns:
+        int: Number of jobs requeued
+    """
+    if stale_seconds is None:
+        stale_seconds = getattr(settings, 'JOB_STALE_SECONDS', DEFAULT_JOB_STALE_SECONDS)
+    cutoff = timezone.now() - timedelta(seconds=stale_seconds)
+    return Job.objects.filter(status='running', updated_at__lt=cutoff).update(status='queued', started_at=None)
+
+
+def work(once=False, poll_interval=2.0, max_jobs=None, stdout=None):
+    """
+    Worker loop: claim and run jobs until the queue is empty (once=True),
+    max_jobs have run, or forever
+
+    Returns:
+        int: Number of jobs run
+    """
+    jobs_run = 0
+    requeue_stale_jobs()
+    while max_jobs is None or jobs_run < max_jobs:
+        if not connection.in_atomic_block:
+            # What the request cycle does for the web processes: drop a connection that is
+            # past CONN_MAX_AGE or broken (e.g. a restarted database) before using it
+            close_old_connections()
+        job = claim_next_job()
+        if job is None:
+            if once:
+                break
+            time.sleep(poll_interval)
+            continue
+        job = run_job(job)
+        jobs_run += 1
+        if stdout is not None:
+            stdout.write(f'Job {job.pk} ({job.kind}) {job.status}')
+    return jobs_run
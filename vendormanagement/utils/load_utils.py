@@ -0,0 +1,69 @@
+"""
+Utility functions for generating HTTP load against a local server
+Standard library only (no Django imports), so the load can be generated from a
+separate process that does not compete with the server for the GIL.
+"""
+import asyncio
+import statistics
+import time
+
+
+async def get(host, port, path, headers):
+    """One GET over a new connection; returns the status code"""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        lines = [f'GET {path} HTTP/1.1', f'Host: {host}:{port}', 'Connection: close']
+        lines += [f'{name}: {value}' for name, value in headers.items()]
+        writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1'))
+        await writer.drain()
+        response = await reader.read()
+        return int(response.split(b' ', 2)[1])
+    finally:
+        writer.close()
+
+
+async def generate_load(host, port, path, headers, concurrency, requests):
+    latencies = []
+    errors = 0
+    remaining = iter(range(requests))
+
+    async def client():
+        nonlocal errors
+        for _ in remaining:
+            started = time.perf_counter()
+            try:
+                status = await get(host, port, path, headers)
+            except (OSError, ValueError, IndexError):
+                status = None
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += status != 200
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def run_load(host, port, path, headers=None, concurrency=64, requests=1000):
+    """
+    Send requests GETs of path with at most concurrency in flight
+
+    Returns:
+        dict: Throughput (requests/s), latency percentiles in milliseconds and the
+              number of failed (non-200) requests
+    """
+    latencies, errors, elapsed = asyncio.run(
+        generate_load(host, port, path, headers or {}, concurrency, requests)
+    )
+    latencies.sort()
+
+    def percentile(p):
+        return round(latencies[min(len(latencies) - 1, int(len(latencies) * p))], 2)
+
+    return {
+        'requests_per_second': round(len(latencies) / elapsed, 1),
+        'median_ms': round(statistics.median(latencies), 2),
+        'p95_ms': percentile(0.95),
+        'p99_ms': percentile(0.99),
+        'max_ms': round(latencies[-1], 2),
+        'errors': errors,
+    }
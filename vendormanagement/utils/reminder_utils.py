@@ -3,96 +3,229 @@ Utility functions for sending reminders about expiring services and payment due
 """
 from django.utils import timezone
 from datetime import timedelta
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage
 from django.conf import settings
-from vendormanagement.models import Service
+from django.template.defaultfilters import pluralize
+from django.template.loader import get_template, render_to_string
+from django.db.models import Exists, OuterRef
+from vendormanagement.models import Service, ReminderLog, STATUS_COLORS
+from vendormanagement.utils.dispatch_utils import dispatch_messages
 
 
-def check_and_send_reminders(days=15):
+# Messages sent between ledger writes; a crashed run re-sends at most one chunk
+DEFAULT_REMINDER_CHECKPOINT_SIZE = 500
+
+
+def check_and_send_reminders(days=15, workers=None, batch_size=None, digest=False, progress_callback=None):
     """
     Check services/contracts daily and send email notifications for those
     nearing expiry or payment due within specified days.
     
+    Every reminder sent is recorded in the ReminderLog ledger, keyed by
+    (service, reminder type, target date), so repeated or retried runs skip
+    reminders that were already sent. The ledger is written after each chunk
+    of messages, so a crashed run resumes where it stopped.
+    
     Args:
         days: Number of days ahead to check (default: 15)
+        workers: Number of concurrent sending threads (default: REMINDER_EMAIL_WORKERS setting)
+        batch_size: Messages sent per SMTP connection round (default: REMINDER_EMAIL_BATCH_SIZE setting)
+        digest: Send one message per vendor and one summary to ADMIN_EMAIL
+            instead of one message per service
+        progress_callback: Optional callable(messages_processed, messages_total)
     
     Returns:
         dict: Summary of reminders sent
     """
     today = timezone.now().date()
-    days_ahead = today + timedelta(days=days)
     
-    # Find services expiring soon
-    expiring_services = Service.objects.filter(
-        expiry_date__gte=today,
-        expiry_date__lte=days_ahead,
-    ).select_related('vendor')
-    
-    # Find services with payment due soon
-    payment_due_services = Service.objects.filter(
-        payment_due_date__gte=today,
-        payment_due_date__lte=days_ahead,
-    ).select_related('vendor')
-    
-    # Combine and deduplicate (a service might be both expiring and payment due)
-    all_services = {}
-    for service in expiring_services:
-        all_services[service.id] = {
+    # Services expiring soon or with payment due soon, in one query
+    # (a service might be both expiring and payment due), with ledger flags
+    flagged_services = (
+        Service.objects.expiring_soon(days=days, today=today)
+        | Service.objects.payment_due_soon(days=days, today=today)
+    ).select_related('vendor').annotate(
+        expiry_notified=Exists(ReminderLog.objects.filter(
+            service=OuterRef('pk'), reminder_type='expiry', target_date=OuterRef('expiry_date'),
+        )),
+        payment_notified=Exists(ReminderLog.objects.filter(
+            service=OuterRef('pk'), reminder_type='payment', target_date=OuterRef('payment_due_date'),
+        )),
+    ).order_by('vendor_id', 'expiry_date', 'id')
+    
+    days_ahead = today + timedelta(days=days)
+    total_services = 0
+    expiring_count = 0
+    payment_due_count = 0
+    reminders_skipped = 0
+    entries = []
+    for service in flagged_services:
+        in_expiry_window = today <= service.expiry_date <= days_ahead
+        in_payment_window = today <= service.payment_due_date <= days_ahead
+        total_services += 1
+        expiring_count += in_expiry_window
+        payment_due_count += in_payment_window
+        reminders_skipped += (in_expiry_window and service.expiry_notified) \
+            + (in_payment_window and service.payment_notified)
+        
+        entry = {
             'service': service,
-            'expiring': True,
-            'payment_due': False
+            'is_expiring': in_expiry_window and not service.expiry_notified,
+            'is_payment_due': in_payment_window and not service.payment_notified,
+            'days_until_expiry': (service.expiry_date - today).days,
+            'days_until_payment': (service.payment_due_date - today).days,
         }
+        if entry['is_expiring'] or entry['is_payment_due']:
+            entries.append(entry)
+    
+    if digest:
+        messages = build_reminder_digests(entries, days=days, today=today)
+        # Vendor digests come first, in the same order as their entries are grouped
+        message_entries = list(group_entries_by_vendor(entries).values())
+    else:
+        messages = [
+            build_service_reminder(entry['service'], entry['is_expiring'], entry['is_payment_due'], today=today)
+            for entry in entries
+        ]
+        message_entries = [[entry] for entry in entries]
+    
+    def record_sent(indexes, processed):
+        logs = [
+            log
+            for i in indexes if i < len(message_entries)
+            for entry in message_entries[i]
+            for log in build_reminder_logs(entry)
+        ]
+        ReminderLog.objects.bulk_create(logs, ignore_conflicts=True)
+        if progress_callback is not None:
+            progress_callback(processed, len(messages))
+    
+    if progress_callback is not None:
+        progress_callback(0, len(messages))
     
-    for service in payment_due_services:
-        if service.id in all_services:
-            all_services[service.id]['payment_due'] = True
-        else:
-            all_services[service.id] = {
-                'service': service,
-                'expiring': False,
-                'payment_due': True
-            }
-    
-    # Send emails
-    emails_sent = 0
-    emails_failed = 0
-    
-    for service_data in all_services.values():
-        service = service_data['service']
-        try:
-            send_service_reminder(service, service_data['expiring'], service_data['payment_due'])
-            emails_sent += 1
-        except Exception as e:
-            print(f"Failed to send email for service {service.id}: {str(e)}")
-            emails_failed += 1
+    # Send all messages in batches over pooled connections, checkpointing the ledger per chunk
+    result = dispatch_messages(
+        messages,
+        workers=workers,
+        batch_size=batch_size,
+        chunk_size=getattr(settings, 'REMINDER_CHECKPOINT_SIZE', DEFAULT_REMINDER_CHECKPOINT_SIZE),
+        on_chunk_sent=record_sent,
+    )
     
     return {
-        'total_services_flagged': len(all_services),
-        'emails_sent': emails_sent,
-        'emails_failed': emails_failed,
-        'expiring_count': len(expiring_services),
-        'payment_due_count': len(payment_due_services)
+        'total_services_flagged': total_services,
+        'emails_sent': result['sent'],
+        'emails_failed': result['failed'],
+        'expiring_count': expiring_count,
+        'payment_due_count': payment_due_count,
+        'reminders_skipped': reminders_skipped,
+        'digest': digest,
+        'elapsed_seconds': result['elapsed_seconds'],
+        'emails_per_second': result['messages_per_second'],
     }
 
 
-def send_service_reminder(service, is_expiring=False, is_payment_due=False):
+def build_reminder_logs(entry):
+    """Ledger rows for the reminders a flagged service entry was notified about"""
+    service = entry['service']
+    logs = []
+    if entry['is_expiring']:
+        logs.append(ReminderLog(service=service, reminder_type='expiry', target_date=service.expiry_date))
+    if entry['is_payment_due']:
+        logs.append(ReminderLog(service=service, reminder_type='payment', target_date=service.payment_due_date))
+    return logs
+
+
+def group_entries_by_vendor(entries):
+    """Group flagged service entries by vendor id, preserving order"""
+    vendor_entries = {}
+    for entry in entries:
+        vendor_entries.setdefault(entry['service'].vendor_id, []).append(entry)
+    return vendor_entries
+
+
+def build_reminder_digests(entries, days=15, today=None):
     """
-    Send email reminder for a service
+    Build one digest message per vendor listing all of its flagged services,
+    plus one summary message for ADMIN_EMAIL (if configured)
+    
+    Args:
+        entries: Flagged service dicts (service, is_expiring, is_payment_due, days_until_*)
+        days: Number of days ahead that was checked
+        today: Date the reminders are computed for (default: today)
+    
+    Returns:
+        list: Unsent EmailMessage instances
+    """
+    today = today or timezone.now().date()
+    from_email = getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@vendormanagement.com')
+    
+    # Group flagged services by vendor
+    vendor_entries = group_entries_by_vendor(entries)
+    
+    # Compile each template once and render it per vendor
+    vendor_template = get_template('vendormanagement/emails/vendor_reminder_digest.txt')
+    messages = []
+    summary_rows = []
+    for grouped in vendor_entries.values():
+        vendor = grouped[0]['service'].vendor
+        body = vendor_template.render({'vendor': vendor, 'entries': grouped, 'days': days})
+        messages.append(EmailMessage(
+            subject=f"Vendor Management Alert: {len(grouped)} service{pluralize(len(grouped))} need attention",
+            body=body,
+            from_email=from_email,
+            to=[vendor.email],
+        ))
+        summary_rows.append({
+            'vendor': vendor,
+            'expiring_count': sum(entry['is_expiring'] for entry in grouped),
+            'payment_due_count': sum(entry['is_payment_due'] for entry in grouped),
+            'payment_due_amount': sum(entry['service'].amount for entry in grouped if entry['is_payment_due']),
+        })
+    
+    admin_email = getattr(settings, 'ADMIN_EMAIL', None)
+    if admin_email and entries:
+        body = render_to_string('vendormanagement/emails/admin_reminder_digest.txt', {
+            'today': today,
+            'days': days,
+            'total_services': len(entries),
+            'expiring_count': sum(entry['is_expiring'] for entry in entries),
+            'payment_due_count': sum(entry['is_payment_due'] for entry in entries),
+            'vendors': summary_rows,
+        })
+        messages.append(EmailMessage(
+            subject=f"Vendor Management Reminder Summary: {len(entries)} services flagged",
+            body=body,
+            from_email=from_email,
+            to=[admin_email],
+        ))
+    
+    return messages
+
+
+def build_service_reminder(service, is_expiring=False, is_payment_due=False, today=None):
+    """
+    Build the email reminder for a service
     
     Args:
         service: Service instance
         is_expiring: Boolean indicating if service is expiring soon
         is_payment_due: Boolean indicating if payment is due soon
+        today: Date the reminder is computed for (default: today)
+    
+    Returns:
+        EmailMessage: The unsent message
     """
     vendor = service.vendor
+    today = today or timezone.now().date()
     
     # Build subject
     subjects = []
     if is_expiring:
-        days_until = (service.expiry_date - timezone.now().date()).days
+        days_until = (service.expiry_date - today).days
         subjects.append(f"Service Expiring in {days_until} days")
     if is_payment_due:
-        days_until = (service.payment_due_date - timezone.now().date()).days
+        days_until = (service.payment_due_date - today).days
         subjects.append(f"Payment Due in {days_until} days")
     
     subject = f"Vendor Management Alert: {' & '.join(subjects)}"
@@ -106,14 +239,14 @@ def send_service_reminder(service, is_expiring=False, is_payment_due=False):
     ]
     
     if is_expiring:
-        days_until = (service.expiry_date - timezone.now().date()).days
+        days_until = (service.expiry_date - today).days
         message_parts.extend([
             f"⚠️ EXPIRY ALERT: This service will expire on {service.expiry_date.strftime('%Y-%m-%d')} ({days_until} days from now).",
             ""
         ])
     
     if is_payment_due:
-        days_until = (service.payment_due_date - timezone.now().date()).days
+        days_until = (service.payment_due_date - today).days
         message_parts.extend([
             f"💰 PAYMENT DUE: Payment of ${service.amount} is due on {service.payment_due_date.strftime('%Y-%m-%d')} ({days_until} days from now).",
             ""
@@ -135,7 +268,6 @@ def send_service_reminder(service, is_expiring=False, is_payment_due=False):
     
     message = "\n".join(message_parts)
     
-    # Send email
     # In production, you might want to send to multiple recipients
     recipient_list = [vendor.email]
     
@@ -144,38 +276,30 @@ def send_service_reminder(service, is_expiring=False, is_payment_due=False):
     if admin_email:
         recipient_list.append(admin_email)
     
-    try:
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@vendormanagement.com'),
-            recipient_list=recipient_list,
-            fail_silently=False,
-        )
-    except Exception as e:
-        # Log error but don't crash
-        print(f"Error sending email to {vendor.email}: {str(e)}")
-        raise
+    return EmailMessage(
+        subject=subject,
+        body=message,
+        from_email=getattr(settings, 'DEFAULT_FROM_EMAIL', 'noreply@vendormanagement.com'),
+        to=recipient_list,
+    )
 
 
 def get_services_with_color_codes():
     """
-    Get all services with their color codes for flagging
-    Returns services grouped by color code
+    Get services grouped by color code for flagging
+    Returns a lazy queryset per color; nothing is fetched until a group is evaluated
     """
-    services = Service.objects.select_related('vendor').all()
-    
-    color_groups = {
-        'red': [],
-        'orange': [],
-        'yellow': [],
-        'green': [],
-        'gray': []
+    today = timezone.now().date()
+    use_snapshot = Service.objects.snapshot_is_current(today)
+    services = Service.objects.select_related('vendor').order_by('expiry_date', 'id')
+    return {
+        color: services.status_color(color, today=today, use_snapshot=use_snapshot)
+        for color in STATUS_COLORS
     }
-    
-    for service in services:
-        color = service.get_status_color()
-        color_groups[color].append(service)
-    
-    return color_groups
 
+
+def get_status_color_counts():
+    """
+    Get the number of services per color code from one aggregate query
+    """
+    return Service.objects.status_color_counts()
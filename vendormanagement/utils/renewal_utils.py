@@ -0,0 +1,140 @@
+"""
+Utility functions for rolling service dates forward in bulk (contract renewals)
+Matching services are shifted with a single UPDATE ... SET expression; nothing is
+loaded into Python, neither for the renewal nor for its dry run.
+"""
+from django.db import NotSupportedError, transaction
+from django.db.models import Count, DateField, F, Func, Max, Min, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+from vendormanagement.models import Service, status_snapshot_values
+from vendormanagement.utils.cache_utils import invalidate_aggregates
+from vendormanagement.utils.spend_utils import refresh_spend_rollups
+
+
+RENEWAL_DATE_FIELDS = ('expiry_date', 'payment_due_date')
+
+
+class ShiftDate(Func):
+    """
+    date + N months + N days, evaluated by the database. Like dateutil's relativedelta,
+    adding months clamps to the end of the month (Jan 31 + 1 month = Feb 28/29).
+    """
+    output_field = DateField()
+
+    def __init__(self, expression, months=0, days=0, **extra):
+        self.months = int(months)
+        self.days = int(days)
+        super().__init__(expression, **extra)
+
+    def as_sql(self, compiler, connection, **extra_context):
+        raise NotSupportedError(f'ShiftDate is not implemented for {connection.vendor}')
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        date_sql, date_params = compiler.compile(self.source_expressions[0])
+        sql, params = date_sql, list(date_params)
+        if self.months:
+            # SQLite's '+N months' overflows into the next month, so take the smaller of
+            # the same day N months on and the last day of that month
+            sql = (
+                f"MIN("
+                f"date({date_sql}, 'start of month', %s, '+' || (CAST(substr({date_sql}, 9, 2) AS INTEGER) - 1) || ' days'), "
+                f"date({date_sql}, 'start of month', %s, '-1 day'))"
+            )
+            params = [
+                *date_params, f'{self.months:+d} months', *date_params,
+                *date_params, f'{self.months + 1:+d} months',
+            ]
+        if self.days:
+            sql = f'date({sql}, %s)'
+            params.append(f'{self.days:+d} days')
+        return sql, params
+
+    def as_postgresql(self, compiler, connection, **extra_context):
+        date_sql, date_params = compiler.compile(self.source_expressions[0])
+        return f'CAST({date_sql} + make_interval(months => %s, days => %s) AS date)', [
+            *date_params, self.months, self.days
+        ]
+
+    def as_mysql(self, compiler, connection, **extra_context):
+        date_sql, date_params = compiler.compile(self.source_expressions[0])
+        return f'DATE_ADD(DATE_ADD({date_sql}, INTERVAL %s MONTH), INTERVAL %s DAY)', [
+            *date_params, self.months, self.days
+        ]
+
+
+def filter_renewal_services(vendor=None, expiry_from=None, expiry_to=None, amount_min=None, amount_max=None):
+    """Services matching the renewal filters (all optional, bounds inclusive)"""
+    services = Service.objects.all()
+    if vendor is not None:
+        services = services.filter(vendor_id=vendor)
+    if expiry_from is not None:
+        services = services.filter(expiry_date__gte=expiry_from)
+    if expiry_to is not None:
+        services = services.filter(expiry_date__lte=expiry_to)
+    if amount_min is not None:
+        services = services.filter(amount__gte=amount_min)
+    if amount_max is not None:
+        services = services.filter(amount__lte=amount_max)
+    return services
+
+
+def renew_services(months=0, days=0, fields=RENEWAL_DATE_FIELDS, dry_run=False, **filters):
+    """
+    Shift the dates of every service matching the filters by months and days
+
+    Args:
+        months: Months to add (negative to move back)
+        days: Days to add after the months
+        fields: Date fields to shift (default: expiry_date and payment_due_date)
+        dry_run: Only report what would change
+        **filters: See filter_renewal_services
+
+    Returns:
+        dict: Matched/updated counts, affected vendors, total amount and the
+              expiry date range before and after the shift
+    """
+    if not months and not days:
+        raise ValueError('months or days must be non-zero')
+    unknown = set(fields) - set(RENEWAL_DATE_FIELDS)
+    if not fields or unknown:
+        raise ValueError(f"fields must be among: {', '.join(RENEWAL_DATE_FIELDS)}")
+
+    services = filter_renewal_services(**filters)
+    new_expiry = ShiftDate(F('expiry_date'), months, days) if 'expiry_date' in fields else F('expiry_date')
+    # One aggregate query describes the change
+    summary = services.aggregate(
+        matched=Count('id'),
+        vendors=Count('vendor', distinct=True),
+        total_amount=Sum('amount'),
+        expiry_from=Min('expiry_date'),
+        expiry_to=Max('expiry_date'),
+        new_expiry_from=Min(new_expiry),
+        new_expiry_to=Max(new_expiry),
+    )
+    summary['total_amount'] = f"{summary['total_amount'] or 0:.2f}"
+    summary.update(months=months, days=days, fields=list(fields), dry_run=dry_run, updated=0)
+    if dry_run or not summary['matched']:
+        return summary
+
+    shifted = {name: ShiftDate(F(name), months, days) for name in fields}
+    with transaction.atomic():
+        spend_keys = set()
+        if 'payment_due_date' in shifted:
+            # The spend rollups the services leave and enter, computed by the database
+            for vendor_id, month, new_month in services.values_list(
+                'vendor_id', TruncMonth('payment_due_date'), TruncMonth(shifted['payment_due_date'])
+            ).distinct():
+                spend_keys.update([(vendor_id, month), (vendor_id, new_month)])
+        # SET expressions all see the old row, so the status snapshot is computed from the shifted dates
+        summary['updated'] = services.update(
+            updated_at=timezone.now(),
+            **shifted,
+            **status_snapshot_values(
+                expiry=shifted.get('expiry_date'), payment=shifted.get('payment_due_date')
+            )
+        )
+        refresh_spend_rollups(spend_keys)
+    # QuerySet.update sends no post_save signals
+    invalidate_aggregates()
+    return summary
@@ -0,0 +1,176 @@
+"""
+Utility functions for the vendor monthly spend rollups (VendorMonthlySpend)
+A rollup row holds the amount and number of a vendor's services with payment due in a
+month. Writes refresh only the (vendor, month) keys they touch, so the analytics queries
+cost O(vendors x months) whatever the number of services.
+"""
+import threading
+import time
+from contextlib import contextmanager
+
+from django.db import transaction
+from django.db.models import Count, DecimalField, Q, Sum
+from django.db.models.functions import TruncMonth
+from vendormanagement.models import Service, VendorMonthlySpend
+
+
+SPEND_REFRESH_BATCH_SIZE = 200
+SPEND_AMOUNT_FIELD = DecimalField(max_digits=14, decimal_places=2)
+
+_deferred = threading.local()
+
+
+def month_start(day):
+    return day.replace(day=1)
+
+
+def next_month(month):
+    return month.replace(year=month.year + month.month // 12, month=month.month % 12 + 1)
+
+
+def spend_key(service):
+    """The rollup key (vendor id, month) a service counts towards"""
+    return service.vendor_id, month_start(service.payment_due_date)
+
+
+def monthly_spend(services):
+    """services grouped by (vendor_id, month) with their total_amount and service_count"""
+    return services.annotate(month=TruncMonth('payment_due_date')).order_by().values('vendor_id', 'month').annotate(
+        total_amount=Sum('amount', output_field=SPEND_AMOUNT_FIELD),
+        service_count=Count('id'),
+    )
+
+
+def key_condition(keys):
+    condition = Q()
+    for vendor_id, month in keys:
+        condition |= Q(vendor_id=vendor_id, payment_due_date__gte=month, payment_due_date__lt=next_month(month))
+    return condition
+
+
+def refresh_spend_rollups(keys):
+    """
+    Recompute the rollup rows of the given (vendor id, date) keys from their services,
+    with one aggregate and one upsert per batch of keys. Keys left without services
+    are deleted.
+
+    Returns:
+        int: Rollup keys refreshed
+    """
+    keys = sorted({(vendor_id, month_start(day)) for vendor_id, day in keys if vendor_id is not None and day})
+    for offset in range(0, len(keys), SPEND_REFRESH_BATCH_SIZE):
+        batch = keys[offset:offset + SPEND_REFRESH_BATCH_SIZE]
+        rows = {
+            (row['vendor_id'], row['month']): row
+            for row in monthly_spend(Service.objects.filter(key_condition(batch)))
+        }
+        with transaction.atomic():
+            if rows:
+                VendorMonthlySpend.objects.bulk_create(
+                    [VendorMonthlySpend(**row) for row in rows.values()],
+                    update_conflicts=True,
+                    unique_fields=['vendor', 'month'],
+                    update_fields=['total_amount', 'service_count', 'updated_at'],
+                )
+            empty = [Q(vendor_id=vendor_id, month=month) for vendor_id, month in batch if (vendor_id, month) not in rows]
+            if empty:
+                VendorMonthlySpend.objects.filter(Q(*empty, _connector=Q.OR)).delete()
+    return len(keys)
+
+
+@contextmanager
+def deferred_spend_refresh():
+    """
+    Collect the rollup keys touched inside the block (by the Service signals or added to
+    the yielded set) and refresh them once on exit, instead of once per service
+    """
+    outer = getattr(_deferred, 'keys', None)
+    keys = set() if outer is None else outer
+    _deferred.keys = keys
+    try:
+        yield keys
+    finally:
+        _deferred.keys = outer
+    if outer is None:
+        refresh_spend_rollups(keys)
+
+
+def spend_changed(keys):
+    """Refresh the rollup keys now, or on exit of the enclosing deferred_spend_refresh block"""
+    deferred = getattr(_deferred, 'keys', None)
+    if deferred is None:
+        refresh_spend_rollups(keys)
+    else:
+        deferred.update(keys)
+
+
+def rebuild_spend_rollups(vendor_ids=None):
+    """
+    Recompute every rollup row (or those of the given vendors) with one GROUP BY query
+
+    Returns:
+        dict: Rollup rows deleted and written, and the elapsed seconds
+    """
+    started = time.perf_counter()
+    services = Service.objects.all()
+    rollups = VendorMonthlySpend.objects.all()
+    if vendor_ids is not None:
+        services = services.filter(vendor_id__in=vendor_ids)
+        rollups = rollups.filter(vendor_id__in=vendor_ids)
+    with transaction.atomic():
+        deleted, _ = rollups.delete()
+        rows = VendorMonthlySpend.objects.bulk_create(
+            [VendorMonthlySpend(**row) for row in monthly_spend(services)],
+            batch_size=1000,
+        )
+    return {'deleted': deleted, 'written': len(rows), 'seconds': round(time.perf_counter() - started, 3)}
+
+
+def format_spend(row):
+    return {
+        'amount': f"{row['amount'] or 0:.2f}",
+        'services': row['services'] or 0,
+    }
+
+
+def get_spend_summary(rollups, top_n=10):
+    """
+    Total, per-month totals and top-N vendors by amount, from (filtered) rollup rows
+
+    Returns:
+        dict: {'total', 'months', 'top_vendors'}; amounts are strings with two decimals
+    """
+    sums = {
+        'amount': Sum('total_amount', output_field=SPEND_AMOUNT_FIELD),
+        'services': Sum('service_count'),
+    }
+    months = rollups.order_by('month').values('month').annotate(**sums)
+    top_vendors = rollups.values('vendor_id', 'vendor__name').annotate(**sums).order_by('-amount', 'vendor_id')[:top_n]
+    return {
+        'total': format_spend(rollups.aggregate(**sums)),
+        'months': [{'month': f"{row['month']:%Y-%m}", **format_spend(row)} for row in months],
+        'top_vendors': [
+            {'vendor': row['vendor_id'], 'vendor_name': row['vendor__name'], **format_spend(row)}
+            for row in top_vendors
+        ],
+    }
+
+
+def vendor_spend_rows(rollups):
+    """Per-vendor, per-month rollup rows as dicts, ordered by vendor name and month"""
+    return rollups.order_by('vendor__name', 'vendor_id', 'month').values(
+        'vendor_id', 'vendor__name', 'month', 'total_amount', 'service_count'
+    )
+
+
+def format_vendor_spend_rows(rows):
+    return [
+        {
+            'vendor': row['vendor_id'],
+            'vendor_name': row['vendor__name'],
+            'month': f"{row['month']:%Y-%m}",
+            'amount': f"{row['total_amount']:.2f}",
+            'services': row['service_count'],
+        }
+        for row in rows
+    ]
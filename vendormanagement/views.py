@@ -1,21 +1,150 @@
 from rest_framework import viewsets, status, generics, permissions
-from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.decorators import action, api_view, permission_classes, renderer_classes
 from rest_framework.response import Response
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
 from rest_framework.pagination import PageNumberPagination
+from rest_framework.utils.urls import replace_query_param
+from django.conf import settings
 from django.utils import timezone
-from datetime import timedelta
-from django.db.models import Q
+from datetime import datetime, time, timedelta, timezone as dt_timezone
+import io
+from django.db.models import Count, Prefetch, Q
 from django.contrib.auth.models import User
 from rest_framework.permissions import AllowAny
 from django.shortcuts import render, redirect
+from django.http import StreamingHttpResponse
+from django.utils.cache import patch_vary_headers
+from django.utils.regex_helper import _lazy_re_compile
+from django.utils.text import compress_sequence
+from django.urls import reverse
 
-from .models import Vendor, Service
+from .models import Vendor, Service, Job, VendorMonthlySpend, SERVICE_STATUSES, STATUS_COLORS
 from .serializers import (
     VendorSerializer, ServiceSerializer, VendorListSerializer,
-    ServiceStatusUpdateSerializer, UserRegistrationSerializer
+    ServiceStatusUpdateSerializer, UserRegistrationSerializer, JobSerializer,
+    ServiceRowSerializer, VendorRowSerializer, VENDOR_ROW_FIELDS, ServiceRenewalSerializer
 )
-from .utils.reminder_utils import check_and_send_reminders, get_services_with_color_codes
-from .pagination import CustomPageNumberPagination
+from .utils.reminder_utils import (
+    get_services_with_color_codes, get_status_color_counts
+)
+from .utils.import_utils import CSVFileError, import_vendors, import_services
+from .utils.job_utils import enqueue_job
+from .utils.dashboard_utils import get_dashboard_summary
+from .utils.cache_utils import cached_aggregate, cache_stats
+from .utils.export_utils import (
+    EXPORT_FORMATS, SERVICE_WINDOWS, SERVICE_EXPORT_FIELDS, VENDOR_EXPORT_FIELDS,
+    export_service_rows, export_vendor_rows, render_export
+)
+from .utils.bulk_utils import bulk_write_services, get_bulk_max_items
+from .utils.renewal_utils import renew_services
+from .utils.http_utils import queryset_validators, conditional_response
+from .utils.spend_utils import get_spend_summary, vendor_spend_rows, format_vendor_spend_rows
+from .utils.forecast_utils import FORECAST_GRANULARITIES, FORECAST_MAX_MONTHS, get_service_forecast
+from .pagination import CustomPageNumberPagination, KeysetPaginationMixin
+from .parsers import NDJSONParser
+from .renderers import PrometheusRenderer
+from .profiling import profile_store
+from .filters import (
+    QueryParamFilter, PrefixSearchFilter, StableOrderingFilter,
+    MAX_WINDOW_DAYS, parse_choice, parse_date, parse_days, parse_decimal, parse_id_list, parse_month
+)
+
+
+def run_csv_import(request, importer):
+    """
+    Run a CSV importer on the multipart upload in the 'file' field
+    Optional form field: batch_size
+    """
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': "Upload a CSV file in the 'file' field"}, status=status.HTTP_400_BAD_REQUEST)
+    try:
+        batch_size = request.data.get('batch_size')
+        batch_size = int(batch_size) if batch_size else None
+        if batch_size is not None and batch_size < 1:
+            raise ValueError
+    except (TypeError, ValueError):
+        return Response({'error': 'batch_size must be a positive integer'}, status=status.HTTP_400_BAD_REQUEST)
+
+    csv_file = io.TextIOWrapper(upload.file, encoding='utf-8-sig', newline='')
+    try:
+        result = importer(csv_file, batch_size=batch_size)
+    except CSVFileError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    return Response({
+        'message': 'Import completed',
+        'summary': result
+    })
+
+
+accepts_gzip = _lazy_re_compile(r'\bgzip\b')
+
+
+def stream_export(request, name, export_rows, fields):
+    """
+    Stream an export as NDJSON or CSV, gzipped when the client accepts it
+    Query params: export_format (ndjson|csv), window (see SERVICE_WINDOWS), days
+    """
+    export_format = request.query_params.get('export_format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return Response(
+            {'error': f"export_format must be one of: {', '.join(EXPORT_FORMATS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    window = request.query_params.get('window') or None
+    if window is not None and window not in SERVICE_WINDOWS:
+        return Response(
+            {'error': f"window must be one of: {', '.join(SERVICE_WINDOWS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    try:
+        days = parse_days(request.query_params.get('days', 15))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    # Built before the response: errors after the headers are sent would truncate a 200
+    rows = export_rows(window=window, days=days)
+    content = (chunk.encode() for chunk in render_export(rows, export_format, fields))
+    response = StreamingHttpResponse(content, content_type=f'{EXPORT_FORMATS[export_format]}; charset=utf-8')
+    if accepts_gzip.search(request.META.get('HTTP_ACCEPT_ENCODING', '')):
+        response.streaming_content = compress_sequence(response.streaming_content)
+        response.headers['Content-Encoding'] = 'gzip'
+    patch_vary_headers(response, ('Accept-Encoding',))
+    extension = 'csv' if export_format == 'csv' else 'ndjson'
+    response.headers['Content-Disposition'] = (
+        f'attachment; filename="{name}-{timezone.now().date().isoformat()}.{extension}"'
+    )
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin answering conditional GETs of list and retrieve: validators come from
+    MAX(updated_at)/COUNT aggregates over get_validator_querysets(), today's date (statuses
+    and active counts change at midnight) and the renderer, and a matching If-None-Match
+    gets a 304 before anything is serialized
+    """
+
+    def get_validator_querysets(self):
+        raise NotImplementedError
+
+    def conditional_get(self, build_response):
+        today = timezone.now().date()
+        try:
+            etag, last_modified = queryset_validators(
+                *self.get_validator_querysets(), extra=(today, self.request.accepted_renderer.format)
+            )
+        except (TypeError, ValueError):
+            # Malformed pk: let retrieve answer 404
+            return build_response()
+        midnight = datetime.combine(today, time.min, tzinfo=dt_timezone.utc)
+        if last_modified is None or last_modified < midnight:
+            last_modified = midnight
+        return conditional_response(self.request, etag, last_modified, build_response)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.conditional_get(lambda: super(ConditionalGetMixin, self).retrieve(request, *args, **kwargs))
 
 
 class RegisterView(generics.CreateAPIView):
@@ -29,129 +158,346 @@ class RegisterView(generics.CreateAPIView):
     serializer_class = UserRegistrationSerializer
 
 
-class VendorViewSet(viewsets.ModelViewSet):
+class VendorViewSet(ConditionalGetMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     """
     ViewSet for CRUD operations on Vendors
     """
     queryset = Vendor.objects.all()
     serializer_class = VendorSerializer
     pagination_class = CustomPageNumberPagination
+    cursor_ordering = ('name', 'id')
+    filter_backends = [QueryParamFilter, PrefixSearchFilter, StableOrderingFilter]
+    filter_params = {
+        'status': ('status', parse_choice(*dict(Vendor.VENDOR_STATUS_CHOICES))),
+    }
+    search_field = 'name'
+    ordering_fields = ['name', 'id']
     
     def get_queryset(self):
-        """Optimize queryset with prefetch_related for nested services"""
-        return Vendor.objects.prefetch_related('services').all()
+        """
+        Optimize queryset so serializing a page takes a constant number of queries:
+        active services come from a filtered Prefetch and the active count from an annotation
+        """
+        today = timezone.now().date()
+        if self.action in ('list', 'list_with_active_services') and getattr(settings, 'FAST_LIST_SERIALIZATION', True):
+            # list_rows loads the services of a page with one query and counts the active ones
+            # from those rows, so the vendor query needs no aggregate
+            return Vendor.objects.all()
+        if self.action == 'list_with_active_services':
+            return Vendor.objects.prefetch_related(
+                Prefetch(
+                    'services',
+                    queryset=Service.objects.active(today=today).order_by('id'),
+                    to_attr='active_service_list'
+                )
+            )
+        return Vendor.objects.prefetch_related(
+            Prefetch('services', queryset=Service.objects.order_by('id'))
+        ).annotate(
+            active_services_count=Count('services', filter=Q(services__expiry_date__gte=today))
+        )
     
+    def get_validator_querysets(self):
+        """A vendor's JSON embeds its services"""
+        if self.action == 'retrieve':
+            pk = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+            return Vendor.objects.filter(pk=pk), Service.objects.filter(vendor_id=pk)
+        return Vendor.objects.all(), Service.objects.all()
+
     def get_serializer_class(self):
         if self.action == 'list_with_active_services':
             return VendorListSerializer
         return VendorSerializer
-    
-    @action(detail=False, methods=['get'])
-    def list_with_active_services(self, request):
+
+    def list(self, request, *args, **kwargs):
+        """Read-only list through the .values() fast path, in cursor_ordering unless ordered otherwise"""
+        queryset = self.filter_queryset(self.get_queryset())
+        if not queryset.ordered:
+            queryset = queryset.order_by(*self.cursor_ordering)
+        return self.conditional_get(lambda: self.list_rows(queryset))
+
+    def list_rows(self, vendors, active_only=False):
         """
-        List all vendors with their active services only (paginated)
-        GET /api/vendors/list_with_active_services/
+        Paginate and render vendors from .values() rows; the services of the whole page come
+        from one more .values() query. The JSON is identical to VendorSerializer
+        (VendorListSerializer when active_only is set).
         """
-        vendors = Vendor.objects.prefetch_related('services').all()
+        if not getattr(settings, 'FAST_LIST_SERIALIZATION', True):
+            return self.list_instances(vendors)
+        today = timezone.now().date()
+        rows = vendors.values(*VENDOR_ROW_FIELDS)
+        page = self.paginate_queryset(rows)
+        paginated = page is not None
+        if not paginated:
+            page = list(rows)
+        services = Service.objects.filter(vendor__in=[row['id'] for row in page])
+        if active_only:
+            services = services.active(today=today)
+        services = services.order_by('id').as_rows(today=today)
+        data = VendorRowSerializer(page, services, active_only=active_only, today=today).data
+        if paginated:
+            return self.get_paginated_response(data)
+        return Response(data)
+
+    def list_instances(self, vendors):
+        """List vendors through the model serializers (FAST_LIST_SERIALIZATION = False)"""
         page = self.paginate_queryset(vendors)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
         serializer = self.get_serializer(vendors, many=True)
         return Response(serializer.data)
+    
+    @action(detail=False, methods=['get'])
+    def list_with_active_services(self, request):
+        """
+        List all vendors with their active services only (paginated)
+        GET /api/vendors/list_with_active_services/
+        """
+        return self.list_rows(self.filter_queryset(self.get_queryset()), active_only=True)
 
+    @action(detail=False, methods=['get'])
+    def choices(self, request):
+        """
+        Vendor ids and names only, for dropdowns and autocomplete (ordered by name)
+        GET /api/vendors/choices/?search=ac&limit=10 (also ?status=Active)
+        Sends ETag/Last-Modified; an unchanged vendor table answers 304.
+        """
+        max_limit = getattr(settings, 'VENDOR_CHOICES_MAX_LIMIT', 1000)
+        try:
+            limit = int(request.query_params.get('limit', 20))
+            if not 1 <= limit <= max_limit:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {'error': f'limit must be an integer between 1 and {max_limit}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        vendors = self.filter_queryset(Vendor.objects.all())
+        if not vendors.ordered:
+            vendors = vendors.order_by(*self.cursor_ordering)
 
-class ServiceViewSet(viewsets.ModelViewSet):
+        def build_response():
+            # One row past the limit tells whether the list was cut short
+            rows = list(vendors.values_list('id', 'name')[:limit + 1])
+            return Response({
+                'results': [{'id': pk, 'name': name} for pk, name in rows[:limit]],
+                'more': len(rows) > limit,
+            })
+
+        etag, last_modified = queryset_validators(Vendor.objects.all())
+        return conditional_response(request, etag, last_modified, build_response)
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream all vendors with their active services count
+        GET /api/vendors/export/?export_format=csv
+        GET /api/vendors/export/?window=expiring_soon&days=30 (vendors with a service in the window)
+        """
+        return stream_export(request, 'vendors', export_vendor_rows, VENDOR_EXPORT_FIELDS)
+
+    @action(detail=False, methods=['post'])
+    def import_csv(self, request):
+        """
+        Bulk upsert vendors from an uploaded CSV file
+        POST /api/vendors/import_csv/ (multipart, field 'file', optional 'batch_size')
+        """
+        return run_csv_import(request, import_vendors)
+
+
+class ServiceViewSet(ConditionalGetMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     """
     ViewSet for CRUD operations on Services
     """
     queryset = Service.objects.select_related('vendor').all()
     serializer_class = ServiceSerializer
     pagination_class = CustomPageNumberPagination
+    cursor_ordering = ('expiry_date', 'id')
+    filter_backends = [QueryParamFilter, PrefixSearchFilter, StableOrderingFilter]
+    filter_params = {
+        'vendor': ('vendor__in', parse_id_list),
+        'vendor_status': ('vendor__status', parse_choice(*dict(Vendor.VENDOR_STATUS_CHOICES))),
+        'expiry_from': ('expiry_date__gte', parse_date),
+        'expiry_to': ('expiry_date__lte', parse_date),
+        'payment_due_from': ('payment_due_date__gte', parse_date),
+        'payment_due_to': ('payment_due_date__lte', parse_date),
+        'amount_min': ('amount__gte', parse_decimal),
+        'amount_max': ('amount__lte', parse_decimal),
+        'status': (lambda services, status: services.with_status_snapshot(status), parse_choice(*SERVICE_STATUSES)),
+        'color': (lambda services, color: services.status_color(color), parse_choice(*STATUS_COLORS)),
+    }
+    search_field = 'service_name'
+    ordering_fields = ['expiry_date', 'payment_due_date', 'amount', 'id']
     
+    def get_validator_querysets(self):
+        """A service's JSON includes its vendor's name"""
+        if self.action == 'retrieve':
+            pk = self.kwargs[self.lookup_url_kwarg or self.lookup_field]
+            return Service.objects.filter(pk=pk), Vendor.objects.filter(services=pk)
+        return Service.objects.all(), Vendor.objects.all()
+
     def get_serializer_class(self):
         if self.action == 'update_status':
             return ServiceStatusUpdateSerializer
         return ServiceSerializer
-    
-    @action(detail=False, methods=['get'])
-    def expiring_soon(self, request):
+
+    def list(self, request, *args, **kwargs):
+        """Read-only list through the .values() fast path, in cursor_ordering unless ordered otherwise"""
+        queryset = self.filter_queryset(self.get_queryset())
+        if not queryset.ordered:
+            queryset = queryset.order_by(*self.cursor_ordering)
+        return self.conditional_get(lambda: self.list_rows(queryset))
+
+    def list_rows(self, services, key=None):
         """
-        Get all services expiring in the next 15 days (paginated)
-        GET /api/services/expiring_soon/
+        Paginate and render services from .values() rows, with the status computed by the
+        database against one 'today' per request; the JSON is identical to ServiceSerializer.
+        Unpaginated responses are wrapped as {'count': ..., key: [...]} when key is given.
         """
-        today = timezone.now().date()
-        days_ahead = today + timedelta(days=15)
-        
-        services = Service.objects.filter(
-            expiry_date__gte=today,
-            expiry_date__lte=days_ahead
-        ).select_related('vendor')
-        
+        if not getattr(settings, 'FAST_LIST_SERIALIZATION', True):
+            return self.list_instances(services, key)
+        rows = services.as_rows(today=timezone.now().date())
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(ServiceRowSerializer(page).data)
+        data = ServiceRowSerializer(rows).data
+        return Response({'count': len(data), key: data} if key else data)
+
+    def list_instances(self, services, key=None):
+        """List services through ServiceSerializer (FAST_LIST_SERIALIZATION = False)"""
+        services = services.select_related('vendor')
         page = self.paginate_queryset(services)
         if page is not None:
             serializer = self.get_serializer(page, many=True)
             return self.get_paginated_response(serializer.data)
-        
         serializer = self.get_serializer(services, many=True)
-        return Response({
-            'count': services.count(),
-            'services': serializer.data
-        })
+        return Response({'count': len(serializer.data), key: serializer.data} if key else serializer.data)
     
+    @action(detail=False, methods=['get'])
+    def expiring_soon(self, request):
+        """
+        Get all services expiring in the next 15 days (paginated)
+        GET /api/services/expiring_soon/
+        """
+        services = self.filter_queryset(
+            Service.objects.expiring_soon(days=15).select_related('vendor').order_by('expiry_date', 'id')
+        )
+        return self.list_rows(services, key='services')
+
     @action(detail=False, methods=['get'])
     def payment_due_soon(self, request):
         """
         Get all services with payment due in the next 15 days (paginated)
         GET /api/services/payment_due_soon/
         """
-        today = timezone.now().date()
-        days_ahead = today + timedelta(days=15)
-        
-        services = Service.objects.filter(
-            payment_due_date__gte=today,
-            payment_due_date__lte=days_ahead
-        ).select_related('vendor')
-        
-        page = self.paginate_queryset(services)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        
-        serializer = self.get_serializer(services, many=True)
-        return Response({
-            'count': services.count(),
-            'services': serializer.data
-        })
-    
+        services = self.filter_queryset(
+            Service.objects.payment_due_soon(days=15).select_related('vendor').order_by('payment_due_date', 'id')
+        )
+        return self.list_rows(services, key='services')
 
     @action(detail=False, methods=['get'])
     def services_by_color(self, request):
         """
-        Get all services grouped by color codes (requires authentication)
-        GET /api/services-by-color/
+        Get service counts grouped by color codes, or one color's services (paginated)
+        GET /api/services/services_by_color/
+        GET /api/services/services_by_color/?color=red&page=1
         """
-        color_groups = get_services_with_color_codes()
-        
-        # Serialize each group
-        result = {}
-        for color, services in color_groups.items():
-            result[color] = {
-                'count': len(services),
-                'services': ServiceSerializer(services, many=True).data
+        color = request.query_params.get('color')
+        if color is None:
+            url = request.build_absolute_uri()
+            result = {
+                color: {
+                    'count': count,
+                    'url': replace_query_param(url, 'color', color)
+                }
+                for color, count in cached_aggregate('status_color_counts', get_status_color_counts).items()
             }
-        
+            return Response(result)
+
+        color_groups = get_services_with_color_codes()
+        if color not in color_groups:
+            return Response(
+                {'error': f"color must be one of: {', '.join(color_groups)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        return self.list_rows(self.filter_queryset(color_groups[color]), key='services')
+
+    @action(detail=False, methods=['post'])
+    def renew(self, request):
+        """
+        Shift expiry/payment due dates of every matching service with one UPDATE
+        POST /api/services/renew/ with body:
+            {"months": 12, "expiry_from": "2025-01-01", "expiry_to": "2025-03-31", "dry_run": true}
+        Filters: vendor, expiry_from, expiry_to, amount_min, amount_max (at least one)
+        Optional: days, fields (default: ["expiry_date", "payment_due_date"])
+        """
+        serializer = ServiceRenewalSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return Response(renew_services(**serializer.validated_data))
+
+    @action(detail=False, methods=['get'])
+    def export(self, request):
+        """
+        Stream all services in the list endpoint format
+        GET /api/services/export/?export_format=csv
+        GET /api/services/export/?window=payment_due_soon&days=30
+        """
+        return stream_export(request, 'services', export_service_rows, SERVICE_EXPORT_FIELDS)
+
+    @action(detail=False, methods=['post'], parser_classes=[JSONParser, NDJSONParser])
+    def bulk(self, request):
+        """
+        Create, update and delete many services in one transaction
+        POST /api/services/bulk/ with a JSON array (or application/x-ndjson, one item per line):
+            [{"vendor": 1, "service_name": "Hosting", "start_date": "2025-01-01", ...},
+             {"id": 7, "expiry_date": "2026-01-01"},
+             {"op": "delete", "id": 9}]
+        ?atomic=true writes nothing unless every item is valid
+        """
+        items = request.data
+        if not isinstance(items, list):
+            return Response({'error': 'Expected a list of items'}, status=status.HTTP_400_BAD_REQUEST)
+        max_items = get_bulk_max_items()
+        if len(items) > max_items:
+            return Response(
+                {'error': f'At most {max_items} items are accepted per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        atomic = request.query_params.get('atomic', '').lower() in ('1', 'true')
+        result = bulk_write_services(items, atomic=atomic)
+        if atomic and result['failed']:
+            return Response(result, status=status.HTTP_400_BAD_REQUEST)
         return Response(result)
 
+    @action(detail=False, methods=['post'])
+    def import_csv(self, request):
+        """
+        Bulk insert services from an uploaded CSV file (vendor column holds the vendor name)
+        POST /api/services/import_csv/ (multipart, field 'file', optional 'batch_size')
+        """
+        return run_csv_import(request, import_services)
+
     @action(detail=False, methods=['post', 'get'])
     def check_reminders(self, request):
-        days = request.data.get('days', 15)
-        result = check_and_send_reminders(days=days)
+        """
+        Queue a reminder check; the run_jobs worker sends the emails
+        POST /api/services/check_reminders/ with body: {"days": 15, "digest": false}
+        Poll GET /api/jobs/{job_id}/ for progress and the final summary
+        """
+        try:
+            days = parse_days(request.data.get('days', request.query_params.get('days', 15)))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        digest = str(request.data.get('digest', request.query_params.get('digest', ''))).lower() in ('1', 'true')
+        job = enqueue_job('check_reminders', {'days': days, 'digest': digest}, user=request.user)
         
         return Response({
-            'message': 'Reminder check completed',
-            'summary': result
-        })
+            'message': 'Reminder check queued',
+            'job_id': job.id,
+            'status_url': request.build_absolute_uri(reverse('job-detail', args=[job.id])),
+            'job': JobSerializer(job).data
+        }, status=status.HTTP_202_ACCEPTED)
     
 
     @action(detail=False, methods=['get'])
@@ -160,33 +506,150 @@ class ServiceViewSet(viewsets.ModelViewSet):
         Get all active services (requires authentication)
         GET /api/services/active_services/
         """
-        services = Service.objects.filter(expiry_date__gte=timezone.now())
-        page = self.paginate_queryset(services)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        serializer = self.get_serializer(services, many=True)
-        return Response({
-            'count': services.count(),
-            'active_services': serializer.data
-        })
-    
+        services = self.filter_queryset(
+            Service.objects.active().select_related('vendor').order_by('expiry_date', 'id')
+        )
+        return self.list_rows(services, key='active_services')
+
     @action(detail=False, methods=['get'])
     def expired_services(self, request):
         """
         Get all active services (requires authentication)
         GET /api/services/expired_services/
         """
-        services = Service.objects.filter(expiry_date__lt=timezone.now())
-        page = self.paginate_queryset(services)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
-            return self.get_paginated_response(serializer.data)
-        serializer = self.get_serializer(services, many=True)
-        return Response({
-            'count': services.count(),
-            'expired_services': serializer.data
-        })
+        services = self.filter_queryset(
+            Service.objects.expired().select_related('vendor').order_by('expiry_date', 'id')
+        )
+        return self.list_rows(services, key='expired_services')
+
+
+class DashboardViewSet(viewsets.ViewSet):
+    """
+    Aggregated dashboard data in a single round-trip
+    """
+
+    @action(detail=False, methods=['get'])
+    def summary(self, request):
+        """
+        Get every dashboard count plus top-N recent vendors, expiring services and payments due
+        GET /api/dashboard/summary/?days=15&top_n=5
+        """
+        try:
+            days = parse_days(request.query_params.get('days', 15))
+            top_n = int(request.query_params.get('top_n', 5))
+            if not 0 <= top_n <= 50:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {'error': f'days must be between 0 and {MAX_WINDOW_DAYS} and top_n between 0 and 50'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        summary = cached_aggregate(
+            'dashboard_summary',
+            lambda: get_dashboard_summary(days=days, top_n=top_n),
+            params=(days, top_n)
+        )
+        return Response(summary)
+
+    @action(detail=False, methods=['get'])
+    def cache_stats(self, request):
+        """
+        Hit/miss counters of the dashboard aggregate cache (this process)
+        GET /api/dashboard/cache_stats/
+        """
+        return Response(cache_stats.snapshot())
+
+
+class AnalyticsViewSet(viewsets.GenericViewSet):
+    """
+    Vendor spend analytics, served from the monthly spend rollups (one row per vendor
+    and month of payment_due_date) instead of the services, and the cash-flow forecast
+    Filters of spend and vendor_spend: from and to (YYYY-MM, inclusive), vendor (comma-separated ids)
+    """
+    queryset = VendorMonthlySpend.objects.all()
+    pagination_class = CustomPageNumberPagination
+    filter_backends = [QueryParamFilter]
+    filter_params = {
+        'from': ('month__gte', parse_month),
+        'to': ('month__lte', parse_month),
+        'vendor': ('vendor_id__in', parse_id_list),
+    }
+
+    @action(detail=False, methods=['get'])
+    def spend(self, request):
+        """
+        Total, per-month totals and top-N vendors by amount due
+        GET /api/analytics/spend/?from=2025-01&to=2025-12&top_n=10
+        """
+        try:
+            top_n = int(request.query_params.get('top_n', 10))
+            if not 0 <= top_n <= 100:
+                raise ValueError
+        except ValueError:
+            return Response({'error': 'top_n must be between 0 and 100'}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(get_spend_summary(self.filter_queryset(self.get_queryset()), top_n=top_n))
+
+    @action(detail=False, methods=['get'])
+    def vendor_spend(self, request):
+        """
+        Amount due per vendor and month, ordered by vendor name and month (paginated)
+        GET /api/analytics/vendor_spend/?from=2025-01&to=2025-12&vendor=3,7
+        """
+        page = self.paginate_queryset(vendor_spend_rows(self.filter_queryset(self.get_queryset())))
+        return self.get_paginated_response(format_vendor_spend_rows(page))
+
+    @action(detail=False, methods=['get'])
+    def forecast(self, request):
+        """
+        Projected payments (outflows) and renewals per day, week or month for the next N months
+        GET /api/analytics/forecast/?months=12&granularity=week&vendor=3,7
+        """
+        granularity = request.query_params.get('granularity', 'month')
+        try:
+            months = int(request.query_params.get('months', 12))
+            vendor_ids = tuple(sorted(set(parse_id_list(request.query_params.get('vendor', '')))))
+            if granularity not in FORECAST_GRANULARITIES or not 1 <= months <= FORECAST_MAX_MONTHS:
+                raise ValueError
+        except ValueError:
+            return Response(
+                {'error': f"months must be between 1 and {FORECAST_MAX_MONTHS}, granularity one of: "
+                          f"{', '.join(FORECAST_GRANULARITIES)} and vendor a comma-separated list of ids"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        forecast = cached_aggregate(
+            'service_forecast',
+            lambda: get_service_forecast(months=months, granularity=granularity, vendor_ids=vendor_ids),
+            params=(months, granularity, *vendor_ids)
+        )
+        return Response(forecast)
+
+
+class JobViewSet(viewsets.ReadOnlyModelViewSet):
+    """
+    Status and progress of background jobs queued by the current user (all jobs for staff)
+    GET /api/jobs/
+    GET /api/jobs/{id}/
+    """
+    serializer_class = JobSerializer
+    pagination_class = CustomPageNumberPagination
+
+    def get_queryset(self):
+        jobs = Job.objects.order_by('-created_at', '-id')
+        if not self.request.user.is_staff:
+            jobs = jobs.filter(created_by=self.request.user)
+        return jobs
+
+
+@api_view(['GET'])
+@permission_classes([permissions.IsAdminUser])
+@renderer_classes([JSONRenderer, PrometheusRenderer])
+def metrics_view(request):
+    """
+    Per-endpoint latency, query and serializer percentiles of this process (admin only)
+    GET /api/_metrics/
+    GET /api/_metrics/?format=prometheus
+    """
+    return Response(profile_store.snapshot())
 
 
 # UI Views